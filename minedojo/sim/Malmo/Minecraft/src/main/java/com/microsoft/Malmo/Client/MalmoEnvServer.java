@@ -70,6 +70,8 @@ public class MalmoEnvServer implements IWantToQuit {
         boolean quit = false;
         boolean synchronous = false;
         Long seed = null;
+        // False if the mission has no VideoProducer, in which case no frame will ever arrive.
+        boolean wantsVideo = true;
 
         // OpenAI gym state:
         boolean done = false;
@@ -378,6 +380,7 @@ public class MalmoEnvServer implements IWantToQuit {
 
 
         envState.missionInit = command;
+        envState.wantsVideo = command.contains("<VideoProducer");
         envState.done = false;
         envState.running = true;
         envState.quit = false;
@@ -545,6 +548,7 @@ public class MalmoEnvServer implements IWantToQuit {
             previousEnvState.reset = envState.reset;
             previousEnvState.synchronous = envState.synchronous;
             previousEnvState.seed = envState.seed;
+            previousEnvState.wantsVideo = envState.wantsVideo;
 
 
             envState.info = "{}";
@@ -560,6 +564,9 @@ public class MalmoEnvServer implements IWantToQuit {
         // TimeHelper.SyncManager.debugLog("[MALMO_ENV_SERVER] <STEP> Lock released. Writing observation, info, done.");
 
         profiler.startSection("writeObs");
+        if (obs == null) {
+            obs = new byte[0];
+        }
         dout.writeInt(obs.length);
         dout.write(obs);
 
@@ -683,6 +690,9 @@ public class MalmoEnvServer implements IWantToQuit {
             lock.unlock();
         }
 
+        if (obs == null) {
+            obs = new byte[0];
+        }
         dout.writeInt(obs.length);
         dout.write(obs);
 
@@ -697,8 +707,12 @@ public class MalmoEnvServer implements IWantToQuit {
     }
 
     // Get the current observation. If none and not done wait for a short time.
+    // Without a video producer there is nothing to wait for and an empty frame is returned.
     public byte[] getObservation(boolean done)  {
         byte[] obs = envState.obs;
+        if (obs == null && !envState.wantsVideo) {
+            return new byte[0];
+        }
         if (obs == null && !done) {
             try {
                 cond.await(COND_WAIT_SECONDS, TimeUnit.SECONDS);
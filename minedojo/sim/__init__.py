@@ -1,5 +1,6 @@
 from .sim import MineDojoSim
 from .inventory import InventoryItem
+from .mc_meta.item_registry import ItemRegistry, ITEM_REGISTRY
 from .mc_meta.mc import (
     ALL_ITEMS,
     ALL_ITEM_VARIANTS,
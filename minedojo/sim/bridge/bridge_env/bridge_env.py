@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import os
 import json
 import time
@@ -5,14 +7,17 @@ import struct
 import socket
 import logging
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional, List, NamedTuple, Dict
+from typing import Optional, List, NamedTuple, Dict, TYPE_CHECKING
 
 import numpy as np
-from lxml import etree
 
-from ..mc_instance import InstanceManager, MinecraftInstance
 from ..utils import retry
 
+if TYPE_CHECKING:
+    from lxml import etree
+
+    from ..mc_instance import MinecraftInstance
+
 
 MALMO_VERSION = "0.37.0"
 # Time to wait before raising an exception (high value because some operations we wait on are very slow)
@@ -49,8 +54,11 @@ class BridgeEnv:
         agent_count: int = 1,
         is_fault_tolerant: bool = True,
         seed: Optional[int] = None,
+        want_pov: bool = True,
     ):
         assert agent_count == 1, "TODO"
+        # if False, the mission has no video producer and the (empty) pov messages are discarded
+        self._want_pov = want_pov
         self._agent_count = agent_count
         self._rng = np.random.default_rng(seed=seed)
         self._instances: List[MinecraftInstance] = []
@@ -112,7 +120,8 @@ class BridgeEnv:
                     # Receive info from the environment.
                     malmo_json = instance.client_socket_recv_message().decode("utf-8")
                     raw = json.loads(malmo_json) if malmo_json is not None else {}
-                    raw["pov"] = obs
+                    if self._want_pov:
+                        raw["pov"] = obs
                     all_obs[i] = raw
                 except (socket.timeout, socket.error, TypeError) as e:
                     # when the socket times out...
@@ -167,6 +176,8 @@ class BridgeEnv:
         """
         Gets a new instance and sets up a logger if need be.
         """
+        from ..mc_instance import InstanceManager
+
         if port is not None:
             instance = InstanceManager.add_existing_instance(port)
         else:
@@ -193,7 +204,7 @@ class BridgeEnv:
                 reply = instance.client_socket_recv_message()
                 (done,) = struct.unpack("!b", reply)
                 any_done = any_done or (done == 1)
-                if obs is None or len(obs) == 0:
+                if self._want_pov and (obs is None or len(obs) == 0):
                     if time.time() - st_time > MAX_WAIT:
                         instance.client_socket_close()
                         raise Exception("too long waiting for first observation")
@@ -201,7 +212,8 @@ class BridgeEnv:
                     # FIXME - shouldn't we error or retry here?
 
                 raw = json.loads(info) if info is not None else {}
-                raw["pov"] = obs
+                if self._want_pov:
+                    raw["pov"] = obs
                 all_obs[i] = raw
             self._terminated = any_done
             if self._terminated:
@@ -227,6 +239,9 @@ class BridgeEnv:
             raise e
 
     def _seed_instance_manager(self):
+        # imported here since the instance manager pulls in Pyro4 and psutil
+        from ..mc_instance import InstanceManager
+
         InstanceManager.seed_manager(self._rng.integers(low=0, high=2**31 - 1))
 
     @staticmethod
@@ -244,6 +259,8 @@ class BridgeEnv:
         ok = 0
         st_time = time.time()
         logger.debug(f"Sending mission init: {instance}")
+        from lxml import etree
+
         while ok != 1:
             # roundtrip through etree to escape symbols correctly and make printing pretty
             mission_xml = etree.tostring(mission_xml_etree)
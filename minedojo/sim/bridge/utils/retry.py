@@ -2,8 +2,6 @@ import socket
 import logging
 import functools
 
-import Pyro4
-
 
 retry_count = 20
 logger = logging.getLogger(__name__)
@@ -12,6 +10,9 @@ logger = logging.getLogger(__name__)
 def retry(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        # imported here since Pyro4 is only needed once instances are launched
+        import Pyro4
+
         retry_exc = None
         for i in range(retry_count):
             try:
@@ -47,13 +47,16 @@ class CMDExecutor:
                         self._world.prev_info,
                     )
                 else:
-                    return self._world.step(action)
+                    return self._world.step(action, repeat=1)
             else:
                 raise ValueError(f"Invalid cmd {cmd}")
         else:
-            action = action or self._world.action_space.no_op()
+            # copy the action so that the command is not sent again by callers reusing it
+            action = (
+                self._world.action_space.no_op() if action is None else dict(action)
+            )
             action["chat"] = cmd
-            return self._world.step(action)
+            return self._world.step(action, repeat=1)
 
     def spawn_mobs(
         self,
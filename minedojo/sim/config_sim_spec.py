@@ -1,13 +1,11 @@
 import os
 from typing import List, Optional
 
-import jinja2
-from lxml import etree
-
 from . import spaces as spaces
 from .handler import Handler
 from .handlers.translation import TranslationHandler
-from .bridge.mc_instance.instance import MALMO_VERSION
+from .decoding import DecodingPlan
+from .bridge.bridge_env.bridge_env import MALMO_VERSION
 
 
 MISSION_TEMPLATE = os.path.join(
@@ -31,9 +29,11 @@ class SimSpec:
         world_generator_handlers: List[Handler],
         server_decorator_handlers: List[Handler],
         server_quit_handlers: List[Handler],
+        ms_per_tick: int = 50,
         seed: Optional[int] = None,
     ):
         self._sim_name = sim_name
+        self._ms_per_tick = ms_per_tick
         assert agent_count == 1, "TODO"
         self._agent_count = agent_count
         self._agent_names = [f"agent_{role}" for role in range(agent_count)]
@@ -60,6 +60,8 @@ class SimSpec:
         self._action_space = self.create_action_space()
         self._observation_space.seed(seed)
         self._action_space.seed(seed)
+        # compiled once, so that shared parts of raw observations are parsed once per step
+        self._decoding_plan = DecodingPlan(self._obs_handlers)
 
         self._episode_id = None
 
@@ -79,6 +81,10 @@ class SimSpec:
     def actionables(self):
         return self._action_handlers
 
+    def decode(self, raw_obs: dict) -> dict:
+        """Decodes a raw observation into a member of the observation space using the decoding plan."""
+        return self._decoding_plan.decode(raw_obs)
+
     def _singlify(self, space: spaces.Dict):
         if self._agent_count == 1:
             return space.spaces[self._agent_names[0]]
@@ -113,6 +119,10 @@ class SimSpec:
         """
         Gets the XML by templating mission.xml.j2 using Jinja
         """
+        # imported here since they are only needed to build mission XMLs
+        import jinja2
+        from lxml import etree
+
         self._episode_id = episode_id
         with open(MISSION_TEMPLATE, "rt") as fh:
             var_dict = {}
@@ -146,6 +156,8 @@ class SimSpec:
         Returns:
             str: The XML
         """
+        from lxml import etree
+
         handler_xml_strs = [handler.xml() for handler in handlers]
 
         if not handler_xml_strs:
@@ -0,0 +1,97 @@
+"""
+Single-pass decoding of raw Malmo observations.
+
+Handlers still declare observations (spaces, XML and ``from_hero``), while ``DecodingPlan`` compiles them once
+into a plan that parses shared parts of the raw JSON a single time per step:
+
+- top-level scalar fields of handler groups (e.g., life stats, location stats, damage source) are read in one pass
+  and converted into one array per output dtype, each handler receiving a slice of it;
+- subtrees used by several handlers (e.g., the ``inventory`` list used by both inventory and equipment)
+  are parsed into numpy arrays once through ``DecodeContext.subtree``.
+
+Handlers opt in by overriding ``TranslationHandler.decode``; others fall back to ``from_hero``.
+"""
+import logging
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from . import spaces
+from .handlers.translation import (
+    TranslationHandler,
+    KeymapTranslationHandler,
+    TranslationHandlerGroup,
+)
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class DecodeContext:
+    """Raw observation of one step, together with the parts already decoded by the plan."""
+
+    def __init__(self, raw: Dict[str, Any], scalars: Dict[int, np.ndarray]):
+        self.raw = raw
+        self._scalars = scalars
+        self._subtrees = {}
+
+    def scalar(self, handler: TranslationHandler):
+        """The value planned for a scalar handler, or ``None`` if the handler is not in the plan."""
+        return self._scalars.get(id(handler), None)
+
+    def subtree(self, key: str, parse_fn: Callable[[Dict[str, Any]], Any]):
+        """Parses a part of the raw observation with ``parse_fn`` on first use and caches it for other handlers."""
+        if key not in self._subtrees:
+            self._subtrees[key] = parse_fn(self.raw)
+        return self._subtrees[key]
+
+
+class DecodingPlan:
+    def __init__(self, handlers: List[TranslationHandler]):
+        self._handlers = handlers
+        # (output dtype, output shape) -> scalar handlers decoded into one array
+        scalar_groups: Dict[Tuple[np.dtype, tuple], List[KeymapTranslationHandler]] = {}
+        for handler in handlers:
+            leaves = (
+                handler.handlers
+                if isinstance(handler, TranslationHandlerGroup)
+                else [handler]
+            )
+            for leaf in leaves:
+                if self._is_planned_scalar(leaf):
+                    key = (np.dtype(leaf.space.dtype), tuple(leaf.space.shape))
+                    scalar_groups.setdefault(key, []).append(leaf)
+        self._scalar_groups = list(scalar_groups.items())
+
+    @staticmethod
+    def _is_planned_scalar(handler: TranslationHandler) -> bool:
+        # scalar fields at the top level of the raw json, decoded to either shape () or (1,)
+        return (
+            isinstance(handler, KeymapTranslationHandler)
+            and len(handler.hero_keys) == 1
+            and handler.default_if_missing is not None
+            and isinstance(handler.space, spaces.Box)
+            and tuple(handler.space.shape) in {(), (1,)}
+        )
+
+    def decode(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        scalars = {}
+        for (dtype, shape), leaves in self._scalar_groups:
+            values = []
+            for leaf in leaves:
+                value = raw.get(leaf.hero_keys[0], _MISSING)
+                if value is _MISSING:
+                    if not leaf.ignore_missing:
+                        leaf.logger.error(
+                            f"No {leaf.hero_keys[0]} observation! Yielding default value "
+                            f"{leaf.default_if_missing} for {leaf.hero_keys[0]}"
+                        )
+                    value = leaf.default_if_missing
+                values.append(value)
+            array = np.array(values, dtype=dtype)
+            for i, leaf in enumerate(leaves):
+                scalars[id(leaf)] = array[i : i + 1] if shape == (1,) else array[i, ...]
+        ctx = DecodeContext(raw, scalars)
+        return {h.to_string(): h.decode(ctx) for h in self._handlers}
@@ -0,0 +1,58 @@
+"""
+On-disk pickle caches of tables derived from the data files shipped with MineDojo.
+
+Caches are keyed by hashes of the contents of the files they are derived from, so that a changed file
+is never served stale tables. The cache directory defaults to ``~/.minedojo/cache`` and can be changed
+with ``MINEDOJO_CACHE_DIR``.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import hashlib
+import logging
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> str:
+    return os.environ.get(
+        "MINEDOJO_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".minedojo", "cache"),
+    )
+
+
+def content_digest(content: bytes, salt: str = "") -> str:
+    """Hex sha256 of ``content`` and ``salt``, e.g., a version of the derived tables."""
+    return hashlib.sha256(content + salt.encode()).hexdigest()
+
+
+def load_pickle(path: str) -> Any | None:
+    """Loads a cached object, or returns ``None`` if there is no readable cache at ``path``."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring corrupted cache {path}: {e}")
+        return None
+
+
+def save_pickle(path: str, obj: Any):
+    """Caches an object at ``path``. Failures are only logged since caches are optional."""
+    # imported here since caches are only written on misses
+    import tempfile
+
+    cache_dir = os.path.dirname(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a temporary file first so that concurrent workers never read partial caches
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Failed to write cache {path}: {e}")
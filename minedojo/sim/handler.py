@@ -2,8 +2,6 @@
 # Author: William H. Guss, Brandon Houghton
 from abc import ABC, abstractmethod
 
-import jinja2
-
 
 class Handler(ABC):
     """Defines the minimal interface for a MineRL handler.
@@ -43,6 +41,9 @@ class Handler(ABC):
         Returns:
             str: the XML representation of the handler.
         """
+        # imported here since templating is only needed to build mission XMLs
+        import jinja2
+
         var_dict = {}
         for attr_name in dir(self):
             if "xml" not in attr_name:
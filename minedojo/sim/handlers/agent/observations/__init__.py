@@ -7,7 +7,12 @@ from .compass import *
 from .lifestats import *
 from .pov import *
 from .damage_source import *
-from .voxel_lidar import VoxelObservation, RichLidarObservation
+from .voxel_lidar import (
+    VoxelObservation,
+    RichLidarObservation,
+    make_lidar_ray_grid,
+    lidar_depth_image,
+)
 from .true_flat_inventory import TrueFlatInventoryObservation, EquipmentObservation
 from .achievements import ObsFromAchievements
 from .nearby_tools import NearbyToolsObservation
@@ -1,6 +1,8 @@
 # Copyright (c) 2020 All Rights Reserved
 # Author: William H. Guss, Brandon Houghton
-from typing import List
+import logging
+from collections.abc import Mapping
+from typing import List, Dict, Tuple
 
 import numpy as np
 
@@ -12,12 +14,45 @@ from minedojo.sim.handlers.translation import (
 )
 
 
-__all__ = ["ObserveFromFullStats"]
+__all__ = ["ObserveFromFullStats", "FullStatsView"]
+
+logger = logging.getLogger(__name__)
+
+
+class FullStatsView(Mapping):
+    """
+    A read-only mapping from stat names to 0-d arrays, backed by a single ``int32`` vector.
+    Values are views into ``vector`` and are only materialized on access.
+    """
+
+    def __init__(self, vector: np.ndarray, name_to_index: Dict[str, int]):
+        self.vector = vector
+        self.name_to_index = name_to_index
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.vector[self.name_to_index[name], ...]
+
+    def __iter__(self):
+        return iter(self.name_to_index)
+
+    def __len__(self):
+        return len(self.name_to_index)
+
+    def __repr__(self):
+        return f"FullStatsView({dict(self)})"
+
+    def __deepcopy__(self, memo):
+        # the name index is immutable and shared
+        return FullStatsView(self.vector.copy(), self.name_to_index)
 
 
 class ObserveFromFullStats(TranslationHandlerGroup):
     """
     Includes the use_item statistics for every item in MC that can be used
+
+    Stats are extracted in a single pass over the stats JSON, using key paths precomputed at construction,
+    into an ``int32`` vector. Observations are ``FullStatsView`` mappings on top of that vector, which is
+    owned by the observation and never reused across steps.
     """
 
     def xml_template(self) -> str:
@@ -45,6 +80,41 @@ class ObserveFromFullStats(TranslationHandlerGroup):
                     if statKeys[1] == stat_key
                 ]
             )
+        # group key paths by their parent path, so each parent dict is looked up once per step
+        self.name_to_index = {h.to_string(): i for i, h in enumerate(self.handlers)}
+        plan: Dict[Tuple[str, ...], List[Tuple[str, int]]] = {}
+        for i, h in enumerate(self.handlers):
+            plan.setdefault(tuple(h.hero_keys[:-1]), []).append((h.hero_keys[-1], i))
+        self._plan = list(plan.items())
+        self._missing_reported = set()
+
+    def from_hero(self, x) -> FullStatsView:
+        # a fresh vector every step, since observations of earlier steps can still be alive, e.g., results of
+        # ``MineDojoSim.step_async`` or observations kept by the caller, and must not change under them
+        vector = np.zeros(len(self.handlers), dtype=np.int32)
+        for parent_keys, leaves in self._plan:
+            parent = x
+            for key in parent_keys:
+                parent = parent.get(key, None) if parent is not None else None
+            if parent is None:
+                parent = {}
+            for leaf_key, idx in leaves:
+                value = parent.get(leaf_key, None)
+                if value is None:
+                    if idx not in self._missing_reported:
+                        # report only once, missing stats are filled with 0
+                        self._missing_reported.add(idx)
+                        logger.error(
+                            f"No {leaf_key} observation! Yielding default value 0 for "
+                            f"{'/'.join(parent_keys + (leaf_key,))}"
+                        )
+                    continue
+                vector[idx] = value
+        return FullStatsView(vector, self.name_to_index)
+
+    def decode(self, ctx) -> FullStatsView:
+        # stats are already extracted in a single pass by from_hero
+        return self.from_hero(ctx.raw)
 
 
 class _FullStatsObservation(KeymapTranslationHandler):
@@ -56,9 +126,11 @@ class _FullStatsObservation(KeymapTranslationHandler):
     def __init__(self, key_list: List[str], space=None, default_if_missing=None):
         if space is None:
             if "achievement" == key_list[0]:
-                space = spaces.Box(low=0, high=1, shape=(), dtype=int)
+                space = spaces.Box(low=0, high=1, shape=(), dtype=np.int32)
             else:
-                space = spaces.Box(low=0, high=np.inf, shape=(), dtype=int)
+                space = spaces.Box(
+                    low=0, high=np.iinfo(np.int32).max, shape=(), dtype=np.int32
+                )
         if default_if_missing is None:
             default_if_missing = np.zeros((), dtype=float)
 
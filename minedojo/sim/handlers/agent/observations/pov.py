@@ -1,6 +1,6 @@
 # Copyright (c) 2020 All Rights Reserved
 # Author: William H. Guss, Brandon Houghton
-from typing import Tuple
+from typing import Tuple, Optional
 
 import numpy as np
 
@@ -11,6 +11,22 @@ from minedojo.sim.handlers.translation import KeymapTranslationHandler
 class POVObservation(KeymapTranslationHandler):
     """
     Handles POV observations.
+
+    By default, frames are flipped and copied into a new contiguous ``(C, H, W)`` array at every decode.
+    If any of ``output_resolution``, ``crop``, ``grayscale``, ``channels_last`` is given, frames go
+    through a preprocessing stage instead: vertical flip, crop, area resize and grayscale conversion,
+    writing into preallocated contiguous buffers that are reused across steps.
+    The returned array is then overwritten by the next decode, so copy it if it needs to outlive the step.
+    The flipped full-resolution ``(H, W, C)`` frame of the last decode is kept in ``full_frame``,
+    e.g. for recording, while the (smaller) processed frame is fed to the policy.
+
+    Args:
+        video_resolution: ``(H, W)`` of the frames rendered by Minecraft.
+        include_depth: If ``True``, frames have a fourth depth channel.
+        output_resolution: If not ``None``, ``(H, W)`` to area-resize frames to.
+        crop: If not ``None``, ``(top, left, height, width)`` of the region of the full frame to keep, applied before resizing.
+        grayscale: If ``True``, converts RGB frames to a single luminance channel.
+        channels_last: If ``True``, returns ``(H, W, C)`` frames instead of ``(C, H, W)``.
     """
 
     def to_string(self):
@@ -20,6 +36,14 @@ class POVObservation(KeymapTranslationHandler):
         result = f"POVObservation(video_resolution={self.video_resolution}"
         if self.include_depth:
             result += ", include_depth=True"
+        if self.output_resolution is not None:
+            result += f", output_resolution={self.output_resolution}"
+        if self.crop is not None:
+            result += f", crop={self.crop}"
+        if self.grayscale:
+            result += ", grayscale=True"
+        if self.channels_last:
+            result += ", channels_last=True"
         result += ")"
         result = f"{result}:{self.to_string()}"
         return result
@@ -34,37 +58,128 @@ class POVObservation(KeymapTranslationHandler):
             </VideoProducer>"""
         )
 
-    def __init__(self, video_resolution: Tuple[int, int], include_depth: bool = False):
+    def __init__(
+        self,
+        video_resolution: Tuple[int, int],
+        include_depth: bool = False,
+        output_resolution: Optional[Tuple[int, int]] = None,
+        crop: Optional[Tuple[int, int, int, int]] = None,
+        grayscale: bool = False,
+        channels_last: bool = False,
+    ):
         self.include_depth = include_depth
         self.video_resolution = video_resolution
-        if include_depth:
-            space = spaces.Box(0, 255, [4] + list(video_resolution), dtype=np.uint8)
-            self.video_depth = 4
-
-        else:
-            space = spaces.Box(0, 255, [3] + list(video_resolution), dtype=np.uint8)
-            self.video_depth = 3
-
+        self.video_depth = 4 if include_depth else 3
         self.video_height = video_resolution[0]
         self.video_width = video_resolution[1]
 
+        self.output_resolution = (
+            tuple(output_resolution) if output_resolution is not None else None
+        )
+        self.crop = tuple(crop) if crop is not None else None
+        self.grayscale = grayscale
+        self.channels_last = channels_last
+        self._preprocess = (
+            self.output_resolution is not None
+            or self.crop is not None
+            or grayscale
+            or channels_last
+        )
+        if grayscale:
+            assert not include_depth, "grayscale is not supported with depth frames"
+        if self.crop is not None:
+            top, left, height, width = self.crop
+            assert (
+                top >= 0
+                and left >= 0
+                and height > 0
+                and width > 0
+                and top + height <= self.video_height
+                and left + width <= self.video_width
+            ), f"crop {self.crop} is out of the frame of size {video_resolution}"
+
+        out_hw = self.output_resolution or (
+            self.crop[2:] if self.crop is not None else tuple(video_resolution)
+        )
+        out_c = 1 if grayscale else self.video_depth
+        out_shape = list(out_hw) + [out_c] if channels_last else [out_c] + list(out_hw)
+        space = spaces.Box(0, 255, out_shape, dtype=np.uint8)
+
+        # reusable buffers of the preprocessing stage, allocated lazily on the first decode
+        self._full_frame = None
+        self._resized = None
+        self._gray = None
+        self._out = None
+
         super().__init__(hero_keys=["pov"], univ_keys=["pov"], space=space)
 
+    @property
+    def full_frame(self) -> Optional[np.ndarray]:
+        """The flipped, full-resolution ``(H, W, C)`` frame of the last decode.
+        Only available with preprocessing enabled, ``None`` otherwise."""
+        return self._full_frame
+
     def from_hero(self, obs):
+        if self._preprocess:
+            return self._preprocess_pov(obs.get("pov", None))
+
         byte_array = super().from_hero(obs)
         pov = np.frombuffer(byte_array, dtype=np.uint8)
 
         if pov is None or len(pov) == 0:
-            pov = np.zeros(
-                (self.video_height, self.video_width, self.video_depth), dtype=np.uint8
-            ).transpose((2, 0, 1))
+            pov = np.zeros(self.space.shape, dtype=np.uint8)
         else:
-            pov = pov.reshape((self.video_height, self.video_width, self.video_depth))[
-                ::-1, :, :
-            ].transpose((2, 0, 1))
+            # flip and transpose in a single copy into a new contiguous array
+            pov = np.ascontiguousarray(
+                pov.reshape((self.video_height, self.video_width, self.video_depth))[
+                    ::-1, :, :
+                ].transpose((2, 0, 1))
+            )
 
         return pov
 
+    def _preprocess_pov(self, byte_array) -> np.ndarray:
+        # imported here since only the preprocessing stage needs OpenCV
+        import cv2
+
+        if self._full_frame is None:
+            self._full_frame = np.zeros(
+                (self.video_height, self.video_width, self.video_depth), dtype=np.uint8
+            )
+            self._out = np.zeros(self.space.shape, dtype=np.uint8)
+        frame = self._full_frame
+        if byte_array is not None and len(byte_array) > 0:
+            raw = np.frombuffer(byte_array, dtype=np.uint8).reshape(frame.shape)
+            # Minecraft frames are bottom-up, flip while copying into the buffer
+            cv2.flip(raw, 0, dst=frame)
+        else:
+            frame.fill(0)
+
+        if self.crop is not None:
+            top, left, height, width = self.crop
+            frame = frame[top : top + height, left : left + width]
+        if self.output_resolution is not None:
+            out_h, out_w = self.output_resolution
+            if self._resized is None:
+                self._resized = np.zeros(
+                    (out_h, out_w, self.video_depth), dtype=np.uint8
+                )
+            cv2.resize(
+                frame, (out_w, out_h), dst=self._resized, interpolation=cv2.INTER_AREA
+            )
+            frame = self._resized
+        if self.grayscale:
+            if self._gray is None:
+                self._gray = np.zeros(frame.shape[:2], dtype=np.uint8)
+            cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY, dst=self._gray)
+            frame = self._gray[..., None]
+
+        if self.channels_last:
+            np.copyto(self._out, frame)
+        else:
+            np.copyto(self._out, frame.transpose((2, 0, 1)))
+        return self._out
+
     def __or__(self, other):
         """
         Combines two POV observations into one. If all of the properties match return self
@@ -74,9 +189,18 @@ class POVObservation(KeymapTranslationHandler):
             isinstance(other, POVObservation)
             and self.include_depth == other.include_depth
             and self.video_resolution == other.video_resolution
+            and self.output_resolution == other.output_resolution
+            and self.crop == other.crop
+            and self.grayscale == other.grayscale
+            and self.channels_last == other.channels_last
         ):
             return POVObservation(
-                self.video_resolution, include_depth=self.include_depth
+                self.video_resolution,
+                include_depth=self.include_depth,
+                output_resolution=self.output_resolution,
+                crop=self.crop,
+                grayscale=self.grayscale,
+                channels_last=self.channels_last,
             )
         else:
             raise ValueError("Incompatible observables!")
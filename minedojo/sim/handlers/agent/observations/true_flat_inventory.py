@@ -7,9 +7,19 @@ import numpy as np
 
 from minedojo.sim import spaces
 from minedojo.sim.handlers.translation import TranslationHandler
+from minedojo.sim.mc_meta.vocab import ITEM_VOCAB
+
+_INVENTORY_KEYS = ["variant", "quantity", "max_durability", "cur_durability"]
 
 
 class TrueFlatInventoryObservation(TranslationHandler):
+    """
+    Args:
+        name_ids: If ``True``, item names are ``int16`` ids in ``ITEM_VOCAB``, i.e., indices in ``mc.ALL_ITEMS``,
+                instead of strings.
+        compact_dtypes: If ``True``, ``variant`` and ``quantity`` are ``uint8`` and durabilities are ``int16``.
+    """
+
     n_slots = 36
     # exclude equipment slots
     excluded_slots = [36, 37, 38, 39, 40]
@@ -20,48 +30,72 @@ class TrueFlatInventoryObservation(TranslationHandler):
     def xml_template(self) -> str:
         return str("""<ObservationFromFullInventory flat="false"/>""")
 
-    def __init__(self):
+    def __init__(self, name_ids: bool = False, compact_dtypes: bool = False):
+        self.name_ids = name_ids
+        self.compact_dtypes = compact_dtypes
+        durability_dtype = np.int16 if compact_dtypes else np.float32
+        max_durability = np.iinfo(np.int16).max if compact_dtypes else np.inf
         shape = (self.n_slots,)
         space = spaces.Dict(
             {
-                "name": spaces.Text(shape=shape),
+                "name": spaces.Box(
+                    low=0, high=len(ITEM_VOCAB) - 1, shape=shape, dtype=np.int16
+                )
+                if name_ids
+                else spaces.Text(shape=shape),
                 # max variant index is 120, i.e., item id 383:120 spawn egg for villager
                 # see https://minecraft-ids.grahamedgecombe.com/
-                "variant": spaces.MultiDiscrete([121 for _ in range(self.n_slots)]),
+                "variant": spaces.MultiDiscrete(
+                    [121 for _ in range(self.n_slots)],
+                    dtype=np.uint8 if compact_dtypes else np.int64,
+                ),
                 # min stack size is 0 (no item), max stack size is 64
                 "quantity": spaces.Box(
-                    low=0, high=64, shape=(self.n_slots,), dtype=np.float32
+                    low=0,
+                    high=64,
+                    shape=(self.n_slots,),
+                    dtype=np.uint8 if compact_dtypes else np.float32,
                 ),
                 # though durability in MC seems to be integer, we still use box with float32 here
                 "max_durability": spaces.Box(
-                    low=-1, high=np.inf, shape=shape, dtype=np.float32
+                    low=-1, high=max_durability, shape=shape, dtype=durability_dtype
                 ),
                 "cur_durability": spaces.Box(
-                    low=-1, high=np.inf, shape=shape, dtype=np.float32
+                    low=-1, high=max_durability, shape=shape, dtype=durability_dtype
                 ),
             }
         )
         super().__init__(space=space)
+        n_all_slots = self.n_slots + len(self.excluded_slots)
+        self._slot_index = np.array(
+            [i for i in range(n_all_slots) if i not in self.excluded_slots]
+        )
 
     def from_hero(self, obs_dict: Dict[str, Any]):
-        assert "inventory" in obs_dict, "Missing inventory key in malmo json"
-        raw_inventory = [
-            item for item in obs_dict["inventory"] if item["inventory"] == "inventory"
-        ]
-        assert len(raw_inventory) == self.n_slots + len(self.excluded_slots), "INTERNAL"
-        return {
-            key: np.array(
-                [
-                    self._name_preprocess(slot_dict[key])
-                    if key == "name"
-                    else slot_dict[key]
-                    for i, slot_dict in enumerate(raw_inventory)
-                    if i not in self.excluded_slots
-                ],
-                dtype=self.space[key].dtype,
+        return self._select_slots(_parse_inventory(obs_dict))
+
+    def decode(self, ctx):
+        # the parsed inventory list is shared with the other inventory handlers of the same step
+        return self._select_slots(ctx.subtree("inventory", _parse_inventory))
+
+    def _select_slots(self, parsed: Dict[str, np.ndarray]):
+        assert len(parsed["name"]) == len(self._slot_index) + len(
+            self.excluded_slots
+        ), "INTERNAL"
+        result = {
+            key: np.asarray(
+                parsed[key][self._slot_index], dtype=self.space[key].dtype
             ).reshape(self.space[key].shape)
             for key in self.space
+            if key != "name"
         }
+        names = parsed["name"][self._slot_index]
+        result["name"] = (
+            ITEM_VOCAB.encode(names)
+            if self.name_ids
+            else np.asarray(names, dtype=self.space["name"].dtype)
+        )
+        return result
 
     @staticmethod
     def _name_preprocess(raw_name: str):
@@ -71,6 +105,25 @@ class TrueFlatInventoryObservation(TranslationHandler):
             return raw_name
 
 
+def _parse_inventory(obs_dict: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Parses the raw inventory list of all slots, including equipment, into one array per key."""
+    assert "inventory" in obs_dict, "Missing inventory key in malmo json"
+    raw_inventory = [
+        item for item in obs_dict["inventory"] if item["inventory"] == "inventory"
+    ]
+    parsed = {
+        key: np.array([slot_dict[key] for slot_dict in raw_inventory])
+        for key in _INVENTORY_KEYS
+    }
+    parsed["name"] = np.array(
+        [
+            TrueFlatInventoryObservation._name_preprocess(slot_dict["name"])
+            for slot_dict in raw_inventory
+        ]
+    )
+    return parsed
+
+
 class EquipmentObservation(TrueFlatInventoryObservation):
     n_slots = 6
     excluded_slots = list(range(1, 36))
@@ -1,13 +1,22 @@
+import logging
+from typing import List, Tuple, Dict
+
 import numpy as np
 
 from minedojo.sim import spaces
+from minedojo.sim.mc_meta.vocab import BLOCK_VOCAB, ENTITY_VOCAB
 from minedojo.sim.handlers.translation import KeymapTranslationHandler
 
 
+logger = logging.getLogger(__name__)
+
+
 class VoxelObservation(KeymapTranslationHandler):
     """
     Handles voxel observations.
     Returned voxels are in (x, y, z) order, where x, y, z are all in ascending order.
+    If ``block_ids`` is ``True``, ``block_name`` is returned as ``int16`` ids of ``BLOCK_VOCAB`` instead of strings.
+    If ``compact_dtypes`` is ``True``, ``block_meta`` is ``uint8`` and ``cos_look_vec_angle`` is ``float16``.
     """
 
     def to_hero(self, x) -> str:
@@ -27,7 +36,12 @@ class VoxelObservation(KeymapTranslationHandler):
             </ObservationFromGrid>"""
         )
 
-    def __init__(self, limits=((-3, 3), (-1, 3), (-3, 3))):
+    def __init__(
+        self,
+        limits=((-3, 3), (-1, 3), (-3, 3)),
+        block_ids: bool = False,
+        compact_dtypes: bool = False,
+    ):
         self.xmin = limits[0][0]
         self.ymin = limits[1][0]
         self.zmin = limits[2][0]
@@ -35,14 +49,26 @@ class VoxelObservation(KeymapTranslationHandler):
         self.ymax = limits[1][1]
         self.zmax = limits[2][1]
         self.grid_size = [1 + b - a for a, b in limits]
+        self.block_ids = block_ids
+        self.compact_dtypes = compact_dtypes
 
         space = spaces.Dict(
             {
-                "block_name": spaces.Text(shape=self.grid_size),
+                "block_name": spaces.Box(
+                    low=0,
+                    high=len(BLOCK_VOCAB) - 1,
+                    shape=self.grid_size,
+                    dtype=np.int16,
+                )
+                if block_ids
+                else spaces.Text(shape=self.grid_size),
                 # max block meta is 120, i.e., item id 383:120 spawn egg for villager
                 # see https://minecraft-ids.grahamedgecombe.com/
                 "block_meta": spaces.Box(
-                    low=0, high=120, shape=self.grid_size, dtype=np.int64
+                    low=0,
+                    high=120,
+                    shape=self.grid_size,
+                    dtype=np.uint8 if compact_dtypes else np.int64,
                 ),
                 "is_collidable": spaces.Box(
                     low=0, high=1, shape=self.grid_size, dtype=bool
@@ -62,7 +88,10 @@ class VoxelObservation(KeymapTranslationHandler):
                     low=0, high=1, shape=self.grid_size, dtype=bool
                 ),
                 "cos_look_vec_angle": spaces.Box(
-                    low=-1, high=1, shape=self.grid_size, dtype=np.float32
+                    low=-1,
+                    high=1,
+                    shape=self.grid_size,
+                    dtype=np.float16 if compact_dtypes else np.float32,
                 ),
             }
         )
@@ -86,17 +115,18 @@ class VoxelObservation(KeymapTranslationHandler):
         assert len(voxels_arr) == np.prod(self.grid_size) * len(
             self._key_list
         ), "INTERNAL"
+        n_fields = len(self._key_list)
+        # records are interleaved, so each field is a strided slice that numpy converts in one go
         # yunfan: note that returns from java side are in F order, we need to use F order to be consistent
-        return {
-            key: np.array(
-                [
-                    voxels_arr[i]
-                    for i in range(bias, len(voxels_arr), len(self._key_list))
-                ],
-                dtype=self.space[key].dtype,
-            ).reshape(self.space[key].shape, order="F")
-            for bias, key in enumerate(self._key_list)
-        }
+        result = {}
+        for bias, key in enumerate(self._key_list):
+            column = voxels_arr[bias::n_fields]
+            if key == "block_name" and self.block_ids:
+                column = BLOCK_VOCAB.encode(column)
+            else:
+                column = np.array(column, dtype=self.space[key].dtype)
+            result[key] = column.reshape(self.grid_size, order="F")
+        return result
 
     def __or__(self, other):
         """
@@ -116,8 +146,15 @@ class VoxelObservation(KeymapTranslationHandler):
 class RichLidarObservation(KeymapTranslationHandler):
     """
     Handles rich LIDAR observations.
+    If ``name_ids`` is ``True``, ``block_name`` and ``entity_name`` are returned as ``int16`` ids
+    of ``BLOCK_VOCAB`` and ``ENTITY_VOCAB`` instead of strings.
+    If ``compact_dtypes`` is ``True``, ``block_meta`` is ``uint8``, ``harvest_level`` is ``int8``,
+    and distances and ray angles are ``float16``. Traced block coordinates stay ``float32`` to hold world coordinates.
     """
 
+    # raw entity names reported by Minecraft mapped to names in observations, shared by all instances
+    _entity_name_cache: Dict[str, str] = {}
+
     def to_hero(self, x) -> str:
         pass
 
@@ -135,7 +172,7 @@ class RichLidarObservation(KeymapTranslationHandler):
         """
         )
 
-    def __init__(self, rays=None):
+    def __init__(self, rays=None, name_ids: bool = False, compact_dtypes: bool = False):
         # Note rays use [pitch, yaw, distance]:
         # The pitch (in radians) is relative to lookVec
         # The yaw (in radians) is relative to lookVec
@@ -147,19 +184,34 @@ class RichLidarObservation(KeymapTranslationHandler):
             ]
         self.rays = rays
         self.num_rays = len(rays)
+        self.name_ids = name_ids
+        self.compact_dtypes = compact_dtypes
 
         _shape = [self.num_rays]
+        _float_dtype = np.float16 if compact_dtypes else np.float32
         space = spaces.Dict(
             {
-                "block_name": spaces.Text(shape=_shape),
+                "block_name": spaces.Box(
+                    low=0, high=len(BLOCK_VOCAB) - 1, shape=_shape, dtype=np.int16
+                )
+                if name_ids
+                else spaces.Text(shape=_shape),
                 "block_distance": spaces.Box(
-                    low=-1, high=np.inf, shape=_shape, dtype=np.float32
+                    low=-1, high=np.inf, shape=_shape, dtype=_float_dtype
                 ),
                 # max block meta is 120, i.e., item id 383:120 spawn egg for villager
                 # see https://minecraft-ids.grahamedgecombe.com/
-                "block_meta": spaces.Box(low=0, high=120, shape=_shape, dtype=np.int64),
+                "block_meta": spaces.Box(
+                    low=0,
+                    high=120,
+                    shape=_shape,
+                    dtype=np.uint8 if compact_dtypes else np.int64,
+                ),
                 "harvest_level": spaces.Box(
-                    low=-1, high=4, shape=_shape, dtype=np.int64
+                    low=-1,
+                    high=4,
+                    shape=_shape,
+                    dtype=np.int8 if compact_dtypes else np.int64,
                 ),
                 "is_tool_not_required": spaces.Box(
                     low=0, high=1, shape=_shape, dtype=bool
@@ -168,15 +220,19 @@ class RichLidarObservation(KeymapTranslationHandler):
                 "is_liquid": spaces.Box(low=0, high=1, shape=_shape, dtype=bool),
                 "is_solid": spaces.Box(low=0, high=1, shape=_shape, dtype=bool),
                 "can_burn": spaces.Box(low=0, high=1, shape=_shape, dtype=bool),
-                "entity_name": spaces.Text(shape=_shape),
+                "entity_name": spaces.Box(
+                    low=0, high=len(ENTITY_VOCAB) - 1, shape=_shape, dtype=np.int16
+                )
+                if name_ids
+                else spaces.Text(shape=_shape),
                 "entity_distance": spaces.Box(
-                    low=-1, high=np.inf, shape=_shape, dtype=np.float32
+                    low=-1, high=np.inf, shape=_shape, dtype=_float_dtype
                 ),
                 "ray_pitch": spaces.Box(
-                    low=-np.inf, high=np.inf, shape=_shape, dtype=np.float32
+                    low=-np.inf, high=np.inf, shape=_shape, dtype=_float_dtype
                 ),
                 "ray_yaw": spaces.Box(
-                    low=-np.inf, high=np.inf, shape=_shape, dtype=np.float32
+                    low=-np.inf, high=np.inf, shape=_shape, dtype=_float_dtype
                 ),
                 "traced_block_x": spaces.Box(
                     low=-np.inf, high=np.inf, shape=_shape, dtype=np.float32
@@ -218,18 +274,24 @@ class RichLidarObservation(KeymapTranslationHandler):
     def from_hero(self, obs):
         raytrace_arr = obs[self.hero_keys[0]]
         assert len(raytrace_arr) == self.num_rays * len(self._key_list), "INTERNAL"
-        return {
-            key: np.array(
-                [
-                    self._map_entity_name(raytrace_arr[i])
-                    if key == "entity_name"
-                    else raytrace_arr[i]
-                    for i in range(bias, len(raytrace_arr), len(self._key_list))
-                ],
-                dtype=self.space[key].dtype,
-            ).reshape(self.space[key].shape)
-            for bias, key in enumerate(self._key_list)
-        }
+        n_fields = len(self._key_list)
+        # records are interleaved, so each field is a strided slice that numpy converts in one go
+        result = {}
+        for bias, key in enumerate(self._key_list):
+            column = raytrace_arr[bias::n_fields]
+            if key == "entity_name":
+                # only map the distinct raw names, rays mostly hit a few entities
+                uniques, inverse = np.unique(column, return_inverse=True)
+                names = np.array([self._map_entity_name(name) for name in uniques])
+                if self.name_ids:
+                    names = ENTITY_VOCAB.encode(names)
+                column = names[inverse.reshape(-1)]
+            elif key == "block_name" and self.name_ids:
+                column = BLOCK_VOCAB.encode(column)
+            else:
+                column = np.array(column, dtype=self.space[key].dtype)
+            result[key] = column.reshape(self.space[key].shape)
+        return result
 
     def __or__(self, other):
         """
@@ -237,16 +299,72 @@ class RichLidarObservation(KeymapTranslationHandler):
         """
         if isinstance(other, RichLidarObservation):
             all_rays = self.rays + other.rays
-            return RichLidarObservation(rays=all_rays)
+            return RichLidarObservation(
+                rays=all_rays,
+                name_ids=self.name_ids,
+                compact_dtypes=self.compact_dtypes,
+            )
         else:
             raise ValueError("Incompatible observables!")
 
-    @staticmethod
-    def _map_entity_name(raw_name: str) -> str:
-        if raw_name.startswith("Entity"):
-            return raw_name[6:].lower()
-        elif raw_name == "null":
-            return raw_name
-        else:
-            print(f"Unknown entity prefix. Return raw name {raw_name}")
-            return raw_name
+    @classmethod
+    def _map_entity_name(cls, raw_name: str) -> str:
+        name = cls._entity_name_cache.get(raw_name, None)
+        if name is None:
+            if raw_name.startswith("Entity"):
+                name = raw_name[6:].lower()
+            elif raw_name == "null":
+                name = raw_name
+            else:
+                # only reported once since the result is cached
+                logger.warning(f"Unknown entity prefix. Return raw name {raw_name}")
+                name = raw_name
+            cls._entity_name_cache[raw_name] = name
+        return name
+
+
+def make_lidar_ray_grid(
+    n_pitch: int,
+    n_yaw: int,
+    fov_pitch: float = np.pi / 2,
+    fov_yaw: float = np.pi / 2,
+    distance: float = 10.0,
+) -> List[Tuple[float, float, float]]:
+    """Generates lidar rays on an evenly spaced pitch x yaw grid centered at the agent's looking vector.
+
+    Args:
+        n_pitch: Number of rows of the grid.
+        n_yaw: Number of columns of the grid.
+        fov_pitch: Vertical field of view in radians.
+        fov_yaw: Horizontal field of view in radians.
+        distance: The maximum distance of each ray.
+
+    Return:
+        A list of ``n_pitch * n_yaw`` tuple(pitch, yaw, distance) in row-major order, to be used as ``lidar_rays``.
+    """
+    pitches = np.linspace(-fov_pitch / 2, fov_pitch / 2, n_pitch)
+    yaws = np.linspace(-fov_yaw / 2, fov_yaw / 2, n_yaw)
+    return [
+        (float(pitch), float(yaw), float(distance)) for pitch in pitches for yaw in yaws
+    ]
+
+
+def lidar_depth_image(
+    rays: Dict[str, np.ndarray],
+    grid_shape: Tuple[int, int],
+    include_entities: bool = True,
+) -> np.ndarray:
+    """Converts lidar observations of rays from ``make_lidar_ray_grid`` into an ``(n_pitch, n_yaw)`` depth image.
+
+    Args:
+        rays: The ``rays`` observation.
+        grid_shape: ``(n_pitch, n_yaw)`` of the ray grid.
+        include_entities: If ``True``, the depth is the distance to the closer of the hit block and entity.
+
+    Return:
+        A ``float32`` array of shape ``grid_shape``.
+    """
+    depth = rays["block_distance"]
+    if include_entities:
+        depth = np.minimum(depth, rays["entity_distance"])
+    return np.asarray(depth, dtype=np.float32).reshape(grid_shape)
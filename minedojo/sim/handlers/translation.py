@@ -26,6 +26,14 @@ class TranslationHandler(Handler):
         """
         raise NotImplementedError()
 
+    def decode(self, ctx):
+        """
+        Converts the raw observation of a ``DecodeContext`` to a member of the space.
+        Handlers can override this to reuse the parts of the raw observation decoded
+        once per step by the ``DecodingPlan``. Defaults to ``from_hero``.
+        """
+        return self.from_hero(ctx.raw)
+
     def to_hero(self, x) -> str:
         """
         Takes an instance of the handler, x in self.space, and maps it to
@@ -97,6 +105,10 @@ class KeymapTranslationHandler(TranslationHandler):
     def from_hero(self, hero_dict, dtype=None):
         return self.walk_dict(hero_dict, self.hero_keys, dtype=dtype)
 
+    def decode(self, ctx):
+        value = ctx.scalar(self)
+        return self.from_hero(ctx.raw) if value is None else value
+
     def from_universal(self, univ_dict):
         return self.walk_dict(univ_dict, self.univ_keys)
 
@@ -130,6 +142,10 @@ class TranslationHandlerGroup(TranslationHandler):
 
         return {h.to_string(): h.from_hero(x) for h in self.handlers}
 
+    def decode(self, ctx) -> Dict[str, Any]:
+        """Same as from_hero, but reuses the parts of the raw observation already decoded in ctx."""
+        return {h.to_string(): h.decode(ctx) for h in self.handlers}
+
     def from_universal(self, x: Dict[str, Any]) -> Dict[str, Any]:
         """Performs the same operation as from_hero except with from_universal."""
         return {h.to_string(): h.from_universal(x) for h in self.handlers}
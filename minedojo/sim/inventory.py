@@ -1,6 +1,6 @@
 from typing import NamedTuple, Optional, Dict, Union, Tuple
 
-from minedojo.sim.mc_meta.mc import ALL_ITEMS
+from minedojo.sim.mc_meta.item_registry import ITEM_REGISTRY
 
 
 EQUIP_SLOTS = {
@@ -31,7 +31,7 @@ def parse_inventory_item(item: InventoryItem) -> Tuple[int, Dict[str, Union[str,
         assert slot in EQUIP_SLOTS, f"Unknown slot {slot}"
         slot = EQUIP_SLOTS[slot]
     assert MIN_SLOT_IDX <= slot <= MAX_SLOT_IDX, f"invalid slot index {slot}"
-    assert name in ALL_ITEMS, f"Unknown item {name}"
+    assert name in ITEM_REGISTRY, f"Unknown item {name}"
     variant = variant or 0
     quantity = quantity or 1
     return slot, {
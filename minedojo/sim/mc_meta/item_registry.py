@@ -0,0 +1,173 @@
+"""
+Constant-time lookups of Minecraft items.
+
+Items are interned as integer ids, their indices in ``mc.ALL_ITEMS``, which are also the ids in ``ITEM_VOCAB``.
+Names are accepted both with underscores as in Malmo commands (e.g., "crafting_table")
+and with spaces as in observations (e.g., "crafting table").
+"""
+
+from typing import Dict, List, Union
+
+import numpy as np
+
+from . import mc
+
+
+class ItemRegistry:
+    """Ids, name normalization tables, variants and category bitmasks of all items in ``mc.ALL_ITEMS``."""
+
+    # one bit per category in `categories`
+    CATEGORIES = ["placeable", "non_mainhand"] + list(mc.ITEMS_BY_CATEGORY.keys())
+
+    def __init__(self):
+        self._names = np.array(mc.ALL_ITEMS)
+        self._display_names = np.array(
+            [name.replace("_", " ") for name in mc.ALL_ITEMS]
+        )
+        # canonical names with underscores only
+        self._name_to_id = {name: i for i, name in enumerate(mc.ALL_ITEMS)}
+        # names in either form
+        self._any_name_to_id = dict(self._name_to_id)
+        self._any_name_to_id.update(
+            {name: i for i, name in enumerate(self._display_names.tolist())}
+        )
+        self._to_underscore = {
+            name: mc.ALL_ITEMS[i] for name, i in self._any_name_to_id.items()
+        }
+        self._to_space = {
+            name: self._display_names[i].item()
+            for name, i in self._any_name_to_id.items()
+        }
+        self._mc_item_ids = {name: i for i, name in enumerate(mc.MC_ITEM_IDS)}
+
+        self._variants: Dict[str, List[str]] = mc.VARIANTS_BY_ITEM
+        self._variant_ids = {name: i for i, name in enumerate(mc.ALL_ITEM_VARIANTS)}
+
+        self._craft_smelt_ids = {
+            name: i for i, name in enumerate(mc.ALL_CRAFT_SMELT_ITEMS)
+        }
+        self._craft_smelt_item_ids = self.ids_of(mc.ALL_CRAFT_SMELT_ITEMS)
+
+        assert len(self.CATEGORIES) <= 8
+        category_items = {
+            "placeable": mc.PLACEABLE_ITEM_NAMES,
+            "non_mainhand": mc.NON_MAINHAND_ITEM_NAMES,
+            **mc.ITEMS_BY_CATEGORY,
+        }
+        self._categories = np.zeros((len(self),), dtype=np.uint8)
+        self._category_masks = {}
+        for bit, category in enumerate(self.CATEGORIES):
+            mask = np.zeros((len(self),), dtype=bool)
+            mask[self.ids_of(category_items[category])] = True
+            mask.flags.writeable = False
+            self._category_masks[category] = mask
+            self._categories[mask] |= np.uint8(1 << bit)
+        self._categories.flags.writeable = False
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name: str):
+        """Whether ``name`` is a canonical item name, i.e., with underscores."""
+        return name in self._name_to_id
+
+    def __repr__(self):
+        return f"ItemRegistry(size={len(self)})"
+
+    @property
+    def names(self) -> np.ndarray:
+        """Canonical names with underscores, indexed by ids."""
+        return self._names
+
+    @property
+    def display_names(self) -> np.ndarray:
+        """Names with spaces as in observations, indexed by ids."""
+        return self._display_names
+
+    @property
+    def categories(self) -> np.ndarray:
+        """``uint8`` bitmask of categories of each item, bit ``i`` is set for ``CATEGORIES[i]``."""
+        return self._categories
+
+    @property
+    def craft_smelt_item_ids(self) -> np.ndarray:
+        """Item ids of ``mc.ALL_CRAFT_SMELT_ITEMS``."""
+        return self._craft_smelt_item_ids
+
+    def id_of(self, name: str) -> int:
+        idx = self._any_name_to_id.get(name, None)
+        if idx is None:
+            raise ValueError(f"Unknown item {name}")
+        return idx
+
+    def ids_of(self, names: Union[np.ndarray, List[str]]) -> np.ndarray:
+        """Maps an array of names to an ``int64`` array of ids of the same shape. Ids are returned as is."""
+        names = np.asarray(names)
+        if np.issubdtype(names.dtype, np.integer):
+            return names
+        # inventories mostly repeat a few names, so only look up the distinct ones
+        uniques, inverse = np.unique(names, return_inverse=True)
+        ids = np.array([self.id_of(name) for name in uniques], dtype=np.int64)
+        return ids[inverse.reshape(-1)].reshape(names.shape)
+
+    def name_of(self, idx: int) -> str:
+        return self._names[idx].item()
+
+    def underscore_name(self, name: str) -> str:
+        """Normalizes an item name to its canonical form with underscores, e.g., "crafting table" -> "crafting_table"."""
+        normalized = self._to_underscore.get(name, None)
+        if normalized is None:
+            raise ValueError(f"Unknown item {name}")
+        return normalized
+
+    def space_name(self, name: str) -> str:
+        """Normalizes an item name to its form with spaces as in observations, e.g., "crafting_table" -> "crafting table"."""
+        normalized = self._to_space.get(name, None)
+        if normalized is None:
+            raise ValueError(f"Unknown item {name}")
+        return normalized
+
+    def mc_item_id(self, name: str) -> int:
+        """The index of an item in ``mc.MC_ITEM_IDS``, with or without the "minecraft:" prefix."""
+        if not name.startswith("minecraft:"):
+            name = "minecraft:" + name
+        idx = self._mc_item_ids.get(name, None)
+        if idx is None:
+            raise ValueError(f"Unknown item {name}")
+        return idx
+
+    def variants_of(self, name: str) -> List[str]:
+        """Names of the variants of an item, indexed by their metadata values, empty if it has none."""
+        return self._variants.get(self.underscore_name(name), [])
+
+    def variant_id_of(self, name: str, variant: Union[str, int]) -> int:
+        """The index of an item variant, given by its name or metadata value, in ``mc.ALL_ITEM_VARIANTS``."""
+        name = self.underscore_name(name)
+        if isinstance(variant, int):
+            variants = self._variants.get(name, [])
+            if not 0 <= variant < len(variants):
+                raise ValueError(f"Unknown variant {variant} of item {name}")
+            variant = variants[variant]
+        key = f"{name}_{variant}"
+        idx = self._variant_ids.get(key, None)
+        if idx is None:
+            raise ValueError(f"Unknown item variant {key}")
+        return idx
+
+    def craft_smelt_id_of(self, name: str) -> int:
+        """The index of an item in ``mc.ALL_CRAFT_SMELT_ITEMS``, i.e., the argument of NN craft actions."""
+        idx = self._craft_smelt_ids.get(self.underscore_name(name), None)
+        if idx is None:
+            raise ValueError(f"{name} cannot be crafted or smelted")
+        return idx
+
+    def category_mask(self, category: str) -> np.ndarray:
+        """Read-only boolean array indexed by ids, ``True`` for items in ``category``."""
+        assert category in self._category_masks, f"Unknown category {category}"
+        return self._category_masks[category]
+
+    def in_category(self, ids: np.ndarray, category: str) -> np.ndarray:
+        return self.category_mask(category)[ids]
+
+
+ITEM_REGISTRY = ItemRegistry()
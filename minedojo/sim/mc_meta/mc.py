@@ -3,6 +3,9 @@
 
 import os
 import json
+import pickle
+
+from ..disk_cache import default_cache_dir, content_digest, load_pickle, save_pickle
 
 MC_ITEM_IDS = [
     "minecraft:acacia_boat",
@@ -499,10 +502,10 @@ def get_item_id(item: str) -> int:
     :param item: The item string
     :return: The internal ID of the item.
     """
-    if not item.startswith("minecraft:"):
-        item = "minecraft:" + item
+    # imported here since the registry is built from this module
+    from .item_registry import ITEM_REGISTRY
 
-    return MC_ITEM_IDS.index(item)
+    return ITEM_REGISTRY.mc_item_id(item)
 
 
 def get_key_from_id(id: str) -> str:
@@ -518,75 +521,119 @@ def get_key_from_id(id: str) -> str:
 mc_constants_file = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "mc_constants.json"
 )
-all_data = json.load(open(mc_constants_file))
+# tables derived from `mc_constants_file`, prebuilt by `scripts/build_mc_tables.py` and shipped with the package
+mc_tables_file = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "mc_tables.pkl"
+)
+# bump whenever `_build_tables` changes to invalidate prebuilt and cached tables
+MC_TABLES_VERSION = 1
 
-ALL_ITEMS = sorted([item["type"] for item in all_data["items"]])
-ALL_ITEM_VARIANTS = sorted(
+
+# entities reported by lidar, i.e., lower-cased simple class names of Minecraft entities without the "Entity" prefix
+ALL_ENTITIES = sorted(
     [
-        f"{item['type']}_{variant}"
-        for item in all_data["items"]
-        if "variant" in item
-        for variant in item["variant"]
+        "areaeffectcloud",
+        "armorstand",
+        "arrow",
+        "bat",
+        "blaze",
+        "boat",
+        "cavespider",
+        "chicken",
+        "cow",
+        "creeper",
+        "donkey",
+        "dragon",
+        "dragonfireball",
+        "egg",
+        "endercrystal",
+        "enderman",
+        "endermite",
+        "enderpearl",
+        "evoker",
+        "evokerfangs",
+        "expbottle",
+        "eyeofendersignal",
+        "fallingblock",
+        "fireworkrocket",
+        "fishhook",
+        "ghast",
+        "giantzombie",
+        "guardian",
+        "horse",
+        "husk",
+        "irongolem",
+        "item",
+        "itemframe",
+        "largefireball",
+        "leashknot",
+        "lightningbolt",
+        "llama",
+        "llamaspit",
+        "magmacube",
+        "minecartchest",
+        "minecartcommandblock",
+        "minecartempty",
+        "minecartfurnace",
+        "minecarthopper",
+        "minecartmobspawner",
+        "minecarttnt",
+        "mooshroom",
+        "mule",
+        "ocelot",
+        "otherplayermp",
+        "painting",
+        "pig",
+        "pigzombie",
+        "playermp",
+        "playersp",
+        "polarbear",
+        "potion",
+        "rabbit",
+        "sheep",
+        "shulker",
+        "shulkerbullet",
+        "silverfish",
+        "skeleton",
+        "skeletonhorse",
+        "slime",
+        "smallfireball",
+        "snowball",
+        "snowman",
+        "spectralarrow",
+        "spider",
+        "squid",
+        "stray",
+        "tippedarrow",
+        "tntprimed",
+        "vex",
+        "villager",
+        "vindicator",
+        "witch",
+        "wither",
+        "witherskeleton",
+        "witherskull",
+        "wolf",
+        "xporb",
+        "zombie",
+        "zombiehorse",
+        "zombievillager",
     ]
 )
 
-ALL_STATS = sorted([stat["statID"] for stat in all_data["stats"]])
-ALL_STAT_KEYS = sorted([stat["minerl_keys"] for stat in all_data["stats"]])
 
 # We choose these not to be included by default; they are not items.
 NONE = "none"
 INVALID = "invalid"
 
-# TODO remove hack based on ordering in MineRL
-MINERL_ITEM_MAP = sorted(["none"] + ALL_ITEMS)
-
-ITEMS_BY_CATEGORY = {
-    # Items which take 2 seconds to USE
-    "edible": [
-        item["type"]
-        for item in all_data["items"]
-        if item["useAction"] in {"EAT", "DRINK"}
-    ],
-    # Items which have ongoing effect when equipped (includes armor)
-    "tool": [
-        item["type"] for item in all_data["items"] if item["tab"] in {"tools", "combat"}
-    ],
-    # Items which are used for building
-    "building_block": [
-        item["type"] for item in all_data["items"] if item["tab"] in {"buildingBlock"}
-    ],
-    # Redstone items (doors, buttons, levers)
-    "redstone": [
-        item["type"] for item in all_data["items"] if item["tab"] in {"redstone"}
-    ],
-    # Brewing items
-    "brewing": [
-        item["type"] for item in all_data["items"] if item["tab"] in {"brewing"}
-    ],
-    # Decoration items (includes torch)
-    "decoration": [
-        item["type"] for item in all_data["items"] if item["tab"] in {"decoration"}
-    ],
-}
-
-
-PLACEABLE_ITEM_NAMES = sorted(
-    [
-        item["type"].replace("_", " ")
-        for item in all_data["items"]
-        if item["block"] is True
-    ]
-)
-
-
-# Check that all edible items have the same maxUseDuration
-use_times = {
-    item["maxUseDuration"]
-    for item in all_data["items"]
-    if item["useAction"] in {"EAT", "DRINK"}
-}
-assert len(use_times) == 1, "Edible items with multiple different eating times."
-EDIBLE_USE_TICKS = use_times.pop()
+EQUIPMENT_SLOTS = [
+    "mainhand",
+    "offhand",
+    "feet",
+    "legs",
+    "chest",
+    "head",
+]
 
 
 def recursive_dict_eq(d1, d2):
@@ -612,14 +659,18 @@ def dedup_list(dicts):
     Takes a list of dictionary objects and removes any duplicates (compared recursively by value).
     """
     result = []
+    seen = set()
     for next_dict in dicts:
-        if not duplicate_dict_in_list(next_dict, result):
+        # canonical serialization, so that duplicates are found by hashing instead of pairwise comparisons
+        key = json.dumps(next_dict, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
             result.append(next_dict)
     return result
 
 
-def sort_recipes_by_output(json):
-    result = {item: [] for item in ALL_ITEMS}
+def sort_recipes_by_output(json, items=None):
+    result = {item: [] for item in (ALL_ITEMS if items is None else items)}
     for recipe in json:
         if len(recipe["ingredients"]) == 0:
             # Empty recipe
@@ -633,106 +684,228 @@ def sort_recipes_by_output(json):
     return result
 
 
-CRAFTING_RECIPES_BY_OUTPUT = sort_recipes_by_output(all_data["craftingRecipes"])
-SMELTING_RECIPES_BY_OUTPUT = sort_recipes_by_output(all_data["smeltingRecipes"])
-
-ALL_PERSONAL_CRAFTING_ITEMS = sorted(
-    [
-        item["type"]
-        for item in all_data["items"]
-        if item["type"] in CRAFTING_RECIPES_BY_OUTPUT.keys()
-        and len(CRAFTING_RECIPES_BY_OUTPUT[item["type"]]) > 0
-        and all(
-            [
-                recipe["recipeSize"] in [0, 1, 2, 4]  # TODO recipeSize needs to be 2D
-                for recipe in CRAFTING_RECIPES_BY_OUTPUT[item["type"]]
-            ]
-        )
-    ]
-)
-
-ALL_CRAFTING_TABLE_ITEMS = sorted(
-    [
-        item["type"]
-        for item in all_data["items"]
-        if item["type"] in CRAFTING_RECIPES_BY_OUTPUT.keys()
-        and len(CRAFTING_RECIPES_BY_OUTPUT[item["type"]]) > 0
-        and any(
+def _build_tables(all_data: dict) -> dict:
+    """Derives the item, stat and recipe tables from the parsed ``mc_constants_file``."""
+    items = all_data["items"]
+    all_items = sorted([item["type"] for item in items])
+    tables = {
+        "ALL_ITEMS": all_items,
+        "ALL_ITEM_VARIANTS": sorted(
             [
-                recipe["recipeSize"] <= 9
-                for recipe in CRAFTING_RECIPES_BY_OUTPUT[item["type"]]
+                f"{item['type']}_{variant}"
+                for item in items
+                if "variant" in item
+                for variant in item["variant"]
             ]
-        )
+        ),
+        # variants of items by their types, indexed by metadata values
+        "VARIANTS_BY_ITEM": {
+            item["type"]: list(item["variant"]) for item in items if "variant" in item
+        },
+        "ALL_BLOCKS": sorted([block["name"] for block in all_data["blocks"]]),
+        "ALL_STATS": sorted([stat["statID"] for stat in all_data["stats"]]),
+        "ALL_STAT_KEYS": sorted([stat["minerl_keys"] for stat in all_data["stats"]]),
+        # TODO remove hack based on ordering in MineRL
+        "MINERL_ITEM_MAP": sorted(["none"] + all_items),
+        "ITEMS_BY_CATEGORY": {
+            # Items which take 2 seconds to USE
+            "edible": [
+                item["type"] for item in items if item["useAction"] in {"EAT", "DRINK"}
+            ],
+            # Items which have ongoing effect when equipped (includes armor)
+            "tool": [
+                item["type"] for item in items if item["tab"] in {"tools", "combat"}
+            ],
+            # Items which are used for building
+            "building_block": [
+                item["type"] for item in items if item["tab"] in {"buildingBlock"}
+            ],
+            # Redstone items (doors, buttons, levers)
+            "redstone": [item["type"] for item in items if item["tab"] in {"redstone"}],
+            # Brewing items
+            "brewing": [item["type"] for item in items if item["tab"] in {"brewing"}],
+            # Decoration items (includes torch)
+            "decoration": [
+                item["type"] for item in items if item["tab"] in {"decoration"}
+            ],
+        },
+        "PLACEABLE_ITEM_NAMES": sorted(
+            [item["type"].replace("_", " ") for item in items if item["block"] is True]
+        ),
+    }
+
+    # Check that all edible items have the same maxUseDuration
+    use_times = {
+        item["maxUseDuration"]
+        for item in items
+        if item["useAction"] in {"EAT", "DRINK"}
+    }
+    assert len(use_times) == 1, "Edible items with multiple different eating times."
+    tables["EDIBLE_USE_TICKS"] = use_times.pop()
+
+    crafting_recipes = sort_recipes_by_output(all_data["craftingRecipes"], all_items)
+    smelting_recipes = sort_recipes_by_output(all_data["smeltingRecipes"], all_items)
+    tables["CRAFTING_RECIPES_BY_OUTPUT"] = crafting_recipes
+    tables["SMELTING_RECIPES_BY_OUTPUT"] = smelting_recipes
+
+    personal_crafting_items = sorted(
+        [
+            item["type"]
+            for item in items
+            if item["type"] in crafting_recipes.keys()
+            and len(crafting_recipes[item["type"]]) > 0
+            and all(
+                [
+                    recipe["recipeSize"]
+                    in [0, 1, 2, 4]  # TODO recipeSize needs to be 2D
+                    for recipe in crafting_recipes[item["type"]]
+                ]
+            )
+        ]
+    )
+    crafting_table_items = sorted(
+        [
+            item["type"]
+            for item in items
+            if item["type"] in crafting_recipes.keys()
+            and len(crafting_recipes[item["type"]]) > 0
+            and any(
+                [recipe["recipeSize"] <= 9 for recipe in crafting_recipes[item["type"]]]
+            )
+        ]
+    )
+    crafting_table_only_items = sorted(
+        [x for x in crafting_table_items if x not in personal_crafting_items]
+    )
+    smelting_items = sorted(
+        [
+            item["type"]
+            for item in items
+            if item["type"] in smelting_recipes.keys()
+            and len(smelting_recipes[item["type"]]) > 0
+        ]
+    )
+    tables["ALL_PERSONAL_CRAFTING_ITEMS"] = personal_crafting_items
+    tables["ALL_CRAFTING_TABLE_ITEMS"] = crafting_table_items
+    tables["ALL_CRAFTING_TABLE_ONLY_ITEMS"] = crafting_table_only_items
+    tables["ALL_SMELTING_ITEMS"] = smelting_items
+
+    # all self-craftable/table craftable/smeltable items, including "none"
+    hand_craft_items = [
+        x
+        for x in personal_crafting_items
+        if x
+        not in [
+            "coal",
+            "diamond",
+            "emerald",
+            "gold_ingot",
+            "iron_ingot",
+            "redstone",
+            "stone",
+        ]
     ]
-)
-
-ALL_CRAFTING_TABLE_ONLY_ITEMS = sorted(
-    [x for x in ALL_CRAFTING_TABLE_ITEMS if x not in ALL_PERSONAL_CRAFTING_ITEMS]
-)
-
-ALL_SMELTING_ITEMS = sorted(
-    [
-        item["type"]
-        for item in all_data["items"]
-        if item["type"] in SMELTING_RECIPES_BY_OUTPUT.keys()
-        and len(SMELTING_RECIPES_BY_OUTPUT[item["type"]]) > 0
+    table_craft_only_items = [
+        x for x in crafting_table_only_items if x not in ["iron_ingot", "gold_ingot"]
     ]
-)
-
-# all self-craftable/table craftable/smeltable items, including "none"
-ALL_HAND_CRAFT_ITEMS_NN_ACTIONS = [
-    x
-    for x in ALL_PERSONAL_CRAFTING_ITEMS
-    if x
-    not in [
-        "coal",
-        "diamond",
-        "emerald",
-        "gold_ingot",
-        "iron_ingot",
-        "redstone",
-        "stone",
+    smelt_items = [
+        x for x in smelting_items if x not in ["iron_nugget", "dye", "gold_nugget"]
     ]
-]
-ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS = [
-    x for x in ALL_CRAFTING_TABLE_ONLY_ITEMS if x not in ["iron_ingot", "gold_ingot"]
-]
-ALL_SMELT_ITEMS_NN_ACTIONS = [
-    x for x in ALL_SMELTING_ITEMS if x not in ["iron_nugget", "dye", "gold_nugget"]
-]
-ALL_CRAFT_SMELT_ITEMS = (
-    ALL_HAND_CRAFT_ITEMS_NN_ACTIONS
-    + ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS
-    + ALL_SMELT_ITEMS_NN_ACTIONS
-)
-
-assert len(set(ALL_CRAFT_SMELT_ITEMS)) == len(ALL_HAND_CRAFT_ITEMS_NN_ACTIONS) + len(
-    ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS
-) + len(ALL_SMELT_ITEMS_NN_ACTIONS)
-
-EQUIPMENT_SLOTS = [
-    "mainhand",
-    "offhand",
-    "feet",
-    "legs",
-    "chest",
-    "head",
-]
-
-BEST_ITEMS_PER_EQUIPMENT_SLOT = {
-    equip: [
-        item["type"] for item in all_data["items"] if item["bestEquipmentSlot"] == equip
-    ]
-    for equip in EQUIPMENT_SLOTS
-}
-
-NON_MAINHAND_ITEM_NAMES = []
-for k, v in BEST_ITEMS_PER_EQUIPMENT_SLOT.items():
-    if k != "mainhand":
-        NON_MAINHAND_ITEM_NAMES.extend([item.replace("_", " ") for item in v])
+    all_craft_smelt_items = hand_craft_items + table_craft_only_items + smelt_items
+    assert len(set(all_craft_smelt_items)) == len(hand_craft_items) + len(
+        table_craft_only_items
+    ) + len(smelt_items)
+    tables["ALL_HAND_CRAFT_ITEMS_NN_ACTIONS"] = hand_craft_items
+    tables["ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS"] = table_craft_only_items
+    tables["ALL_SMELT_ITEMS_NN_ACTIONS"] = smelt_items
+    tables["ALL_CRAFT_SMELT_ITEMS"] = all_craft_smelt_items
+
+    best_items_per_equipment_slot = {
+        equip: [item["type"] for item in items if item["bestEquipmentSlot"] == equip]
+        for equip in EQUIPMENT_SLOTS
+    }
+    non_mainhand_item_names = []
+    for k, v in best_items_per_equipment_slot.items():
+        if k != "mainhand":
+            non_mainhand_item_names.extend([item.replace("_", " ") for item in v])
+    tables["BEST_ITEMS_PER_EQUIPMENT_SLOT"] = best_items_per_equipment_slot
+    tables["NON_MAINHAND_ITEM_NAMES"] = non_mainhand_item_names
+    return tables
+
+
+def _read_constants():
+    """Returns the contents of ``mc_constants_file`` and their digest salted with ``MC_TABLES_VERSION``."""
+    with open(mc_constants_file, "rb") as f:
+        content = f.read()
+    return content, content_digest(content, salt=str(MC_TABLES_VERSION))
+
+
+def load_tables(use_cache: bool = True) -> dict:
+    """
+    Loads the tables derived from ``mc_constants_file``.
+    Tables are taken from the prebuilt ``mc_tables_file`` or the user cache if they were derived from
+    the current ``mc_constants_file`` by the current ``MC_TABLES_VERSION``,
+    otherwise they are rebuilt and cached in the user cache.
+    """
+    content, digest = _read_constants()
+    cache_file = os.path.join(default_cache_dir(), f"mc_tables-{digest[:32]}.pkl")
+    if use_cache:
+        for path in [mc_tables_file, cache_file]:
+            cached = load_pickle(path)
+            if cached is not None and cached["digest"] == digest:
+                return cached["tables"]
+    tables = _build_tables(json.loads(content))
+    if use_cache:
+        save_pickle(cache_file, {"digest": digest, "tables": tables})
+    return tables
+
+
+def prebuild_tables(path: str = mc_tables_file):
+    """Writes the tables derived from ``mc_constants_file`` to ``path``, by default the prebuilt ``mc_tables_file``."""
+    content, digest = _read_constants()
+    tables = _build_tables(json.loads(content))
+    with open(path, "wb") as f:
+        # protocol 4 so that any supported Python version can read the shipped file
+        pickle.dump({"digest": digest, "tables": tables}, f, protocol=4)
+
+
+def __getattr__(name):
+    # the raw constants are only parsed when accessed, derived tables are loaded below
+    if name == "all_data":
+        global all_data
+        with open(mc_constants_file) as f:
+            all_data = json.load(f)
+        return all_data
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_tables = load_tables()
+ALL_ITEMS = _tables["ALL_ITEMS"]
+ALL_ITEM_VARIANTS = _tables["ALL_ITEM_VARIANTS"]
+VARIANTS_BY_ITEM = _tables["VARIANTS_BY_ITEM"]
+ALL_BLOCKS = _tables["ALL_BLOCKS"]
+ALL_STATS = _tables["ALL_STATS"]
+ALL_STAT_KEYS = _tables["ALL_STAT_KEYS"]
+MINERL_ITEM_MAP = _tables["MINERL_ITEM_MAP"]
+ITEMS_BY_CATEGORY = _tables["ITEMS_BY_CATEGORY"]
+PLACEABLE_ITEM_NAMES = _tables["PLACEABLE_ITEM_NAMES"]
+EDIBLE_USE_TICKS = _tables["EDIBLE_USE_TICKS"]
+CRAFTING_RECIPES_BY_OUTPUT = _tables["CRAFTING_RECIPES_BY_OUTPUT"]
+SMELTING_RECIPES_BY_OUTPUT = _tables["SMELTING_RECIPES_BY_OUTPUT"]
+ALL_PERSONAL_CRAFTING_ITEMS = _tables["ALL_PERSONAL_CRAFTING_ITEMS"]
+ALL_CRAFTING_TABLE_ITEMS = _tables["ALL_CRAFTING_TABLE_ITEMS"]
+ALL_CRAFTING_TABLE_ONLY_ITEMS = _tables["ALL_CRAFTING_TABLE_ONLY_ITEMS"]
+ALL_SMELTING_ITEMS = _tables["ALL_SMELTING_ITEMS"]
+ALL_HAND_CRAFT_ITEMS_NN_ACTIONS = _tables["ALL_HAND_CRAFT_ITEMS_NN_ACTIONS"]
+ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS = _tables["ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS"]
+ALL_SMELT_ITEMS_NN_ACTIONS = _tables["ALL_SMELT_ITEMS_NN_ACTIONS"]
+ALL_CRAFT_SMELT_ITEMS = _tables["ALL_CRAFT_SMELT_ITEMS"]
+BEST_ITEMS_PER_EQUIPMENT_SLOT = _tables["BEST_ITEMS_PER_EQUIPMENT_SLOT"]
+NON_MAINHAND_ITEM_NAMES = _tables["NON_MAINHAND_ITEM_NAMES"]
 
 N_INV_SLOTS = 36  # including main-hand
 
+# game time per tick; independent of the wall-clock ``ms_per_tick`` setting of the simulator
 MS_PER_STEP = 50
 STEPS_PER_MS = 1 / 50
 
@@ -0,0 +1,97 @@
+"""
+Fixed vocabularies mapping names in observations to integer ids.
+"""
+
+import os
+import json
+import logging
+from typing import List, Optional, Union
+
+import numpy as np
+
+from . import mc
+from .item_registry import ITEM_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+
+class Vocab:
+    """Maps names to ``int16`` ids by their positions in a fixed list of names.
+
+    Args:
+        names: The names in the vocabulary, ids are their indices.
+        unknown: If not ``None``, a name prepended to the vocabulary (i.e., with id 0)
+                that names outside the vocabulary are mapped to. If ``None``, encoding unknown names raises an error.
+    """
+
+    def __init__(self, names: List[str], unknown: Optional[str] = None):
+        if unknown is not None:
+            assert unknown not in names, f"{unknown} is already in the vocabulary"
+            names = [unknown] + list(names)
+        assert len(names) == len(set(names)), "names in a vocabulary must be unique"
+        assert len(names) <= np.iinfo(np.int16).max + 1, "vocabulary is too large"
+        self._names = np.array(names)
+        self._name_to_id = {name: i for i, name in enumerate(names)}
+        self._unknown = unknown
+        self._warned = set()
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name: str):
+        return name in self._name_to_id
+
+    def __repr__(self):
+        return f"Vocab(size={len(self)})"
+
+    @property
+    def names(self) -> np.ndarray:
+        return self._names
+
+    @property
+    def unknown_id(self) -> Optional[int]:
+        return None if self._unknown is None else 0
+
+    def id_of(self, name: str) -> int:
+        idx = self._name_to_id.get(name, None)
+        if idx is None:
+            if self._unknown is None:
+                raise ValueError(f"Unknown name {name}")
+            if name not in self._warned:
+                self._warned.add(name)
+                logger.warning(
+                    f"{name} is not in the vocabulary, map it to {self._unknown}"
+                )
+            idx = 0
+        return idx
+
+    def encode(self, names: Union[np.ndarray, List[str]]) -> np.ndarray:
+        """Maps an array of names to an ``int16`` array of ids of the same shape.
+        Only the unique names are looked up, which is cheap since observations mostly repeat a few names.
+        """
+        names = np.asarray(names)
+        uniques, inverse = np.unique(names, return_inverse=True)
+        ids = np.array([self.id_of(name) for name in uniques], dtype=np.int16)
+        return ids[inverse].reshape(names.shape)
+
+    def decode(self, ids: Union[np.ndarray, List[int]]) -> np.ndarray:
+        """Maps an array of ids back to an array of names."""
+        return self._names[np.asarray(ids)]
+
+
+# items in inventory and equipment, named with spaces as in observations, e.g., "crafting table".
+# Ids are the ids in ``ITEM_REGISTRY``, i.e., indices in ``mc.ALL_ITEMS``
+ITEM_VOCAB = Vocab(ITEM_REGISTRY.display_names.tolist())
+
+
+def _read_block_names() -> List[str]:
+    with open(os.path.join(os.path.dirname(__file__), "block_names.json"), "r") as f:
+        return json.load(f)
+
+
+# blocks in voxels and lidar are named by Malmo with their lower-cased English names, e.g., "grass block",
+# which differ from the registry names in ``mc.ALL_BLOCKS``. See ``scripts/build_block_names.py``
+BLOCK_VOCAB = Vocab(_read_block_names(), unknown="unknown")
+
+# entities in lidar, "null" if a ray hits no entity
+ENTITY_VOCAB = Vocab(["null"] + mc.ALL_ENTITIES, unknown="unknown")
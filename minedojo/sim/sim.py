@@ -1,13 +1,16 @@
+import time
 import uuid
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from copy import deepcopy
 from typing import Union, Optional, List, Dict, Tuple, Literal, Any
 
-import cv2
 import gym
 import numpy as np
-from lxml import etree
 
 from .mc_meta import mc
+from .mc_meta.vocab import Vocab, ITEM_VOCAB, BLOCK_VOCAB, ENTITY_VOCAB
 from . import handlers
 from .bridge import BridgeEnv
 from .cmd_executor import CMDExecutor
@@ -15,6 +18,9 @@ from .config_sim_spec import SimSpec
 from .inventory import InventoryItem, parse_inventory_item
 
 
+logger = logging.getLogger(__name__)
+
+
 class MineDojoSim(gym.Env):
     """An environment wrapper for MineDojo simulation.
 
@@ -25,9 +31,19 @@ class MineDojoSim(gym.Env):
         allow_time_passage: Time flows if ``True``.
                 Default: ``True``.
 
+        async_decode: If ``True``, observations can be decoded on a background thread via ``step_async``,
+                overlapping decoding with the socket I/O of the next step.
+                Default: ``False``.
+
         break_speed_multiplier: Controls the speed of breaking blocks. A value larger than 1.0 accelerates the breaking.
                 Default: ``1.0``.
 
+        compact_obs: If ``True``, observations use the narrowest dtypes their ranges allow
+                (e.g., ``uint8`` block metas and item quantities, ``int8`` harvest levels, ``int16`` durabilities,
+                ``float16`` lidar distances), with ``observation_space`` updated to match.
+                Full statistics are ``int32`` either way since they are unbounded counters.
+                Default: ``False``.
+
         drawing_str: Draws shapes (e.g. spheres, cuboids) in the minecraft world.
                 Default: ``None``.
 
@@ -40,10 +56,22 @@ class MineDojoSim(gym.Env):
                 One can use the `tool <https://minecraft.tools/en/flat.php?biome=1&bloc_1_nb=1&bloc_1_id=2&bloc_2_nb=2&bloc_2_id=3%2F00&bloc_3_nb=1&bloc_3_id=7&village_size=1&village_distance=32&mineshaft_chance=1&stronghold_count=3&stronghold_distance=32&stronghold_spread=3&oceanmonument_spacing=32&oceanmonument_separation=5&biome_1_distance=32&valid=Create+the+Preset#seed>`_ to generate.
                 Default: ``None``.
 
+        frame_skip: Number of game ticks each call of ``step`` advances.
+                Movement and attack keys are held for all ticks, while one-shot actions (chat, camera, craft, equip, place, etc.)
+                are applied only on the first tick. Only the observation of the final tick is decoded.
+                Default: ``1``.
+
         generate_world_type: A string that specifies the type of the minecraft world.
                 One of ``"default"``, ``"flat"``, ``"from_file"``, ``"specified_biome"``.
                 Default: ``"default"``.
 
+        image_preprocessing: If not ``None``, preprocesses ``rgb`` observations into reusable contiguous buffers.
+                If supplied, should be a dict with any of the keys ``output_size`` (area resize to ``(H, W)``),
+                ``crop`` (``(top, left, height, width)`` of the rendered frame), ``grayscale`` and ``channels_last``.
+                The full-resolution frame of the same step is then available from ``full_frame``.
+                Note that the returned ``rgb`` array is overwritten by the next step.
+                Default: ``None``.
+
         image_size: The size of image observations.
 
         initial_inventory: If not ``None``, specifies initial items in the agent's inventory.
@@ -57,8 +85,25 @@ class MineDojoSim(gym.Env):
         lidar_rays: Defines the directions and maximum distances of the lidar rays if ``use_lidar`` is ``True``.
                 If supplied, should be a list of tuple(pitch, yaw, distance).
                 Pitch and yaw are in radians and relative to agent looking vector.
+                Use ``handlers.make_lidar_ray_grid`` to generate a pitch x yaw grid of rays,
+                and ``handlers.lidar_depth_image`` to turn their observations into a depth image.
                 Default: ``None``.
 
+        max_pending_decodes: Maximum number of observations waiting to be decoded if ``async_decode`` is ``True``.
+                ``step_async`` blocks on the oldest pending decode once the limit is reached.
+                Default: ``2``.
+
+        ms_per_tick: Length of a game tick in milliseconds. Minecraft runs at 50 ms per tick (20 ticks per second)
+                in real time; smaller values let the server tick faster when the machine has spare cores.
+                Game time is still counted in ticks, so ``mc.MS_PER_STEP`` and time-based rewards are unaffected.
+                Use ``ticks_per_second`` to measure the rate actually achieved.
+                Default: ``50``.
+
+        numeric_obs: If ``True``, all text observations (names in ``inventory``, ``equipment``, ``voxels`` and lidar ``rays``)
+                are replaced by ``int16`` ids, so that observations are fixed-size numeric arrays.
+                Ids index into the vocabularies in ``vocab``.
+                Default: ``False``.
+
         raise_error_on_invalid_cmds: If ``True``, the cmd executor will raise error when a command is invalid.
                 If ``False``, the executor will just skip instead.
                 Default: ``False``.
@@ -100,6 +145,10 @@ class MineDojoSim(gym.Env):
         use_lidar: If ``True``, includes lidar in observations.
                 Default: ``False``.
 
+        use_rgb: If ``False``, the mission does not render video and ``rgb`` is removed from the observation space.
+                Useful for agents that only rely on voxels, lidar, inventory, location, etc.
+                Default: ``True``.
+
         use_voxel: If ``True``, includes voxel in observations.
                 Default: ``False``.
 
@@ -117,6 +166,20 @@ class MineDojoSim(gym.Env):
                 Default: ``None``.
     """
 
+    # actions that are only applied on the first tick when an action is repeated
+    ONE_SHOT_ACTIONS = (
+        "chat",
+        "camera",
+        "craft",
+        "craft_with_table",
+        "smelt",
+        "equip",
+        "place",
+        "swap_slot",
+        "pickItem",
+        "drop",
+    )
+
     def __init__(
         self,
         *,
@@ -144,20 +207,38 @@ class MineDojoSim(gym.Env):
         specified_biome: Optional[Union[int, str]] = None,
         # ------ observation ------
         image_size: Union[int, Tuple[int, int]],
+        image_preprocessing: Optional[Dict[str, Any]] = None,
+        use_rgb: bool = True,
         use_voxel: bool = False,
         voxel_size: Optional[Dict[str, int]] = None,
         use_lidar: bool = False,
         lidar_rays: Optional[List[Tuple[float, float, float]]] = None,
         use_depth: bool = False,
+        numeric_obs: bool = False,
+        compact_obs: bool = False,
         # ------ control ------
         event_level_control: bool = True,
+        frame_skip: int = 1,
+        ms_per_tick: int = 50,
         # ------ randomness ------
         seed: Optional[int] = None,
         # ------ misc ------
         sim_name: str = "MineDojoSim",
         raise_error_on_invalid_cmds: bool = False,
+        async_decode: bool = False,
+        max_pending_decodes: int = 2,
     ):
+        assert (
+            frame_skip >= 1
+        ), f"frame_skip must be a positive integer, got {frame_skip}"
+        assert (
+            ms_per_tick >= 1
+        ), f"ms_per_tick must be a positive integer, got {ms_per_tick}"
+        assert (
+            max_pending_decodes >= 1
+        ), f"max_pending_decodes must be a positive integer, got {max_pending_decodes}"
         self._sim_name = sim_name
+        self._frame_skip = frame_skip
         self._rng = np.random.default_rng(seed)
         if isinstance(image_size, int):
             image_size = (image_size, image_size)
@@ -206,24 +287,62 @@ class MineDojoSim(gym.Env):
 
         # configure obs handlers
         obs_handlers = [
-            handlers.POVObservation(image_size, False),
-            handlers.TrueFlatInventoryObservation(),
-            handlers.EquipmentObservation(),
+            handlers.TrueFlatInventoryObservation(
+                name_ids=numeric_obs, compact_dtypes=compact_obs
+            ),
+            handlers.EquipmentObservation(
+                name_ids=numeric_obs, compact_dtypes=compact_obs
+            ),
             handlers.ObservationFromLifeStats(),
             handlers.ObservationFromCurrentLocation(),
             handlers.ObserveFromFullStats(),
             handlers.NearbyToolsObservation(),
             handlers.ObservationFromDamageSource(),
         ]
+        self._use_rgb = use_rgb
+        if use_rgb:
+            image_preprocessing = image_preprocessing or {}
+            unknown_keys = set(image_preprocessing) - {
+                "output_size",
+                "crop",
+                "grayscale",
+                "channels_last",
+            }
+            assert (
+                not unknown_keys
+            ), f"Unknown image preprocessing options {unknown_keys}"
+            output_size = image_preprocessing.get("output_size", None)
+            if isinstance(output_size, int):
+                output_size = (output_size, output_size)
+            obs_handlers.insert(
+                0,
+                handlers.POVObservation(
+                    image_size,
+                    False,
+                    output_resolution=output_size,
+                    crop=image_preprocessing.get("crop", None),
+                    grayscale=image_preprocessing.get("grayscale", False),
+                    channels_last=image_preprocessing.get("channels_last", False),
+                ),
+            )
         if use_voxel:
             voxel_size = (
                 (voxel_size["xmin"], voxel_size["xmax"]),
                 (voxel_size["ymin"], voxel_size["ymax"]),
                 (voxel_size["zmin"], voxel_size["zmax"]),
             )
-            obs_handlers.append(handlers.VoxelObservation(voxel_size))
+            obs_handlers.append(
+                handlers.VoxelObservation(
+                    voxel_size, block_ids=numeric_obs, compact_dtypes=compact_obs
+                )
+            )
         if use_lidar:
-            obs_handlers.append(handlers.RichLidarObservation(lidar_rays))
+            obs_handlers.append(
+                handlers.RichLidarObservation(
+                    lidar_rays, name_ids=numeric_obs, compact_dtypes=compact_obs
+                )
+            )
+        self._numeric_obs = numeric_obs
         # configure action handlers
         common_actions = [
             "forward",
@@ -376,15 +495,30 @@ class MineDojoSim(gym.Env):
             world_generator_handlers=world_generator_handlers,
             server_decorator_handlers=server_decorator_handlers,
             server_quit_handlers=server_quit_handlers,
+            ms_per_tick=ms_per_tick,
             seed=self.new_seed,
         )
 
-        self._bridge_env = BridgeEnv(is_fault_tolerant=True, seed=self.new_seed)
+        self._bridge_env = BridgeEnv(
+            is_fault_tolerant=True, seed=self.new_seed, want_pov=use_rgb
+        )
 
         self._prev_obs = None
         self._prev_action = None
         self._prev_info = None
 
+        self._n_ticks = 0
+        self._ticks_start_time = None
+
+        # a single worker keeps decodes in step order, so ``prev_obs`` always follows the latest step
+        self._decode_pool = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{sim_name}_decode")
+            if async_decode
+            else None
+        )
+        self._max_pending_decodes = max_pending_decodes
+        self._pending_decodes = deque()
+
         self._cmd_executor = CMDExecutor(self, raise_error_on_invalid_cmds)
 
     @property
@@ -413,19 +547,28 @@ class MineDojoSim(gym.Env):
         Return:
             Agent’s initial observation.
         """
+        from lxml import etree
+
+        self._wait_pending_decodes()
         episode_id = str(uuid.uuid4())
 
         xml = etree.fromstring(self._sim_spec.to_xml(episode_id))
         raw_obs = self._bridge_env.reset(episode_id, [xml])[0]
         obs, info = self._process_raw_obs(raw_obs)
-        self._prev_obs, self._prev_info = deepcopy(obs), deepcopy(info)
+        self._keep_prev(obs, info)
+        self._n_ticks = 0
+        self._ticks_start_time = time.perf_counter()
         return obs
 
-    def step(self, action: dict):
+    def step(self, action: dict, repeat: Optional[int] = None):
         """Run one timestep of the environment’s dynamics. Accepts an action and returns next_obs, reward, done, info.
 
         Args:
             action: The action of the agent in current step.
+            repeat: Number of game ticks to execute ``action`` for. If ``None``, uses ``frame_skip``.
+                One-shot actions are only applied on the first tick, see ``ONE_SHOT_ACTIONS``.
+                Only the observation of the final tick is decoded. Since inventory and statistics in ``info``
+                are cumulative, rewards computed from ``info`` still account for the skipped ticks.
 
         Return:
             A tuple (obs, reward, done, info)
@@ -434,17 +577,78 @@ class MineDojoSim(gym.Env):
             - ``bool`` - Whether the episode has ended.
             - ``dict`` - Contains auxiliary diagnostic information (helpful for debugging, and sometimes learning).
         """
-        self._prev_action = deepcopy(action)
-        action_xml = self._action_obj_to_xml(action)
-        step_tuple = self._bridge_env.step([action_xml])
-        step_success, raw_obs = step_tuple.step_success, step_tuple.raw_obs
+        self._wait_pending_decodes()
+        step_success, raw_obs = self._step_bridge(action, repeat)
         if not step_success:
             # when step failed, return prev obs
             return self._prev_obs, 0, True, self._prev_info
-        else:
-            obs, info = self._process_raw_obs(raw_obs[0])
-            self._prev_obs, self._prev_info = deepcopy(obs), deepcopy(info)
-            return obs, 0, self.is_terminated, info
+        obs, info = self._process_raw_obs(raw_obs[0])
+        self._keep_prev(obs, info)
+        return obs, 0, self.is_terminated, info
+
+    def step_async(self, action: dict, repeat: Optional[int] = None) -> Future:
+        """Like ``step``, but decodes the observation on a background thread. Requires ``async_decode=True``.
+
+        The action is sent and the raw messages are received on the calling thread,
+        then decoding is handed to the decode thread so that it overlaps with the caller's work,
+        e.g. stepping other simulators. Futures resolve in step order.
+        Note that with ``image_preprocessing`` the ``rgb`` buffer is reused,
+        so copy it if more than one step is in flight.
+        Also note that ``step_async`` skips all wrappers around the simulator, including those of tasks made by
+        ``minedojo.make``, so the reward is always ``0`` and no task rewards or success checks are computed.
+
+        Args:
+            action: The action of the agent in current step.
+            repeat: Number of game ticks to execute ``action`` for. If ``None``, uses ``frame_skip``.
+
+        Return:
+            A ``concurrent.futures.Future`` resolving to the tuple (obs, reward, done, info) returned by ``step``.
+        """
+        assert (
+            self._decode_pool is not None
+        ), "step_async requires the simulator to be created with `async_decode=True`"
+        while len(self._pending_decodes) >= self._max_pending_decodes:
+            self._pending_decodes.popleft().result()
+        step_success, raw_obs = self._step_bridge(action, repeat)
+        if not step_success:
+            self._wait_pending_decodes()
+            future = Future()
+            future.set_result((self._prev_obs, 0, True, self._prev_info))
+            return future
+        future = self._decode_pool.submit(
+            self._decode_step, raw_obs[0], self.is_terminated
+        )
+        self._pending_decodes.append(future)
+        return future
+
+    def _step_bridge(self, action: dict, repeat: Optional[int]):
+        repeat = self._frame_skip if repeat is None else repeat
+        assert repeat >= 1, f"repeat must be a positive integer, got {repeat}"
+        self._prev_action = deepcopy(action)
+        action_xml = self._action_obj_to_xml(action)
+        held_action_xml = None
+        for i in range(repeat):
+            if i == 1:
+                held_action_xml = self._action_obj_to_xml(
+                    self._strip_one_shot_actions(action)
+                )
+            step_tuple = self._bridge_env.step(
+                [action_xml if i == 0 else held_action_xml]
+            )
+            step_success, raw_obs = step_tuple.step_success, step_tuple.raw_obs
+            self._n_ticks += 1
+            if not step_success or self.is_terminated:
+                break
+        return step_success, raw_obs
+
+    def _decode_step(self, raw_obs: dict, done: bool):
+        obs, info = self._process_raw_obs(raw_obs)
+        self._keep_prev(obs, info)
+        return obs, 0, done, info
+
+    def _wait_pending_decodes(self):
+        while self._pending_decodes:
+            self._pending_decodes.popleft().result()
 
     def execute_cmd(self, cmd: str, action: Optional[dict] = None):
         """Execute a given string command.
@@ -616,6 +820,8 @@ class MineDojoSim(gym.Env):
 
     def close(self):
         """Environments will automatically close() themselves when garbage collected or when the program exits."""
+        if self._decode_pool is not None:
+            self._decode_pool.shutdown(wait=True)
         self._bridge_env.close()
 
     def render(self, mode: str = "human"):
@@ -624,8 +830,17 @@ class MineDojoSim(gym.Env):
         Args:
             mode: The mode to render with.
         """
-        img = self._prev_obs["rgb"]
-        img = img.transpose((1, 2, 0))
+        # imported here since only rendering needs a GUI
+        import cv2
+
+        if not self._use_rgb:
+            logger.warning(
+                f"Nothing to render since {self._sim_name} is created with `use_rgb=False`."
+            )
+            return
+        img = self.full_frame
+        if img is None:
+            img = self._prev_obs["rgb"].transpose((1, 2, 0))
         img = img[:, :, ::-1]
         cv2.imshow(f"{self._sim_name}", img)
         cv2.waitKey(1)
@@ -642,19 +857,70 @@ class MineDojoSim(gym.Env):
     def prev_action(self):
         return self._prev_action
 
+    @property
+    def full_frame(self) -> Optional[np.ndarray]:
+        """The full-resolution ``(H, W, C)`` frame decoded in the last step if ``image_preprocessing`` is used,
+        otherwise ``None``. The buffer is overwritten by the next step."""
+        for h in self._sim_spec.observables:
+            if isinstance(h, handlers.POVObservation):
+                return h.full_frame
+        return None
+
+    @property
+    def rgb_channels_last(self) -> bool:
+        """``True`` if ``rgb`` observations are ``(H, W, C)`` frames, ``False`` if they are ``(C, H, W)``."""
+        for h in self._sim_spec.observables:
+            if isinstance(h, handlers.POVObservation):
+                return h.channels_last
+        return False
+
+    @property
+    def vocab(self) -> Optional[Dict[str, Vocab]]:
+        """
+        Vocabularies of ids in observations if ``numeric_obs`` is ``True``, otherwise ``None``.
+        ``"item"`` for names in ``inventory`` and ``equipment`` (ids are indices in ``mc.ALL_ITEMS``),
+        ``"block"`` for block names in ``voxels`` and ``rays``, and ``"entity"`` for entity names in ``rays``.
+        Use ``Vocab.decode`` to map ids back to names.
+        """
+        if not self._numeric_obs:
+            return None
+        return {"item": ITEM_VOCAB, "block": BLOCK_VOCAB, "entity": ENTITY_VOCAB}
+
+    @property
+    def ticks_per_second(self) -> Optional[float]:
+        """The average number of game ticks per wall-clock second achieved since the last reset,
+        or ``None`` if no step has been taken yet. Includes the Python-side overhead of each step.
+        """
+        if self._ticks_start_time is None or self._n_ticks == 0:
+            return None
+        return self._n_ticks / (time.perf_counter() - self._ticks_start_time)
+
     @property
     def is_terminated(self):
         return self._bridge_env.is_terminated
 
+    def _keep_prev(self, obs: dict, info: dict):
+        """Keeps copies of ``obs`` and ``info`` to return from failed steps."""
+        # `rgb` is never modified in place, except for the preprocessing buffers which are only rewritten
+        # by the next decode, so a failed step still returns the frame of the last successful one
+        self._prev_obs = {k: v if k == "rgb" else deepcopy(v) for k, v in obs.items()}
+        self._prev_info = deepcopy(info)
+
     def _process_raw_obs(self, raw_obs: dict):
         info = deepcopy(raw_obs)
         if "pov" in info:
             info.pop("pov")
-        obs_dict = {
-            h.to_string(): h.from_hero(raw_obs) for h in self._sim_spec.observables
-        }
+        obs_dict = self._sim_spec.decode(raw_obs)
         return obs_dict, info
 
+    def _strip_one_shot_actions(self, action: dict):
+        """Returns a copy of ``action`` with one-shot actions replaced by no-ops, used for repeated ticks."""
+        held_action = self.action_space.no_op()
+        for k, v in action.items():
+            if k in held_action and k not in self.ONE_SHOT_ACTIONS:
+                held_action[k] = v
+        return held_action
+
     def _action_obj_to_xml(self, action):
         parsed_action = [f'chat {action["chat"]}'] if "chat" in action else []
         parsed_action.extend(
@@ -4,6 +4,8 @@ import abc
 import string
 import random
 from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable
 
 import gym.spaces
 import numpy as np
@@ -304,13 +306,29 @@ class Enum(Discrete, MineRLSpace):
         return len(self.values)
 
     def contains(self, x):
-        return x in self.values
+        # O(1) lookup instead of scanning the values
+        try:
+            return x in self.value_map
+        except TypeError:
+            # unhashable, e.g., an array
+            return False
 
     __contains__ = contains
 
 
 # TODO: Vectorize containment?
 class Dict(gym.spaces.Dict, MineRLSpace):
+    def contains(self, x):
+        # values can also be read-only mappings, e.g., ``FullStatsView``
+        if not isinstance(x, Mapping) or len(x) != len(self.spaces):
+            return False
+        for k, space in self.spaces.items():
+            if k not in x or not space.contains(x[k]):
+                return False
+        return True
+
+    __contains__ = contains
+
     def no_op(self, batch_shape=()):
         return OrderedDict(
             [
@@ -602,3 +620,78 @@ class DiscreteRange(Discrete):
 
     def __eq__(self, other):
         return self.n == other.n and self.begin == other.begin
+
+
+def compile_contains(space: gym.Space) -> Callable[[Any], bool]:
+    """
+    Compiles ``space.contains`` into a function with the bounds and lookups of the space precomputed.
+
+    ``Dict`` spaces are unrolled once into their sub-checks, ``Box`` and ``MultiDiscrete`` are checked with
+    vectorized comparisons against precomputed bounds (scalar bounds if all elements share them),
+    and ``Enum`` membership is a dict lookup. Other spaces fall back to their ``contains``.
+    """
+    if isinstance(space, Dict):
+        checks = [
+            (k, compile_contains(subspace)) for k, subspace in space.spaces.items()
+        ]
+        n_keys = len(checks)
+
+        def contains(x):
+            if not isinstance(x, Mapping) or len(x) != n_keys:
+                return False
+            for k, check in checks:
+                if k not in x or not check(x[k]):
+                    return False
+            return True
+
+    elif isinstance(space, Enum):
+        value_map = space.value_map
+
+        def contains(x):
+            try:
+                return x in value_map
+            except TypeError:
+                return False
+
+    elif isinstance(space, Discrete) and not isinstance(space, DiscreteRange):
+        n = space.n
+
+        def contains(x):
+            if isinstance(x, (int, np.integer)):
+                return 0 <= x < n
+            if isinstance(x, np.ndarray) and x.shape == () and x.dtype.kind in "iu":
+                return 0 <= int(x) < n
+            return False
+
+    elif isinstance(space, MultiDiscrete):
+        shape, nvec = space.shape, space.nvec
+
+        def contains(x):
+            # same as ``gym.spaces.MultiDiscrete.contains``, which accepts any dtype within bounds
+            if isinstance(x, list):
+                x = np.array(x)
+            return x.shape == shape and bool(np.all(x >= 0)) and bool(np.all(x < nvec))
+
+    elif isinstance(space, Box):
+        shape, dtype = space.shape, space.dtype
+        low, high = space.low, space.high
+        if low.size > 0 and np.all(low == low.flat[0]):
+            low = low.flat[0]
+        if high.size > 0 and np.all(high == high.flat[0]):
+            high = high.flat[0]
+        check_low = not np.all(np.isneginf(low))
+        check_high = not np.all(np.isposinf(high))
+
+        def contains(x):
+            if not isinstance(x, np.ndarray):
+                x = np.asarray(x, dtype=dtype)
+            return (
+                x.shape == shape
+                and np.can_cast(x.dtype, dtype)
+                and (not check_low or bool(np.all(x >= low)))
+                and (not check_high or bool(np.all(x <= high)))
+            )
+
+    else:
+        contains = space.contains
+    return contains
@@ -1,2 +1,4 @@
 from .fast_reset import FastResetWrapper
-from .ar_nn import ARNNWrapper
+from .ar_nn import ARNNWrapper, reverse_actions
+from .frame_stack import FrameStackWrapper
+from .video_recorder import VideoRecorderWrapper
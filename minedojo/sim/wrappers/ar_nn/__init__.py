@@ -1 +1,2 @@
 from .ar_nn_wrapper import ARNNWrapper
+from .nn_action_space_wrapper import reverse_actions
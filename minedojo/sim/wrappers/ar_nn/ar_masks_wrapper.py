@@ -6,33 +6,31 @@ import numpy as np
 from ...sim import MineDojoSim
 from ....sim import spaces as spaces
 from ....sim.mc_meta import mc as MC
-from ..utils import get_recipes_matrix, get_inventory_vector
+from ....sim.mc_meta.item_registry import ITEM_REGISTRY
+from ..utils import SparseRecipes, get_item_indices, get_inventory_vectors
 
 
-class ARMasksWrapper(gym.ObservationWrapper):
+class ActionMasks:
+    """
+    Computes masks of the valid functional actions and their arguments from the inventory and nearby tools.
+    Shared by ``ARMasksWrapper`` and ``ARNNWrapper``.
+
+    Args:
+        action_categories_and_num_args: Functional action categories and their numbers of arguments.
+        recipe_alternatives: If ``True``, an item can be crafted or smelted with any of its recipes.
+                Otherwise only its first recipe is considered.
+    """
+
     def __init__(
         self,
-        env: Union[MineDojoSim, gym.Wrapper],
         action_categories_and_num_args: Optional[dict[str, int]] = None,
+        recipe_alternatives: bool = False,
     ):
-        assert "inventory" in env.observation_space.keys()
-        assert "nearby_tools" in env.observation_space.keys()
-        assert "table" in env.observation_space["nearby_tools"].keys()
-        assert "furnace" in env.observation_space["nearby_tools"].keys()
-        assert isinstance(
-            env.action_space, spaces.MultiDiscrete
-        ), "please use this wrapper with `NNActionSpaceWrapper!`"
-        assert (
-            len(env.action_space.nvec) == 8
-        ), "please use this wrapper with `NNActionSpaceWrapper!`"
-        super().__init__(env=env)
-
         action_categories_and_num_args = action_categories_and_num_args or dict(
             no_op=0, use=0, drop=0, attack=0, craft=1, equip=1, place=1, destroy=1
         )
-        obs_space = env.observation_space
         n_fn_actions = len(action_categories_and_num_args)
-        obs_space["masks"] = spaces.Dict(
+        self.space = spaces.Dict(
             {
                 "action_type": spaces.Box(
                     low=0, high=1, shape=(n_fn_actions,), dtype=bool
@@ -50,10 +48,6 @@ class ARMasksWrapper(gym.ObservationWrapper):
                 ),
             }
         )
-        # remove `full_stats`
-        if "full_stats" in obs_space.keys():
-            del obs_space["full_stats"]
-        self.observation_space = obs_space
         # a_arg_mask can be determined now and will not change
         self._a_arg_mask = np.array(
             list(action_categories_and_num_args.values()), dtype=bool
@@ -64,90 +58,178 @@ class ARMasksWrapper(gym.ObservationWrapper):
         self._a_cat_always_true_indices = np.isin(
             np.array(self._a_cats), np.array(["no_op", "use", "attack"])
         ).nonzero()[0]
-        self._equip_place_destroy_indices = np.isin(
-            np.array(self._a_cats), np.array(["equip", "place", "destroy"])
-        ).nonzero()[0]
-        # get recipe matrix
-        self._recipes = get_recipes_matrix()
-
-    def observation(self, observation: dict[str, Any]):
-        # ------ craft smelt mask ------
-        inventory_vector = get_inventory_vector(observation["inventory"])
-        craft_smelt_mask = ~np.any(
-            (inventory_vector - self._recipes) < 0, axis=1
-        ).astype(
-            bool
-        )  # (N_all_craftable)
-        # meta mask using `nearby_table` and `nearby_furnace`
-        nearby_table, nearby_furnace = (
-            observation["nearby_tools"]["table"],
-            observation["nearby_tools"]["furnace"],
-        )
-        nearby_table = np.array(
-            [nearby_table] * len(MC.ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS), dtype=bool
-        )
-        nearby_furnace = np.array(
-            [nearby_furnace] * len(MC.ALL_SMELT_ITEMS_NN_ACTIONS), dtype=bool
-        )
-        table_craft_items_indices = slice(
+        self._recipes = SparseRecipes(all_alternatives=recipe_alternatives)
+        # per-item lookup tables indexed by item ids
+        self._air_index = ITEM_REGISTRY.id_of("air")
+        self._is_placeable = ITEM_REGISTRY.category_mask("placeable")
+        self._is_non_mainhand = ITEM_REGISTRY.category_mask("non_mainhand")
+        self._table_craft_items_indices = slice(
             len(MC.ALL_HAND_CRAFT_ITEMS_NN_ACTIONS),
             len(MC.ALL_HAND_CRAFT_ITEMS_NN_ACTIONS)
             + len(MC.ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS),
         )
-        craft_smelt_mask[table_craft_items_indices] = np.logical_and(
-            nearby_table, craft_smelt_mask[table_craft_items_indices]
+        self._smelt_items_indices = slice(
+            len(MC.ALL_CRAFT_SMELT_ITEMS) - len(MC.ALL_SMELT_ITEMS_NN_ACTIONS), None
         )
-        craft_smelt_mask[-len(MC.ALL_SMELT_ITEMS_NN_ACTIONS) :] = np.logical_and(
-            nearby_furnace, craft_smelt_mask[-len(MC.ALL_SMELT_ITEMS_NN_ACTIONS) :]
+        # masks only change with the inventory and nearby tools
+        self._masks_key = None
+        self._masks = None
+
+    def __call__(
+        self,
+        inventory_names: np.ndarray,
+        inventory_quantities: np.ndarray,
+        nearby_tools: dict[str, Any],
+    ) -> dict[str, np.ndarray]:
+        """
+        Masks of a single observation. ``inventory_names`` can also be item indices already decoded from the inventory.
+        The returned arrays are shared by subsequent calls with the same inputs, so they must not be modified.
+        """
+        masks_key = (
+            inventory_names.tobytes(),
+            inventory_quantities.tobytes(),
+            bool(nearby_tools["table"]),
+            bool(nearby_tools["furnace"]),
         )
+        if masks_key != self._masks_key:
+            masks = self.batch(
+                inventory_names[np.newaxis],
+                inventory_quantities[np.newaxis],
+                np.array([nearby_tools["table"]]),
+                np.array([nearby_tools["furnace"]]),
+            )
+            self._masks = {k: v[0] for k, v in masks.items()}
+            self._masks_key = masks_key
+        return dict(self._masks)
+
+    def batch(
+        self,
+        inventory_names: np.ndarray,
+        inventory_quantities: np.ndarray,
+        nearby_table: np.ndarray,
+        nearby_furnace: np.ndarray,
+    ) -> dict[str, np.ndarray]:
+        """
+        Computes action masks for a batch of observations, e.g., from vector envs.
+
+        Args:
+            inventory_names: Inventory names of shape ``(B, N_INV_SLOTS)``, strings or ids in ``ITEM_VOCAB``.
+            inventory_quantities: Inventory quantities of shape ``(B, N_INV_SLOTS)``.
+            nearby_table: Whether a crafting table is nearby, of shape ``(B,)``.
+            nearby_furnace: Whether a furnace is nearby, of shape ``(B,)``.
+
+        Return:
+            A dict of masks, each with a leading batch dimension of size ``B``.
+        """
+        item_indices = get_item_indices(inventory_names)
+        batch_size = len(item_indices)
+        # ------ craft smelt mask ------
+        inventory_vectors = get_inventory_vectors(item_indices, inventory_quantities)
+        craft_smelt_mask = self._recipes.craftable(inventory_vectors)
+        # meta mask using `nearby_table` and `nearby_furnace`
+        craft_smelt_mask[:, self._table_craft_items_indices] &= np.asarray(
+            nearby_table, dtype=bool
+        )[:, np.newaxis]
+        craft_smelt_mask[:, self._smelt_items_indices] &= np.asarray(
+            nearby_furnace, dtype=bool
+        )[:, np.newaxis]
         # ------ determine destroy mask ------
         # destroy mask is simply if slots are occupied
-        destroy_mask = (observation["inventory"]["name"] != "air").astype(bool)
+        occupied = item_indices != self._air_index
+        destroy_mask = occupied
         # ------ determine place mask ------
         # True if that slot is occupied by placeable items
-        place_mask = np.logical_and(
-            (observation["inventory"]["name"] != "air").astype(bool),
-            np.isin(
-                observation["inventory"]["name"], np.array(MC.PLACEABLE_ITEM_NAMES)
-            ),
-        )
+        place_mask = occupied & self._is_placeable[item_indices]
         # ------ determine equip mask
         # True if that slot is occupied
         # special treat for main-hand slot
-        equip_mask = (observation["inventory"]["name"] != "air").astype(bool)
-        equip_mask[0] = (
-            equip_mask[0]
-            and observation["inventory"]["name"][0] in MC.NON_MAINHAND_ITEM_NAMES
-        )
+        equip_mask = occupied.copy()
+        equip_mask[:, 0] &= self._is_non_mainhand[item_indices[:, 0]]
 
         # ------ determine action category mask ------
-        a_cat_mask = np.empty(shape=(self._n_fn_actions,), dtype=bool)
+        a_cat_mask = np.empty(shape=(batch_size, self._n_fn_actions), dtype=bool)
         # no_op, use, and attack are always valid
-        a_cat_mask[self._a_cat_always_true_indices] = True
+        a_cat_mask[:, self._a_cat_always_true_indices] = True
         # validity of drop is dependent on if anything held in the main-hand
-        a_cat_mask[self._a_cats.index("drop")] = (
-            False if observation["inventory"]["name"][0] == "air" else True
-        )
+        a_cat_mask[:, self._a_cats.index("drop")] = occupied[:, 0]
         # validity of craft equals to any(craft_smelt_mask) and the inventory is not full
-        a_cat_mask[self._a_cats.index("craft")] = np.any(
-            craft_smelt_mask
-        ) and not np.all((observation["inventory"]["name"] != "air").astype(bool))
+        a_cat_mask[:, self._a_cats.index("craft")] = np.any(
+            craft_smelt_mask, axis=1
+        ) & ~np.all(occupied, axis=1)
         # validity of equip simply equals to any(equip_mask)
-        a_cat_mask[self._a_cats.index("equip")] = np.any(equip_mask)
+        a_cat_mask[:, self._a_cats.index("equip")] = np.any(equip_mask, axis=1)
         # validity of place simply equals to any(place_mask)
-        a_cat_mask[self._a_cats.index("place")] = np.any(place_mask)
+        a_cat_mask[:, self._a_cats.index("place")] = np.any(place_mask, axis=1)
         # validity of destroy simple equals to any(destroy_mask)
-        a_cat_mask[self._a_cats.index("destroy")] = np.any(destroy_mask)
+        a_cat_mask[:, self._a_cats.index("destroy")] = np.any(destroy_mask, axis=1)
 
-        observation["masks"] = {
+        return {
             "action_type": a_cat_mask,
-            "action_arg": self._a_arg_mask,
+            "action_arg": np.broadcast_to(
+                self._a_arg_mask, (batch_size,) + self._a_arg_mask.shape
+            ),
             "equip": equip_mask,
             "place": place_mask,
             "destroy": destroy_mask,
             "craft_smelt": craft_smelt_mask,
         }
+
+
+class ARMasksWrapper(gym.ObservationWrapper):
+    def __init__(
+        self,
+        env: Union[MineDojoSim, gym.Wrapper],
+        action_categories_and_num_args: Optional[dict[str, int]] = None,
+        recipe_alternatives: bool = False,
+    ):
+        """
+        Args:
+            recipe_alternatives: If ``True``, an item can be crafted or smelted with any of its recipes.
+                    Otherwise only its first recipe is considered.
+        """
+        assert "inventory" in env.observation_space.keys()
+        assert "nearby_tools" in env.observation_space.keys()
+        assert "table" in env.observation_space["nearby_tools"].keys()
+        assert "furnace" in env.observation_space["nearby_tools"].keys()
+        assert isinstance(
+            env.action_space, spaces.MultiDiscrete
+        ), "please use this wrapper with `NNActionSpaceWrapper!`"
+        assert (
+            len(env.action_space.nvec) == 8
+        ), "please use this wrapper with `NNActionSpaceWrapper!`"
+        super().__init__(env=env)
+
+        self._action_masks = ActionMasks(
+            action_categories_and_num_args=action_categories_and_num_args,
+            recipe_alternatives=recipe_alternatives,
+        )
+        obs_space = env.observation_space
+        obs_space["masks"] = self._action_masks.space
+        # remove `full_stats`
+        if "full_stats" in obs_space.keys():
+            del obs_space["full_stats"]
+        self.observation_space = obs_space
+
+    def observation(self, observation: dict[str, Any]):
+        inventory = observation["inventory"]
+        observation["masks"] = self._action_masks(
+            inventory["name"], inventory["quantity"], observation["nearby_tools"]
+        )
         # remove `full_stats`
         if "full_stats" in observation:
             del observation["full_stats"]
         return observation
+
+    def masks_batch(
+        self,
+        inventory_names: np.ndarray,
+        inventory_quantities: np.ndarray,
+        nearby_table: np.ndarray,
+        nearby_furnace: np.ndarray,
+    ) -> dict[str, np.ndarray]:
+        """
+        Computes action masks for a batch of observations, e.g., from vector envs, see ``ActionMasks.batch``.
+        """
+        return self._action_masks.batch(
+            inventory_names, inventory_quantities, nearby_table, nearby_furnace
+        )
@@ -1,13 +1,21 @@
-from typing import Union, Optional
+from typing import Union, Optional, Literal
 
-import gym
-
-from .ar_masks_wrapper import ARMasksWrapper as _ARMasksWrapper
+from .ar_masks_wrapper import ActionMasks as _ActionMasks
 from .nn_action_space_wrapper import NNActionSpaceWrapper as _NNActionSpaceWrapper
-from .delta_inventory_wrapper import DeltaInventoryWrapper as _DeltaInventoryObsWrapper
+from .delta_inventory_wrapper import DeltaInventory as _DeltaInventory
+
+
+class ARNNWrapper(_NNActionSpaceWrapper):
+    """
+    Fused equivalent of
+    ``DeltaInventoryWrapper(ARMasksWrapper(NNActionSpaceWrapper(sim)))``.
 
+    Actions are translated by this wrapper itself, and masks and delta inventory are added in the same pass
+    over the observation instead of through two more wrapper layers.
+    The inventory is decoded into item indices once per step, only for changed slots,
+    and shared by masks and delta inventory.
+    """
 
-class ARNNWrapper(gym.Wrapper):
     def __init__(
         self,
         sim,
@@ -20,25 +28,65 @@ class ARNNWrapper(gym.Wrapper):
         n_decreased: int = 4,
         default_item_name: str = "air",
         action_categories_and_num_args: Optional[dict[str, int]] = None,
+        validation: Literal["full", "sampled", "off"] = "full",
+        validation_interval: int = 100,
+        lag_completion: Literal["fixed", "until_effect", "deferred"] = "fixed",
+        max_lag_steps: int = 2,
+        recipe_alternatives: bool = False,
     ):
-        sim = _DeltaInventoryObsWrapper(
-            _ARMasksWrapper(
-                _NNActionSpaceWrapper(
-                    env=sim,
-                    discretized_camera_interval=cam_interval,
-                    strict_check=strict_check,
-                ),
-                action_categories_and_num_args=action_categories_and_num_args,
-            ),
+        super().__init__(
+            env=sim,
+            discretized_camera_interval=cam_interval,
+            strict_check=strict_check,
+            validation=validation,
+            validation_interval=validation_interval,
+            lag_completion=lag_completion,
+            max_lag_steps=max_lag_steps,
+        )
+        self._action_masks = _ActionMasks(
+            action_categories_and_num_args=action_categories_and_num_args,
+            recipe_alternatives=recipe_alternatives,
+        )
+        self._delta_inventory = _DeltaInventory(
             op_action_idx=op_action_idx,
             craft_action_idx=craft_action_idx,
             craft_arg_idx=craft_arg_idx,
             n_increased=n_increased,
             n_decreased=n_decreased,
             default_item_name=default_item_name,
+            # with deferred lags, crafted items show up during the following steps
+            craft_lag_steps=max_lag_steps if lag_completion == "deferred" else 0,
         )
+        obs_space = self.env.observation_space
+        obs_space["masks"] = self._action_masks.space
+        # remove `full_stats`
+        if "full_stats" in obs_space.keys():
+            del obs_space["full_stats"]
+        obs_space["delta_inv"] = self._delta_inventory.space
+        self.observation_space = obs_space
         self.cam_interval = cam_interval
-        super().__init__(env=sim)
 
-    def reverse_action(self, action):
-        return self.env.env.env.reverse_action(action)
+    def reset(self, **kwargs):
+        observation = super().reset(**kwargs)
+        return self._observation(observation, None)
+
+    def step(self, action):
+        observation, reward, done, info = super().step(action)
+        return self._observation(observation, action), reward, done, info
+
+    def _observation(self, observation, action):
+        inventory = observation["inventory"]
+        self._delta_inventory.track(inventory, reset=action is None)
+        # masks are computed from the item indices of the tracked inventory
+        observation["masks"] = self._action_masks(
+            self._delta_inventory.item_indices,
+            inventory["quantity"],
+            observation["nearby_tools"],
+        )
+        # remove `full_stats`
+        if "full_stats" in observation:
+            del observation["full_stats"]
+        observation["delta_inv"] = self._delta_inventory.delta_obs(
+            action, observation["masks"]["craft_smelt"]
+        )
+        return observation
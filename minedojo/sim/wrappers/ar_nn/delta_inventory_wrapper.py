@@ -1,6 +1,4 @@
 from typing import Union
-from copy import deepcopy
-from collections import deque
 
 import gym
 import numpy as np
@@ -9,36 +7,38 @@ from ..utils import *
 from ...sim import MineDojoSim
 from ....sim import spaces as spaces
 from ....sim.mc_meta import mc as MC
+from ....sim.mc_meta.item_registry import ITEM_REGISTRY
 
 
-ALL_ITEMS = np.array(MC.ALL_ITEMS)
+class DeltaInventory:
+    """
+    Tracks the inventory across steps and attributes its increments and decrements to crafting or other causes.
+    Shared by ``DeltaInventoryWrapper`` and ``ARNNWrapper``.
 
+    Args:
+        op_action_idx: Index of the functional action in NN actions.
+        craft_action_idx: Value of the functional action for crafting.
+        craft_arg_idx: Index of the item to craft in NN actions.
+        n_increased: Number of increased items reported.
+        n_decreased: Number of decreased items reported.
+        default_item_name: Name to pad the reported items with.
+        craft_lag_steps: Number of steps after a crafting action during which the crafted item
+                can still show up in the inventory and be attributed to crafting,
+                e.g., ``max_lag_steps`` if actions are run with deferred lags.
+    """
 
-class DeltaInventoryWrapper(gym.Wrapper):
     def __init__(
         self,
-        env: Union[MineDojoSim, gym.Wrapper],
         op_action_idx: int = 5,
         craft_action_idx: int = 4,
         craft_arg_idx: int = 6,
         n_increased: int = 1,
         n_decreased: int = 4,
         default_item_name: str = "air",
+        craft_lag_steps: int = 0,
     ):
-        assert "inventory" in env.observation_space.keys()
-        assert "masks" in env.observation_space.keys()
-        assert "craft_smelt" in env.observation_space["masks"].keys()
-        assert isinstance(
-            env.action_space, spaces.MultiDiscrete
-        ), "please use this wrapper with `NNActionSpaceWrapper!`"
-        assert (
-            len(env.action_space.nvec) == 8
-        ), "please use this wrapper with `NNActionSpaceWrapper!`"
-        assert op_action_idx < len(env.action_space.nvec)
-        assert craft_arg_idx < len(env.action_space.nvec)
-        super().__init__(env=env)
-        obs_space = env.observation_space
-        obs_space["delta_inv"] = spaces.Dict(
+        assert craft_lag_steps >= 0, f"craft_lag_steps must be non-negative"
+        self.space = spaces.Dict(
             {
                 "inc_name_by_craft": spaces.Text(shape=(n_increased,)),
                 "inc_quantity_by_craft": spaces.Box(
@@ -58,7 +58,6 @@ class DeltaInventoryWrapper(gym.Wrapper):
                 ),
             }
         )
-        self.observation_space = obs_space
         self._default_item_name = default_item_name
         self._n_increased = n_increased
         self._n_decreased = n_decreased
@@ -66,328 +65,211 @@ class DeltaInventoryWrapper(gym.Wrapper):
         self._craft_action_idx = craft_action_idx
         self._craft_arg_idx = craft_arg_idx
 
-        self._recipes = get_recipes_matrix()
-        self._prev_inventory = None
-        self._prev_mask = None
-        # note that there is two-step lag between executing a crafting action
-        # and that item really goes into the inventory
-        # so we use a deque with len=3 to cache the history action
-        self._prev_craft_actions = deque(maxlen=1)
+        # ingredients of the first recipe of each item in `MC.ALL_CRAFT_SMELT_ITEMS`
+        self._ingredients_indices = [
+            np.flatnonzero(recipe > 0) for recipe in get_recipes_matrix()
+        ]
+        # note that there is a lag between executing a crafting action and that item really goes into the inventory,
+        # so the last crafting action is kept together with the mask before it for `craft_lag_steps` more steps,
+        # or until the crafted item shows up
+        self._craft_lag_steps = craft_lag_steps
+        self._pending_craft = None
 
-    def reset(self, **kwargs):
-        observation = self.env.reset(**kwargs)
-        self._prev_inventory = deepcopy(observation["inventory"])
-        self._prev_mask = deepcopy(observation["masks"]["craft_smelt"])
-        self._prev_craft_actions = deque(maxlen=1)
-        return self.observation(observation, None)
+        # the inventory is tracked as per-slot names, item indices and quantities, together with its count vector
+        self._names = None
+        self._item_indices = np.zeros((MC.N_INV_SLOTS,), dtype=np.int64)
+        self._quantities = np.zeros((MC.N_INV_SLOTS,), dtype=np.float64)
+        self._inv_vector = np.zeros((len(MC.ALL_ITEMS),), dtype=np.float64)
+        self._prev_inv_vector = np.zeros_like(self._inv_vector)
+        self._delta_inv_vector = np.zeros_like(self._inv_vector)
+        self._prev_mask = np.zeros((len(MC.ALL_CRAFT_SMELT_ITEMS),), dtype=bool)
+        # output arrays are preallocated and overwritten in place at every step
+        name_dtype = np.array(MC.ALL_ITEMS + [default_item_name]).dtype
+        self._delta_obs = {}
+        for direction, n in [("inc", n_increased), ("dec", n_decreased)]:
+            for source in ["craft", "other"]:
+                self._delta_obs[f"{direction}_name_by_{source}"] = np.full(
+                    (n,), default_item_name, dtype=name_dtype
+                )
+                self._delta_obs[f"{direction}_quantity_by_{source}"] = np.zeros(
+                    (n,), dtype=np.float32
+                )
 
-    def step(self, action):
-        observation, reward, done, info = self.env.step(action)
-        new_obs = self.observation(observation, action)
-        self._prev_inventory = deepcopy(observation["inventory"])
-        self._prev_mask = deepcopy(observation["masks"]["craft_smelt"])
-        return new_obs, reward, done, info
+    @property
+    def item_indices(self) -> np.ndarray:
+        """Indices in ``MC.ALL_ITEMS`` of the items in the tracked inventory slots."""
+        return self._item_indices
 
-    def observation(self, observation, action):
+    def track(self, inventory, reset: bool):
+        """
+        Updates the tracked inventory to ``inventory``. After a reset, it is rebuilt from scratch
+        and the crafting history is cleared. Otherwise, the count vector is updated by only looking at changed slots.
+        """
+        names = np.asarray(inventory["name"])
+        quantities = np.asarray(inventory["quantity"])
+        if reset:
+            self._pending_craft = None
+            self._names = names.copy()
+            self._item_indices[:] = get_item_indices(names)
+            self._quantities[:] = quantities
+            self._inv_vector[:] = get_inventory_vectors(
+                self._item_indices[np.newaxis], self._quantities[np.newaxis]
+            )[0]
+            return
+        if (
+            names.dtype.kind == "U"
+            and names.dtype.itemsize > self._names.dtype.itemsize
+        ):
+            # a longer name than seen so far, widen the buffer to hold it
+            self._names = self._names.astype(names.dtype)
+        self._prev_inv_vector, self._inv_vector = (
+            self._inv_vector,
+            self._prev_inv_vector,
+        )
+        np.copyto(self._inv_vector, self._prev_inv_vector)
+        changed = (names != self._names) | (quantities != self._quantities)
+        if np.any(changed):
+            item_indices = get_item_indices(names[changed])
+            np.subtract.at(
+                self._inv_vector,
+                self._item_indices[changed],
+                self._quantities[changed],
+            )
+            np.add.at(self._inv_vector, item_indices, quantities[changed])
+            self._names[changed] = names[changed]
+            self._item_indices[changed] = item_indices
+            self._quantities[changed] = quantities[changed]
+        np.subtract(self._inv_vector, self._prev_inv_vector, out=self._delta_inv_vector)
+
+    def delta_obs(self, action, craft_smelt_mask: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        The change of the inventory since the previous call to ``track``, ``action`` is ``None`` after a reset.
+        ``craft_smelt_mask`` is the mask of the tracked inventory, used to judge crafting at the next step.
+        Note that the returned arrays are reused and overwritten by subsequent steps,
+        so copy them if they need to be kept.
+        """
         if action is None:
             # first step
-            delta_obs = {
-                "inc_name_by_craft": np.array(
-                    [self._default_item_name] * self._n_increased
-                ),
-                "inc_quantity_by_craft": np.zeros(
-                    (self._n_increased,), dtype=np.float32
-                ),
-                "dec_name_by_craft": np.array(
-                    [self._default_item_name] * self._n_decreased
-                ),
-                "dec_quantity_by_craft": np.zeros(
-                    (self._n_decreased,), dtype=np.float32
-                ),
-                "inc_name_by_other": np.array(
-                    [self._default_item_name] * self._n_increased
-                ),
-                "inc_quantity_by_other": np.zeros(
-                    (self._n_increased,), dtype=np.float32
-                ),
-                "dec_name_by_other": np.array(
-                    [self._default_item_name] * self._n_decreased
-                ),
-                "dec_quantity_by_other": np.zeros(
-                    (self._n_decreased,), dtype=np.float32
-                ),
-            }
+            increment_indices = decrement_indices = np.zeros((0,), dtype=np.int64)
         else:
-            new_craft_idx = (
-                None
-                if action[self._op_action_idx] != self._craft_action_idx
-                else action[self._craft_arg_idx]
-            )
-            self._prev_craft_actions.append(new_craft_idx)
-            craft_idx = self._prev_craft_actions[0]
-            cur_inv_vector = get_inventory_vector(observation["inventory"])[0]
-            pre_inv_vector = get_inventory_vector(self._prev_inventory)[0]
-            delta_inv_vector = cur_inv_vector - pre_inv_vector
-            increment_indices = np.flatnonzero(delta_inv_vector > 0)[
+            if action[self._op_action_idx] == self._craft_action_idx:
+                # [craft index, mask before crafting, number of steps left to wait]
+                self._pending_craft = [
+                    action[self._craft_arg_idx],
+                    self._prev_mask.copy(),
+                    self._craft_lag_steps,
+                ]
+            increment_indices = np.flatnonzero(self._delta_inv_vector > 0)[
                 : self._n_increased
             ]
-            decrement_indices = np.flatnonzero(delta_inv_vector < 0)[
+            decrement_indices = np.flatnonzero(self._delta_inv_vector < 0)[
                 : self._n_decreased
             ]
 
-            delta_obs = {}
-            if len(increment_indices) == 0:
-                # no increment
-                delta_obs.update(
-                    {
-                        "inc_name_by_craft": np.array(
-                            [self._default_item_name] * self._n_increased
-                        ),
-                        "inc_quantity_by_craft": np.zeros(
-                            (self._n_increased,), dtype=np.float32
-                        ),
-                        "inc_name_by_other": np.array(
-                            [self._default_item_name] * self._n_increased
-                        ),
-                        "inc_quantity_by_other": np.zeros(
-                            (self._n_increased,), dtype=np.float32
-                        ),
-                    }
+        # increments and decrements are attributed to "craft" only if the item was craftable,
+        # and it was the crafted item that increased, or all of its ingredients that decreased
+        inc_by_craft = dec_by_craft = False
+        if self._pending_craft is not None:
+            craft_idx, craft_mask, n_steps_left = self._pending_craft
+            item_idx_to_craft = ITEM_REGISTRY.craft_smelt_item_ids[craft_idx]
+            crafted = item_idx_to_craft in increment_indices
+            if bool(craft_mask[craft_idx]) is True:
+                inc_by_craft = crafted
+                dec_by_craft = set(self._ingredients_indices[craft_idx]).issubset(
+                    set(decrement_indices)
                 )
+            # stop waiting once the crafted item showed up
+            if crafted or n_steps_left == 0:
+                self._pending_craft = None
             else:
-                # "craft" is not selected!
-                if craft_idx is None:
-                    delta_obs.update(
-                        {
-                            "inc_name_by_craft": np.array(
-                                [self._default_item_name] * self._n_increased
-                            ),
-                            "inc_quantity_by_craft": np.zeros(
-                                (self._n_increased,), dtype=np.float32
-                            ),
-                            "inc_name_by_other": np.concatenate(
-                                (
-                                    ALL_ITEMS[increment_indices],
-                                    np.array(
-                                        [self._default_item_name]
-                                        * (self._n_increased - len(increment_indices))
-                                    ),
-                                )
-                            ),
-                            "inc_quantity_by_other": np.concatenate(
-                                (
-                                    delta_inv_vector[increment_indices],
-                                    np.zeros(
-                                        shape=(
-                                            self._n_increased - len(increment_indices),
-                                        )
-                                    ),
-                                )
-                            ).astype(np.float32),
-                        }
-                    )
-                else:
-                    item_name_to_craft = MC.ALL_CRAFT_SMELT_ITEMS[craft_idx]
-                    item_idx_to_craft = MC.ALL_ITEMS.index(item_name_to_craft)
-                    if (
-                        bool(self._prev_mask[craft_idx]) is True
-                        and item_idx_to_craft in increment_indices
-                    ):
-                        delta_obs.update(
-                            {
-                                "inc_name_by_craft": np.concatenate(
-                                    (
-                                        ALL_ITEMS[increment_indices],
-                                        np.array(
-                                            [self._default_item_name]
-                                            * (
-                                                self._n_increased
-                                                - len(increment_indices)
-                                            )
-                                        ),
-                                    )
-                                ),
-                                "inc_quantity_by_craft": np.concatenate(
-                                    (
-                                        delta_inv_vector[increment_indices],
-                                        np.zeros(
-                                            shape=(
-                                                self._n_increased
-                                                - len(increment_indices),
-                                            )
-                                        ),
-                                    )
-                                ).astype(np.float32),
-                                "inc_name_by_other": np.array(
-                                    [self._default_item_name] * self._n_increased
-                                ),
-                                "inc_quantity_by_other": np.zeros(
-                                    (self._n_increased,), dtype=np.float32
-                                ),
-                            }
-                        )
-                    else:
-                        delta_obs.update(
-                            {
-                                "inc_name_by_craft": np.array(
-                                    [self._default_item_name] * self._n_increased
-                                ),
-                                "inc_quantity_by_craft": np.zeros(
-                                    (self._n_increased,), dtype=np.float32
-                                ),
-                                "inc_name_by_other": np.concatenate(
-                                    (
-                                        ALL_ITEMS[increment_indices],
-                                        np.array(
-                                            [self._default_item_name]
-                                            * (
-                                                self._n_increased
-                                                - len(increment_indices)
-                                            )
-                                        ),
-                                    )
-                                ),
-                                "inc_quantity_by_other": np.concatenate(
-                                    (
-                                        delta_inv_vector[increment_indices],
-                                        np.zeros(
-                                            shape=(
-                                                self._n_increased
-                                                - len(increment_indices),
-                                            )
-                                        ),
-                                    )
-                                ).astype(np.float32),
-                            }
-                        )
-            if len(decrement_indices) == 0:
-                # no decrement
-                delta_obs.update(
-                    {
-                        "dec_name_by_craft": np.array(
-                            [self._default_item_name] * self._n_decreased
-                        ),
-                        "dec_quantity_by_craft": np.zeros(
-                            (self._n_decreased,), dtype=np.float32
-                        ),
-                        "dec_name_by_other": np.array(
-                            [self._default_item_name] * self._n_decreased
-                        ),
-                        "dec_quantity_by_other": np.zeros(
-                            (self._n_decreased,), dtype=np.float32
-                        ),
-                    }
-                )
-            else:
-                # "craft" is not selected!
-                if craft_idx is None:
-                    delta_obs.update(
-                        {
-                            "dec_name_by_craft": np.array(
-                                [self._default_item_name] * self._n_decreased
-                            ),
-                            "dec_quantity_by_craft": np.zeros(
-                                (self._n_decreased,), dtype=np.float32
-                            ),
-                            "dec_name_by_other": np.concatenate(
-                                (
-                                    ALL_ITEMS[decrement_indices],
-                                    np.array(
-                                        [self._default_item_name]
-                                        * (self._n_decreased - len(decrement_indices))
-                                    ),
-                                )
-                            ),
-                            "dec_quantity_by_other": abs(
-                                np.concatenate(
-                                    (
-                                        delta_inv_vector[decrement_indices],
-                                        np.zeros(
-                                            (
-                                                self._n_decreased
-                                                - len(decrement_indices),
-                                            )
-                                        ),
-                                    )
-                                ).astype(np.float32)
-                            ),
-                        }
-                    )
-                else:
-                    ingredients_indices = np.flatnonzero(self._recipes[craft_idx] > 0)
-                    if bool(self._prev_mask[craft_idx]) is True and set(
-                        ingredients_indices
-                    ).issubset(set(decrement_indices)):
-                        delta_obs.update(
-                            {
-                                "dec_name_by_craft": np.concatenate(
-                                    (
-                                        ALL_ITEMS[decrement_indices],
-                                        np.array(
-                                            [self._default_item_name]
-                                            * (
-                                                self._n_decreased
-                                                - len(decrement_indices)
-                                            )
-                                        ),
-                                    )
-                                ),
-                                "dec_quantity_by_craft": abs(
-                                    np.concatenate(
-                                        (
-                                            delta_inv_vector[decrement_indices],
-                                            np.zeros(
-                                                (
-                                                    self._n_decreased
-                                                    - len(decrement_indices),
-                                                )
-                                            ),
-                                        )
-                                    ).astype(np.float32)
-                                ),
-                                "dec_name_by_other": np.array(
-                                    [self._default_item_name] * self._n_decreased
-                                ),
-                                "dec_quantity_by_other": np.zeros(
-                                    (self._n_decreased,), dtype=np.float32
-                                ),
-                            }
-                        )
-                    else:
-                        delta_obs.update(
-                            {
-                                "dec_name_by_craft": np.array(
-                                    [self._default_item_name] * self._n_decreased
-                                ),
-                                "dec_quantity_by_craft": np.zeros(
-                                    (self._n_decreased,), dtype=np.float32
-                                ),
-                                "dec_name_by_other": np.concatenate(
-                                    (
-                                        ALL_ITEMS[decrement_indices],
-                                        np.array(
-                                            [self._default_item_name]
-                                            * (
-                                                self._n_decreased
-                                                - len(decrement_indices)
-                                            )
-                                        ),
-                                    )
-                                ),
-                                "dec_quantity_by_other": abs(
-                                    np.concatenate(
-                                        (
-                                            delta_inv_vector[decrement_indices],
-                                            np.zeros(
-                                                (
-                                                    self._n_decreased
-                                                    - len(decrement_indices),
-                                                )
-                                            ),
-                                        )
-                                    ).astype(np.float32)
-                                ),
-                            }
-                        )
-        observation["delta_inv"] = delta_obs
+                self._pending_craft[2] -= 1
+        self._fill(
+            "inc",
+            increment_indices,
+            self._delta_inv_vector[increment_indices],
+            inc_by_craft,
+        )
+        self._fill(
+            "dec",
+            decrement_indices,
+            np.abs(self._delta_inv_vector[decrement_indices]),
+            dec_by_craft,
+        )
+        np.copyto(self._prev_mask, craft_smelt_mask)
+        return dict(self._delta_obs)
+
+    def _fill(self, direction: str, indices, quantities, by_craft: bool):
+        source, default_source = ("craft", "other") if by_craft else ("other", "craft")
+        names = self._delta_obs[f"{direction}_name_by_{source}"]
+        names[: len(indices)] = ITEM_REGISTRY.names[indices]
+        names[len(indices) :] = self._default_item_name
+        quantity = self._delta_obs[f"{direction}_quantity_by_{source}"]
+        quantity[: len(indices)] = quantities
+        quantity[len(indices) :] = 0
+        self._delta_obs[f"{direction}_name_by_{default_source}"][
+            :
+        ] = self._default_item_name
+        self._delta_obs[f"{direction}_quantity_by_{default_source}"][:] = 0
+
+
+class DeltaInventoryWrapper(gym.Wrapper):
+    def __init__(
+        self,
+        env: Union[MineDojoSim, gym.Wrapper],
+        op_action_idx: int = 5,
+        craft_action_idx: int = 4,
+        craft_arg_idx: int = 6,
+        n_increased: int = 1,
+        n_decreased: int = 4,
+        default_item_name: str = "air",
+        craft_lag_steps: int = 0,
+    ):
+        """
+        Args:
+            craft_lag_steps: Number of steps after a crafting action during which the crafted item
+                    can still show up in the inventory and be attributed to crafting,
+                    e.g., ``max_lag_steps`` if the inner ``NNActionSpaceWrapper`` defers its lags.
+        """
+        assert "inventory" in env.observation_space.keys()
+        assert "masks" in env.observation_space.keys()
+        assert "craft_smelt" in env.observation_space["masks"].keys()
+        assert isinstance(
+            env.action_space, spaces.MultiDiscrete
+        ), "please use this wrapper with `NNActionSpaceWrapper!`"
+        assert (
+            len(env.action_space.nvec) == 8
+        ), "please use this wrapper with `NNActionSpaceWrapper!`"
+        assert op_action_idx < len(env.action_space.nvec)
+        assert craft_arg_idx < len(env.action_space.nvec)
+        super().__init__(env=env)
+        self._delta_inventory = DeltaInventory(
+            op_action_idx=op_action_idx,
+            craft_action_idx=craft_action_idx,
+            craft_arg_idx=craft_arg_idx,
+            n_increased=n_increased,
+            n_decreased=n_decreased,
+            default_item_name=default_item_name,
+            craft_lag_steps=craft_lag_steps,
+        )
+        obs_space = env.observation_space
+        obs_space["delta_inv"] = self._delta_inventory.space
+        self.observation_space = obs_space
+
+    def reset(self, **kwargs):
+        observation = self.env.reset(**kwargs)
+        return self.observation(observation, None)
+
+    def step(self, action):
+        observation, reward, done, info = self.env.step(action)
+        return self.observation(observation, action), reward, done, info
+
+    def observation(self, observation, action):
+        """
+        Note that arrays in ``observation["delta_inv"]`` are reused and overwritten by subsequent steps,
+        so copy them if they need to be kept.
+        """
+        self._delta_inventory.track(observation["inventory"], reset=action is None)
+        observation["delta_inv"] = self._delta_inventory.delta_obs(
+            action, observation["masks"]["craft_smelt"]
+        )
         return observation
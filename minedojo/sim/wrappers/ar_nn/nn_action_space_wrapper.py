@@ -1,5 +1,6 @@
 import math
-from typing import Union, Sequence
+from copy import deepcopy
+from typing import Union, Sequence, Literal, Optional, List, Tuple, Dict
 
 import gym
 import numpy as np
@@ -8,6 +9,8 @@ from ...sim import MineDojoSim
 from ....sim import spaces as spaces
 from ....sim.mc_meta import mc as MC
 from ....sim.inventory import InventoryItem
+from ....sim.mc_meta.item_registry import ITEM_REGISTRY
+from ..utils import ActionValidator
 
 
 class NNActionSpaceWrapper(gym.Wrapper):
@@ -15,12 +18,43 @@ class NNActionSpaceWrapper(gym.Wrapper):
     Action wrapper to transform native action space to a new space friendly to train NNs
     """
 
+    # Malmo keys set to 1 by each value of the first three components, None for no-op
+    _MOVE_KEYS = (
+        (None, "forward", "back"),
+        (None, "left", "right"),
+        (None, "jump", "sneak", "sprint"),
+    )
+    # functional actions without arguments
+    _FN_KEYS = {1: "use", 2: "drop", 3: "attack"}
+    # functional actions taking an inventory slot
+    _SLOT_FN_NAMES = {5: "equip", 6: "place", 7: "destroy"}
+
     def __init__(
         self,
         env: Union[MineDojoSim, gym.Wrapper],
         discretized_camera_interval: Union[int, float] = 15,
         strict_check: bool = True,
+        validation: Literal["full", "sampled", "off"] = "full",
+        validation_interval: int = 100,
+        lag_completion: Literal["fixed", "until_effect", "deferred"] = "fixed",
+        max_lag_steps: int = 2,
     ):
+        """
+        Args:
+            lag_completion: How to wait for Malmo to apply drop, craft, equip, place and destroy actions,
+                    whose effects may only show up in the inventory a few ticks later.
+                    ``"fixed"`` always runs ``max_lag_steps`` no-op steps after them.
+                    ``"until_effect"`` runs no-op steps only until the inventory or equipment changes,
+                    at most ``max_lag_steps`` of them.
+                    ``"deferred"`` returns right away and lets the following agent steps serve as the wait.
+                    Only if the next action addresses an inventory slot (equip, place, destroy) before the effect
+                    shows up, no-op steps are run first as in ``"until_effect"``.
+            max_lag_steps: Maximum number of no-op steps run to wait for the effect of an action.
+            validation: Policy of checking actions against the action spaces in ``action`` and ``reverse_action``.
+                    ``"full"`` checks every action, ``"sampled"`` one in every ``validation_interval`` actions,
+                    and ``"off"`` disables the checks, e.g., for production runs.
+            validation_interval: Interval between checked actions if ``validation`` is ``"sampled"``.
+        """
         assert (
             "equip" in env.action_space.keys()
             and "place" in env.action_space.keys()
@@ -59,95 +93,167 @@ class NNActionSpaceWrapper(gym.Wrapper):
         self._cam_interval = discretized_camera_interval
         self._inventory_names = None
         self._strict_check = strict_check
+        self._validate_action = ActionValidator(
+            self.action_space, validation, validation_interval
+        )
+        self._validate_malmo_action = ActionValidator(
+            env.action_space, validation, validation_interval
+        )
+        # inventory names are ids in ITEM_VOCAB with `numeric_obs=True`
+        self._name_ids = not isinstance(
+            env.observation_space["inventory"]["name"], spaces.Text
+        )
+        # lookup tables from action components to Malmo action fields
+        self._camera_table = (
+            np.arange(max(n_pitch_bins, n_yaw_bins), dtype=np.float64)
+            * discretized_camera_interval
+            - 180
+        )
+        self._craft_table = []
+        for item in MC.ALL_CRAFT_SMELT_ITEMS:
+            if item in MC.ALL_HAND_CRAFT_ITEMS_NN_ACTIONS:
+                self._craft_table.append(("craft", item))
+            elif item in MC.ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS:
+                self._craft_table.append(("craft_with_table", item))
+            elif item in MC.ALL_SMELT_ITEMS_NN_ACTIONS:
+                self._craft_table.append(("smelt", item))
+            else:
+                raise ValueError(f"Unknown item {item} to craft/smelt!")
+        # no-op templates patched in place by `_action` and `action_batch`, never returned to callers
+        self._noop = env.action_space.no_op()
+        self._malmo_action = deepcopy(self._noop)
+        self._patched_keys = []
+        self._batch_malmo_actions = []
+        assert lag_completion in {
+            "fixed",
+            "until_effect",
+            "deferred",
+        }, f"Unknown lag completion mode {lag_completion}"
+        assert (
+            max_lag_steps >= 0
+        ), f"max_lag_steps must be non-negative, got {max_lag_steps}"
+        self._lag_completion = lag_completion
+        self._max_lag_steps = max_lag_steps
+        # inventory and equipment before an action whose effect has not shown up yet
+        self._pending_state = None
+        self._last_obs = None
 
     def action(self, action: Sequence[int]):
         """
-        NN action to Malmo action
+        NN action to Malmo action.
+        """
+        malmo_action, destroy_item = self._action(action)
+        return _copy_malmo_action(malmo_action), destroy_item
+
+    def _action(self, action: Sequence[int]):
+        # the returned Malmo action is the template patched in place, so it is overwritten by the next call
+        assert self._validate_action(action), f"Invalid action {action}"
+        return self._patch_malmo_action(
+            self._malmo_action,
+            self._patched_keys,
+            action,
+            self._camera_table[action[3]],
+            self._camera_table[action[4]],
+            self._inventory_names,
+        )
+
+    def action_batch(
+        self, actions: np.ndarray, inventory_names: Optional[np.ndarray] = None
+    ) -> List[Tuple[dict, Tuple[bool, Optional[int]]]]:
+        """
+        Batched version of ``action`` for vector envs sharing this action space.
+
+        Args:
+            actions: NN actions of shape ``(B, 8)``.
+            inventory_names: Inventory names of shape ``(B, N_INV_SLOTS)`` used by equip, place and destroy.
+                    If ``None``, uses the inventory of this env for all actions.
+
+        Return:
+            A list of ``B`` tuple(Malmo action, destroy item).
         """
-        assert self.action_space.contains(action)
+        actions = np.asarray(actions)
+        assert (
+            actions.ndim == 2 and actions.shape[1] == 8
+        ), f"actions must be of shape (B, 8), got {actions.shape}"
+        for action in actions:
+            assert self._validate_action(action), f"Invalid action {action}"
+        while len(self._batch_malmo_actions) < len(actions):
+            self._batch_malmo_actions.append((deepcopy(self._noop), []))
+        if inventory_names is None:
+            inventory_names = [self._inventory_names] * len(actions)
+        # camera tables are looked up for the whole batch at once
+        cameras = self._camera_table[actions[:, 3:5]]
+        results = []
+        for action, camera, names, (malmo_action, patched_keys) in zip(
+            actions, cameras, inventory_names, self._batch_malmo_actions
+        ):
+            malmo_action, destroy_item = self._patch_malmo_action(
+                malmo_action, patched_keys, action, camera[0], camera[1], names
+            )
+            results.append((_copy_malmo_action(malmo_action), destroy_item))
+        return results
+
+    def _patch_malmo_action(
+        self,
+        malmo_action: dict,
+        patched_keys: list,
+        action: Sequence[int],
+        pitch: float,
+        yaw: float,
+        inventory_names: np.ndarray,
+    ):
+        # restore the fields set by the previous action, the rest of the template is still no-op
+        for key in patched_keys:
+            malmo_action[key] = self._noop[key]
+        patched_keys.clear()
         destroy_item = (False, None)
-        noop = self.env.action_space.no_op()
 
         # ------ parse main actions ------
-        # parse forward and back
-        if action[0] == 1:
-            noop["forward"] = 1
-        elif action[0] == 2:
-            noop["back"] = 1
-        # parse left and right
-        if action[1] == 1:
-            noop["left"] = 1
-        elif action[1] == 2:
-            noop["right"] = 1
-        # parse jump sneak and sprint
-        if action[2] == 1:
-            noop["jump"] = 1
-        elif action[2] == 2:
-            noop["sneak"] = 1
-        elif action[2] == 3:
-            noop["sprint"] = 1
-        # parse camera pitch
-        noop["camera"][0] = float(action[3]) * self._cam_interval + (-180)
-        # parse camera yaw
-        noop["camera"][1] = float(action[4]) * self._cam_interval + (-180)
+        # forward/back, left/right, and jump/sneak/sprint
+        for key_table, value in zip(self._MOVE_KEYS, action[:3]):
+            key = key_table[value]
+            if key is not None:
+                malmo_action[key] = 1
+                patched_keys.append(key)
+        # parse camera pitch and yaw
+        malmo_action["camera"][0] = pitch
+        malmo_action["camera"][1] = yaw
 
         # ------ parse functional actions ------
         fn_action = action[5]
         # note that 0 is no_op
-        if fn_action == 0:
-            pass
-        elif fn_action == 1:
-            noop["use"] = 1
-        elif fn_action == 2:
-            noop["drop"] = 1
-        elif fn_action == 3:
-            noop["attack"] = 1
+        if fn_action in self._FN_KEYS:
+            key = self._FN_KEYS[fn_action]
+            malmo_action[key] = 1
+            patched_keys.append(key)
         elif fn_action == 4:
-            item_to_craft = MC.ALL_CRAFT_SMELT_ITEMS[action[6]]
-            if item_to_craft in MC.ALL_HAND_CRAFT_ITEMS_NN_ACTIONS:
-                noop["craft"] = item_to_craft
-            elif item_to_craft in MC.ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS:
-                noop["craft_with_table"] = item_to_craft
-            elif item_to_craft in MC.ALL_SMELT_ITEMS_NN_ACTIONS:
-                noop["smelt"] = item_to_craft
-            elif self._strict_check:
-                raise ValueError(f"Unknown item {item_to_craft} to craft/smelt!")
-        elif fn_action == 5:
-            assert action[7] in list(range(MC.N_INV_SLOTS))
-            item_id = self._inventory_names[action[7]].replace(" ", "_")
-            if item_id == "air":
-                if self._strict_check:
-                    raise ValueError(
-                        "Trying to equip air, raise error with strict check."
-                        "You shouldn't execute this action, maybe something wrong with the mask!"
-                    )
-            else:
-                noop["equip"] = item_id
-        elif fn_action == 6:
-            assert action[7] in list(range(MC.N_INV_SLOTS))
-            item_id = self._inventory_names[action[7]].replace(" ", "_")
-            if item_id == "air":
-                if self._strict_check:
-                    raise ValueError(
-                        "Trying to place air, raise error with strict check."
-                        "You shouldn't execute this action, maybe something wrong with the mask!"
-                    )
-            else:
-                noop["place"] = item_id
-        elif fn_action == 7:
-            assert action[7] in list(range(MC.N_INV_SLOTS))
-            item_id = self._inventory_names[action[7]].replace(" ", "_")
+            key, item_to_craft = self._craft_table[action[6]]
+            malmo_action[key] = item_to_craft
+            patched_keys.append(key)
+        elif fn_action in {5, 6, 7}:
+            slot = action[7]
+            assert 0 <= slot < MC.N_INV_SLOTS
+            item_id = self._item_name(inventory_names[slot])
             if item_id == "air":
                 if self._strict_check:
                     raise ValueError(
-                        "Trying to destroy air, raise error with strict check."
+                        f"Trying to {self._SLOT_FN_NAMES[fn_action]} air, raise error with strict check."
                         "You shouldn't execute this action, maybe something wrong with the mask!"
                     )
+            elif fn_action == 7:
+                destroy_item = (True, slot)
             else:
-                destroy_item = (True, action[7])
-        else:
+                key = self._SLOT_FN_NAMES[fn_action]
+                malmo_action[key] = item_id
+                patched_keys.append(key)
+        elif fn_action != 0:
             raise ValueError(f"Unknown value {fn_action} for function action")
-        return noop, destroy_item
+        return malmo_action, destroy_item
+
+    def _item_name(self, inventory_name) -> str:
+        if self._name_ids:
+            return ITEM_REGISTRY.name_of(inventory_name)
+        return ITEM_REGISTRY.underscore_name(inventory_name)
 
     def reverse_action(self, action):
         """
@@ -162,7 +268,7 @@ class NNActionSpaceWrapper(gym.Wrapper):
             * 180
             / np.pi
         )
-        assert self.env.action_space.contains(action)
+        assert self._validate_malmo_action(action), f"Invalid action {action}"
 
         noop = self.action_space.no_op()
         # ------ parse main actions ------
@@ -210,24 +316,28 @@ class NNActionSpaceWrapper(gym.Wrapper):
             if isinstance(craft, int):
                 craft = MC.ALL_PERSONAL_CRAFTING_ITEMS[craft - 1]
             noop[5] = 4
-            noop[6] = MC.ALL_CRAFT_SMELT_ITEMS.index(craft)
+            noop[6] = ITEM_REGISTRY.craft_smelt_id_of(craft)
         elif action["craft_with_table"] != "none" and action["craft_with_table"] != 0:
             craft = action["craft_with_table"]
             if isinstance(craft, int):
                 craft = MC.ALL_CRAFTING_TABLE_ITEMS[craft - 1]
             noop[5] = 4
-            noop[6] = MC.ALL_CRAFT_SMELT_ITEMS.index(craft)
+            noop[6] = ITEM_REGISTRY.craft_smelt_id_of(craft)
         elif action["smelt"] != "none" and action["smelt"] != 0:
             smelt = action["smelt"]
             if isinstance(smelt, int):
                 smelt = MC.ALL_SMELTING_ITEMS[smelt - 1]
             noop[5] = 4
-            noop[6] = MC.ALL_CRAFT_SMELT_ITEMS.index(smelt)
+            noop[6] = ITEM_REGISTRY.craft_smelt_id_of(smelt)
         elif action["equip"] != "none" and action["equip"] != 0:
             equip = action["equip"]
             if isinstance(equip, int):
                 equip = MC.ALL_ITEMS[equip - 1]
-            equip = equip.replace("_", " ")
+            equip = (
+                ITEM_REGISTRY.id_of(equip)
+                if self._name_ids
+                else ITEM_REGISTRY.space_name(equip)
+            )
             if equip not in self._inventory_names:
                 if self._strict_check:
                     raise ValueError(
@@ -241,7 +351,11 @@ class NNActionSpaceWrapper(gym.Wrapper):
             place = action["place"]
             if isinstance(place, int):
                 place = MC.ALL_ITEMS[place - 1]
-            place = place.replace("_", " ")
+            place = (
+                ITEM_REGISTRY.id_of(place)
+                if self._name_ids
+                else ITEM_REGISTRY.space_name(place)
+            )
             if place not in self._inventory_names:
                 if self._strict_check:
                     raise ValueError(
@@ -255,27 +369,232 @@ class NNActionSpaceWrapper(gym.Wrapper):
             noop[5] = 2
         return noop
 
+    def reverse_actions(
+        self, actions: Dict[str, np.ndarray], inventory_names: np.ndarray
+    ) -> np.ndarray:
+        """
+        Batched version of ``reverse_action`` for whole trajectories, see ``reverse_actions``.
+        """
+        return reverse_actions(
+            actions,
+            inventory_names,
+            cam_interval=self._cam_interval,
+            strict_check=self._strict_check,
+        )
+
     def reset(self, **kwargs):
         obs = self.env.reset(**kwargs)
         self._inventory_names = obs["inventory"]["name"].copy()
+        self._pending_state = None
+        self._last_obs = obs
         return obs
 
     def step(self, action: Sequence[int]):
-        malmo_action, destroy_item = self.action(action)
+        if self._pending_state is not None and action[5] in self._SLOT_FN_NAMES:
+            # the inventory must be settled before resolving the slot
+            result = self._wait_for_effect(self._pending_state, self._last_obs)
+            if result is not None and result[2]:
+                return result
+        state_before = (
+            self._inventory_state(self._last_obs)
+            if self._lag_completion != "fixed"
+            else None
+        )
+        # the template is only read by the env within this step, so it is not copied
+        malmo_action, destroy_item = self._action(action)
         destroy_item, destroy_slot = destroy_item
         if destroy_item:
             obs, reward, done, info = self.env.set_inventory(
                 inventory_list=[
                     InventoryItem(name="air", slot=destroy_slot, quantity=1, variant=0)
                 ],
-                action=malmo_action,
+                action=dict(malmo_action),
             )
         else:
             obs, reward, done, info = self.env.step(malmo_action)
+        self._update(obs)
+        if self._pending_state is not None and self._effect_observed(
+            self._pending_state, obs
+        ):
+            self._pending_state = None
 
-        # handle malmo's lags
+        # handle malmo's lags, each no-op only waits for a single tick regardless of `frame_skip`
         if action[5] in {2, 4, 5, 6, 7}:
-            for _ in range(2):
-                obs, reward, done, info = self.env.step(self.env.action_space.no_op())
-        self._inventory_names = obs["inventory"]["name"].copy()
+            if self._lag_completion == "fixed":
+                for _ in range(self._max_lag_steps):
+                    obs, reward, done, info = self.env.step(
+                        self.env.action_space.no_op(), repeat=1
+                    )
+                self._update(obs)
+            elif done:
+                pass
+            elif self._lag_completion == "until_effect":
+                result = self._wait_for_effect(state_before, obs)
+                if result is not None:
+                    obs, reward, done, info = result
+            elif not self._effect_observed(state_before, obs):
+                self._pending_state = state_before
         return obs, reward, done, info
+
+    def _wait_for_effect(self, state_before, obs):
+        """
+        Runs no-op steps until the inventory or equipment differs from ``state_before``, at most ``max_lag_steps``.
+        Returns the result of the last no-op step, or ``None`` if none was run.
+        """
+        result = None
+        for _ in range(self._max_lag_steps):
+            if self._effect_observed(state_before, obs):
+                break
+            result = self.env.step(self.env.action_space.no_op(), repeat=1)
+            obs = result[0]
+            self._update(obs)
+            if result[2]:
+                break
+        self._pending_state = None
+        return result
+
+    def _update(self, obs):
+        self._last_obs = obs
+        self._inventory_names = obs["inventory"]["name"].copy()
+
+    @staticmethod
+    def _inventory_state(obs):
+        state = [obs["inventory"]["name"].copy(), obs["inventory"]["quantity"].copy()]
+        if "equipment" in obs:
+            state.append(obs["equipment"]["name"].copy())
+        return state
+
+    @staticmethod
+    def _effect_observed(state_before, obs) -> bool:
+        state = [obs["inventory"]["name"], obs["inventory"]["quantity"]]
+        if "equipment" in obs:
+            state.append(obs["equipment"]["name"])
+        return not all(
+            np.array_equal(before, after) for before, after in zip(state_before, state)
+        )
+
+
+def _copy_malmo_action(malmo_action: dict) -> dict:
+    # values other than the camera are immutable, so a shallow copy suffices
+    action = dict(malmo_action)
+    action["camera"] = malmo_action["camera"].copy()
+    return action
+
+
+def _map_unique(values: np.ndarray, fn, dtype=None) -> np.ndarray:
+    # trajectories mostly repeat a few values, so only map the distinct ones
+    uniques, inverse = np.unique(values, return_inverse=True)
+    return np.array([fn(value) for value in uniques], dtype=dtype)[inverse.reshape(-1)]
+
+
+def _selected_items(values, int_items: List[str]):
+    """Returns the mask of steps where an item is given and the item names, ints are 1-based indices in ``int_items``."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.integer):
+        mask = values != 0
+        names = np.array(["none"] + list(int_items))[values]
+    else:
+        mask = values != "none"
+        names = values
+    return mask, names
+
+
+def reverse_actions(
+    actions: Dict[str, np.ndarray],
+    inventory_names: np.ndarray,
+    cam_interval: Union[int, float] = 15,
+    strict_check: bool = True,
+) -> np.ndarray:
+    """
+    Converts a trajectory of Malmo actions to NN actions at once. Produces the same results as calling
+    ``NNActionSpaceWrapper.reverse_action`` on each step, but item names are mapped once per distinct value
+    and all the rest is vectorized over steps. Actions are not validated against the action space.
+
+    Args:
+        actions: Malmo actions of ``T`` steps, a dict mapping each action key to an array of shape ``(T,)``
+                (``(T, 2)`` for ``camera``).
+        inventory_names: Inventory names of shape ``(T, N_INV_SLOTS)`` before each step,
+                or ``(N_INV_SLOTS,)`` if the inventory does not change. Can be strings or ids in ``ITEM_VOCAB``.
+        cam_interval: The camera interval of the NN action space.
+        strict_check: If ``True``, raise an error when an equipped or placed item is not in the inventory.
+
+    Return:
+        NN actions of shape ``(T, 8)``.
+    """
+    n_steps = len(actions["forward"])
+    inventory_names = np.asarray(inventory_names)
+    if inventory_names.ndim == 1:
+        inventory_names = np.broadcast_to(
+            inventory_names, (n_steps,) + inventory_names.shape
+        )
+    name_ids = np.issubdtype(inventory_names.dtype, np.integer)
+
+    def pressed(k):
+        return np.asarray(actions[k]) == 1
+
+    nn_actions = np.zeros((n_steps, 8), dtype=np.int64)
+
+    # ------ parse main actions ------
+    # forward and back, left and right cancel each other
+    forward, back = pressed("forward"), pressed("back")
+    nn_actions[:, 0] = np.select([forward & ~back, back & ~forward], [1, 2], 0)
+    left, right = pressed("left"), pressed("right")
+    nn_actions[:, 1] = np.select([left & ~right, right & ~left], [1, 2], 0)
+    # prioritize jump, sneak and sprint cancel each other
+    jump, sneak, sprint = pressed("jump"), pressed("sneak"), pressed("sprint")
+    nn_actions[:, 2] = np.select([jump, sneak & ~sprint, sprint & ~sneak], [1, 2, 3], 0)
+    # convert camera actions to [-pi, +pi], then bin pitch and yaw
+    camera = np.asarray(actions["camera"])
+    camera = (
+        np.arctan2(np.sin(camera * np.pi / 180), np.cos(camera * np.pi / 180))
+        * 180
+        / np.pi
+    )
+    nn_actions[:, 3:5] = np.ceil((camera - (-180)) / cam_interval)
+
+    # ------ parse functional actions ------
+    # order: attack > use > craft > equip > place > drop > destroy
+    undecided = np.ones(n_steps, dtype=bool)
+
+    def take(mask):
+        mask = undecided & mask
+        undecided[mask] = False
+        return mask
+
+    nn_actions[take(pressed("attack")), 5] = 3
+    nn_actions[take(pressed("use")), 5] = 1
+    for action_key, int_items in [
+        ("craft", MC.ALL_PERSONAL_CRAFTING_ITEMS),
+        ("craft_with_table", MC.ALL_CRAFTING_TABLE_ITEMS),
+        ("smelt", MC.ALL_SMELTING_ITEMS),
+    ]:
+        mask, names = _selected_items(actions[action_key], int_items)
+        mask = take(mask)
+        if np.any(mask):
+            nn_actions[mask, 5] = 4
+            nn_actions[mask, 6] = _map_unique(
+                names[mask], ITEM_REGISTRY.craft_smelt_id_of, dtype=np.int64
+            )
+    for action_key, fn_action in [("equip", 5), ("place", 6)]:
+        mask, names = _selected_items(actions[action_key], MC.ALL_ITEMS)
+        mask = take(mask)
+        if not np.any(mask):
+            continue
+        names = _map_unique(
+            names[mask],
+            ITEM_REGISTRY.id_of if name_ids else ITEM_REGISTRY.space_name,
+        )
+        # the first slot holding the item
+        in_slots = inventory_names[mask] == names[:, None]
+        found = np.any(in_slots, axis=1)
+        if strict_check and not np.all(found):
+            step = np.nonzero(mask)[0][np.argmin(found)]
+            raise ValueError(
+                f"try to {action_key} {names[np.argmin(found)]}, "
+                f"but it is not in the inventory {inventory_names[step]} at step {step}"
+            )
+        steps = np.nonzero(mask)[0][found]
+        nn_actions[steps, 5] = fn_action
+        nn_actions[steps, 7] = np.argmax(in_slots[found], axis=1)
+    nn_actions[take(pressed("drop")), 5] = 2
+    return nn_actions
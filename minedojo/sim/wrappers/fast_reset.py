@@ -75,6 +75,9 @@ class FastResetWrapper(gym.Wrapper):
             self._info_prev_reset = self.env.prev_info
             return obs
 
+    def step(self, action, repeat: int | None = None):
+        return self.env.step(action, repeat=repeat)
+
     def execute_cmd(self, *args, **kwargs):
         return self.env.execute_cmd(*args, **kwargs)
 
@@ -0,0 +1,133 @@
+"""
+Stack the last k observations of some keys (``rgb`` and optionally ``voxels``) along a new leading axis.
+
+Frames are kept in a preallocated ring buffer of length 2k where each frame is written twice,
+at slot ``i`` and ``i + k``. The last k frames are then always the contiguous slice ``[i + 1, i + 1 + k)``,
+so stacked observations are zero-copy views into the buffer, ordered from the oldest to the newest frame.
+Note that the returned views are overwritten by subsequent steps, so copy them if they need to be kept.
+"""
+
+from typing import Union, Dict
+
+import gym
+import numpy as np
+
+from ..sim import MineDojoSim
+from ...sim import spaces as spaces
+
+
+class _RingBuffer:
+    def __init__(self, k: int):
+        self._k = k
+        self._buffer = None
+        self._idx = 0
+
+    def fill(self, frame: np.ndarray):
+        frame = np.asarray(frame)
+        if (
+            self._buffer is None
+            or self._buffer.shape[1:] != frame.shape
+            or self._buffer.dtype != frame.dtype
+        ):
+            self._buffer = np.empty((2 * self._k,) + frame.shape, dtype=frame.dtype)
+        self._buffer[:] = frame
+        self._idx = self._k - 1
+        return self.view()
+
+    def push(self, frame: np.ndarray):
+        frame = np.asarray(frame)
+        if (
+            frame.dtype.kind == "U"
+            and frame.dtype.itemsize > self._buffer.dtype.itemsize
+        ):
+            # a longer string than seen so far, widen the buffer to hold it
+            self._buffer = self._buffer.astype(frame.dtype)
+        self._idx = (self._idx + 1) % self._k
+        self._buffer[self._idx] = frame
+        self._buffer[self._idx + self._k] = frame
+        return self.view()
+
+    def view(self):
+        return self._buffer[self._idx + 1 : self._idx + 1 + self._k]
+
+
+def _stack_space(space, k: int):
+    if isinstance(space, spaces.Dict):
+        return spaces.Dict(
+            {key: _stack_space(subspace, k) for key, subspace in space.spaces.items()}
+        )
+    elif isinstance(space, spaces.Text):
+        return spaces.Text(shape=(k,) + tuple(space.shape))
+    elif isinstance(space, spaces.Box):
+        return spaces.Box(
+            low=np.repeat(space.low[None], k, axis=0),
+            high=np.repeat(space.high[None], k, axis=0),
+            dtype=space.dtype,
+        )
+    else:
+        raise ValueError(f"Frame stacking is not supported for space {space}")
+
+
+class FrameStackWrapper(gym.Wrapper):
+    def __init__(
+        self,
+        env: Union[MineDojoSim, gym.Wrapper],
+        k: int = 4,
+        stack_voxels: bool = False,
+    ):
+        assert k >= 1, f"k must be a positive integer, got {k}"
+        assert (
+            "rgb" in env.observation_space.keys()
+        ), "FrameStackWrapper requires `rgb` observations"
+        keys = ["rgb"]
+        if stack_voxels:
+            assert (
+                "voxels" in env.observation_space.keys()
+            ), "please set `use_voxel=True` to stack voxels"
+            keys.append("voxels")
+        super().__init__(env=env)
+        self.observation_space = spaces.Dict(
+            {
+                key: _stack_space(space, k) if key in keys else space
+                for key, space in env.observation_space.spaces.items()
+            }
+        )
+        self._k = k
+        self._keys = keys
+        self._buffers: Dict[str, Union[_RingBuffer, Dict[str, _RingBuffer]]] = {}
+
+    def reset(self, **kwargs):
+        observation = self.env.reset(**kwargs)
+        # fill all slots with the first frame, also after fast resets since the history belongs to the previous episode
+        for key in self._keys:
+            if key in self._buffers:
+                continue
+            if isinstance(observation[key], dict):
+                self._buffers[key] = {
+                    field: _RingBuffer(self._k) for field in observation[key]
+                }
+            else:
+                self._buffers[key] = _RingBuffer(self._k)
+        return self._stack(observation, reset=True)
+
+    def step(self, action):
+        observation, reward, done, info = self.env.step(action)
+        return self._stack(observation, reset=False), reward, done, info
+
+    def _stack(self, observation: dict, reset: bool):
+        observation = dict(observation)
+        for key in self._keys:
+            buffer = self._buffers[key]
+            if isinstance(buffer, dict):
+                observation[key] = {
+                    field: (
+                        buffer[field].fill(value)
+                        if reset
+                        else buffer[field].push(value)
+                    )
+                    for field, value in observation[key].items()
+                }
+            else:
+                value = observation[key]
+                observation[key] = buffer.fill(value) if reset else buffer.push(value)
+        return observation
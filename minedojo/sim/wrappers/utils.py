@@ -1,26 +1,40 @@
+from typing import Any, Literal
+
+import gym
 import numpy as np
 
 from ...sim.mc_meta import mc as MC
+from ...sim.mc_meta.item_registry import ITEM_REGISTRY
+from ...sim.spaces import compile_contains
+
+
+__all__ = [
+    "get_recipes_matrix",
+    "get_inventory_vector",
+    "get_inventory_vectors",
+    "get_item_indices",
+    "SparseRecipes",
+    "ActionValidator",
+]
 
 
-__all__ = ["get_recipes_matrix", "get_inventory_vector"]
+def _get_recipes(item: str) -> list:
+    if (
+        item
+        in MC.ALL_HAND_CRAFT_ITEMS_NN_ACTIONS + MC.ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS
+    ):
+        return MC.CRAFTING_RECIPES_BY_OUTPUT[item]
+    return MC.SMELTING_RECIPES_BY_OUTPUT[item]
 
 
 def get_recipes_matrix():
     recipes = []
     for item in MC.ALL_CRAFT_SMELT_ITEMS:
-        ingredients = (
-            MC.CRAFTING_RECIPES_BY_OUTPUT[item]
-            if item
-            in MC.ALL_HAND_CRAFT_ITEMS_NN_ACTIONS
-            + MC.ALL_TABLE_CRAFT_ONLY_ITEMS_NN_ACTIONS
-            else MC.SMELTING_RECIPES_BY_OUTPUT[item]
-        )
         # take the first recipe if multiple recipes
-        ingredients = ingredients[0]["ingredients"]
+        ingredients = _get_recipes(item)[0]["ingredients"]
         recipe_vector = np.zeros(len(MC.ALL_ITEMS))
         for k, v in ingredients.items():
-            recipe_vector[MC.ALL_ITEMS.index(k)] += v
+            recipe_vector[ITEM_REGISTRY.id_of(k)] += v
         recipes.append(recipe_vector)
     recipes = np.stack(recipes, axis=0)
     assert recipes.shape == (
@@ -30,11 +44,116 @@ def get_recipes_matrix():
     return recipes
 
 
+class SparseRecipes:
+    """
+    Recipes of ``MC.ALL_CRAFT_SMELT_ITEMS`` stored as flat arrays of (ingredient index, quantity),
+    so that checking which items are craftable only touches the ingredients instead of a dense
+    (craftable items x all items) matrix.
+
+    Args:
+        all_alternatives: If ``True``, an item is craftable if any of its recipes is satisfied.
+                Otherwise only the first recipe of each item is considered, as in ``get_recipes_matrix``.
+    """
+
+    def __init__(self, all_alternatives: bool = False):
+        ingredients, quantities, recipe_starts, item_starts = [], [], [], []
+        for item in MC.ALL_CRAFT_SMELT_ITEMS:
+            recipes = _get_recipes(item)
+            if not all_alternatives:
+                recipes = recipes[:1]
+            item_starts.append(len(recipe_starts))
+            for recipe in recipes:
+                recipe_starts.append(len(ingredients))
+                for k, v in recipe["ingredients"].items():
+                    ingredients.append(ITEM_REGISTRY.id_of(k))
+                    quantities.append(v)
+        self._ingredients = np.array(ingredients)
+        self._quantities = np.array(quantities)
+        self._recipe_starts = np.array(recipe_starts)
+        self._item_starts = np.array(item_starts)
+
+    def craftable(self, inventory_vectors: np.ndarray) -> np.ndarray:
+        """
+        Maps inventory vectors of shape ``(B, len(MC.ALL_ITEMS))`` to boolean masks of shape
+        ``(B, len(MC.ALL_CRAFT_SMELT_ITEMS))`` of items whose ingredients are all in the inventory.
+        """
+        enough = inventory_vectors[:, self._ingredients] >= self._quantities
+        # a recipe is satisfied if all of its ingredients are, an item if any of its recipes is
+        satisfied = np.logical_and.reduceat(enough, self._recipe_starts, axis=1)
+        return np.logical_or.reduceat(satisfied, self._item_starts, axis=1)
+
+
+def get_item_indices(names: np.ndarray) -> np.ndarray:
+    """
+    Maps an array of item names, with spaces or underscores, to their indices in ``MC.ALL_ITEMS``.
+    Ids from ``numeric_obs`` already are such indices and are returned as is.
+    """
+    return ITEM_REGISTRY.ids_of(names)
+
+
+def get_inventory_vectors(names: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+    """
+    Sums the quantities of each item over inventory slots.
+    Maps names and quantities of shape ``(B, n_slots)`` to vectors of shape ``(B, len(MC.ALL_ITEMS))``.
+    """
+    indices = get_item_indices(names)
+    n_items = len(MC.ALL_ITEMS)
+    offsets = np.arange(len(indices))[:, np.newaxis] * n_items
+    return np.bincount(
+        (indices + offsets).reshape(-1),
+        weights=np.asarray(quantities).reshape(-1),
+        minlength=len(indices) * n_items,
+    ).reshape(len(indices), n_items)
+
+
 def get_inventory_vector(inventory):
-    vec = np.zeros(len(MC.ALL_ITEMS))
-    items, quantities = inventory["name"], inventory["quantity"]
-    for item, quantity in zip(items, quantities):
-        if " " in item:
-            item = item.replace(" ", "_")
-        vec[MC.ALL_ITEMS.index(item)] += quantity
-    return vec[np.newaxis, ...]
+    return get_inventory_vectors(
+        np.asarray(inventory["name"])[np.newaxis],
+        np.asarray(inventory["quantity"])[np.newaxis],
+    )
+
+
+class ActionValidator:
+    """
+    Checks that actions are members of a space, following a validation policy.
+
+    Args:
+        space: The space actions should belong to.
+        policy: ``"full"`` checks every action, ``"sampled"`` checks one in every ``sample_interval`` actions,
+                and ``"off"`` never checks.
+        sample_interval: Interval between checked actions if ``policy`` is ``"sampled"``.
+    """
+
+    def __init__(
+        self,
+        space: gym.Space,
+        policy: Literal["full", "sampled", "off"] = "full",
+        sample_interval: int = 100,
+    ):
+        assert policy in {
+            "full",
+            "sampled",
+            "off",
+        }, f"Unknown validation policy {policy}"
+        assert (
+            sample_interval >= 1
+        ), f"sample_interval must be a positive integer, got {sample_interval}"
+        self._policy = policy
+        self._sample_interval = sample_interval
+        self._n_calls = 0
+        self._contains = compile_contains(space) if policy != "off" else None
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    def __call__(self, x: Any) -> bool:
+        """Returns ``False`` only if ``x`` is checked and is not in the space."""
+        if self._policy == "off":
+            return True
+        if self._policy == "sampled":
+            self._n_calls += 1
+            # the first action is always checked
+            if (self._n_calls - 1) % self._sample_interval != 0:
+                return True
+        return self._contains(x)
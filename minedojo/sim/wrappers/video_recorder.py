@@ -0,0 +1,162 @@
+"""
+Record episodes to MP4 files without blocking ``step``.
+
+Frames are copied and handed to a background thread through a bounded queue, and the thread does the
+color conversion and encoding with ``cv2.VideoWriter``. When the queue is full, frames are either dropped
+(``drop_frames=True``, the default, so that ``step`` never waits on the encoder) or ``step`` blocks until
+the encoder catches up.
+"""
+
+import os
+import queue
+import logging
+import threading
+from typing import Union
+
+import gym
+import numpy as np
+
+from ..sim import MineDojoSim
+
+logger = logging.getLogger(__name__)
+
+_OPEN, _FRAME, _CLOSE, _STOP = range(4)
+
+
+class VideoRecorderWrapper(gym.Wrapper):
+    def __init__(
+        self,
+        env: Union[MineDojoSim, gym.Wrapper],
+        save_dir: str,
+        fps: int = 20,
+        every_n_episodes: int = 1,
+        queue_size: int = 256,
+        drop_frames: bool = True,
+        use_full_frame: bool = True,
+        name_prefix: str = "episode",
+    ):
+        """
+        Args:
+            env: The environment to record.
+            save_dir: Directory to write the videos to.
+            fps: Frame rate of the written videos.
+            every_n_episodes: Only record one episode in every ``every_n_episodes`` episodes.
+            queue_size: Maximum number of frames waiting to be encoded.
+            drop_frames: If ``True``, drop frames when the queue is full. Otherwise block until there is space.
+            use_full_frame: If ``True`` and the env preprocesses ``rgb``, record the full-resolution frame instead.
+            name_prefix: Prefix of the video file names.
+
+        The layout of ``rgb`` is read from ``rgb_channels_last`` of the simulator, ``(C, H, W)`` if not available.
+        If ``rgb`` is stacked by ``FrameStackWrapper``, only the newest frame of each stack is recorded.
+        """
+        assert every_n_episodes >= 1
+        assert (
+            "rgb" in env.observation_space.keys()
+        ), "VideoRecorderWrapper requires `rgb` observations"
+        super().__init__(env=env)
+        # the rgb space has a leading stack axis if frames are stacked
+        self._stacked = len(env.observation_space["rgb"].shape) == 4
+        self._channels_last = getattr(env, "rgb_channels_last", False)
+        os.makedirs(save_dir, exist_ok=True)
+        self._save_dir = save_dir
+        self._fps = fps
+        self._every_n_episodes = every_n_episodes
+        self._drop_frames = drop_frames
+        self._use_full_frame = use_full_frame
+        self._name_prefix = name_prefix
+
+        self._episode_idx = -1
+        self._recording = False
+        self._n_dropped_frames = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._encoder = threading.Thread(target=self._encode_loop, daemon=True)
+        self._encoder.start()
+
+    @property
+    def n_dropped_frames(self) -> int:
+        return self._n_dropped_frames
+
+    def reset(self, **kwargs):
+        observation = self.env.reset(**kwargs)
+        if self._recording:
+            self._queue.put((_CLOSE, None))
+        self._episode_idx += 1
+        self._recording = self._episode_idx % self._every_n_episodes == 0
+        if self._recording:
+            path = os.path.join(
+                self._save_dir, f"{self._name_prefix}_{self._episode_idx}.mp4"
+            )
+            self._queue.put((_OPEN, path))
+            self._record(observation)
+        return observation
+
+    def step(self, action):
+        observation, reward, done, info = self.env.step(action)
+        if self._recording:
+            self._record(observation)
+            if done:
+                self._queue.put((_CLOSE, None))
+                self._recording = False
+        return observation, reward, done, info
+
+    def close(self):
+        if self._encoder.is_alive():
+            if self._recording:
+                self._queue.put((_CLOSE, None))
+                self._recording = False
+            self._queue.put((_STOP, None))
+            self._encoder.join()
+        return self.env.close()
+
+    def _record(self, observation):
+        frame = getattr(self.env, "full_frame", None) if self._use_full_frame else None
+        if frame is None:
+            frame = observation["rgb"]
+            if self._stacked:
+                frame = frame[-1]
+            if not self._channels_last:
+                frame = frame.transpose((1, 2, 0))
+        # buffers may be reused by the env, so the queue must own its copy
+        item = (_FRAME, np.array(frame, dtype=np.uint8, copy=True))
+        if self._drop_frames:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self._n_dropped_frames += 1
+        else:
+            self._queue.put(item)
+
+    def _encode_loop(self):
+        # imported here since only recording needs the encoder
+        import cv2
+
+        writer, path = None, None
+        while True:
+            cmd, payload = self._queue.get()
+            if cmd == _OPEN:
+                path = payload
+            elif cmd == _FRAME:
+                if path is None:
+                    continue
+                if payload.shape[-1] == 1:
+                    frame = cv2.cvtColor(payload, cv2.COLOR_GRAY2BGR)
+                else:
+                    frame = cv2.cvtColor(payload[..., :3], cv2.COLOR_RGB2BGR)
+                if writer is None:
+                    height, width = frame.shape[:2]
+                    writer = cv2.VideoWriter(
+                        path,
+                        cv2.VideoWriter_fourcc(*"mp4v"),
+                        self._fps,
+                        (width, height),
+                    )
+                    if not writer.isOpened():
+                        logger.error(f"Failed to open video writer for {path}")
+                writer.write(frame)
+            elif cmd in {_CLOSE, _STOP}:
+                if writer is not None:
+                    writer.release()
+                    logger.info(f"Saved video to {path}")
+                writer, path = None, None
+                if cmd == _STOP:
+                    return
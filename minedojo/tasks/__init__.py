@@ -1,11 +1,9 @@
 from __future__ import annotations
-import re
 import sys
 import importlib_resources
-from itertools import product
-from omegaconf import OmegaConf
 
 from .meta.base import MetaTaskBase
+from .task_registry import TaskRegistry, product_dict
 from ..sim import MineDojoSim, InventoryItem
 from ..sim.wrappers import FastResetWrapper, ARNNWrapper
 from .meta import (
@@ -80,10 +78,6 @@ def _meta_task_make(meta_task: str, *args, **kwargs) -> MetaTaskBase | FastReset
     return MetaTaskName2Class[meta_task](*args, **kwargs)
 
 
-_ALL_TASKS_SPECS_UNFILLED = OmegaConf.load(_resource_file_path("tasks_specs.yaml"))
-# check no duplicates
-assert len(set(_ALL_TASKS_SPECS_UNFILLED.keys())) == len(_ALL_TASKS_SPECS_UNFILLED)
-
 # all possible variables used to fill specs
 _ALL_VARS = {
     # Combat
@@ -366,109 +360,76 @@ _ALL_VARS = {
 }
 
 
-def product_dict(**kwargs):
-    keys = kwargs.keys()
-    vals = kwargs.values()
-    for instance in product(*vals):
-        yield dict(zip(keys, instance))
-
-
-ALL_TASKS_SPECS = {}
-for task_id, task_specs in _ALL_TASKS_SPECS_UNFILLED.items():
-    unfilled_vars = re.findall(r"\{(.*?)\}", task_id)
-
-    def _recursive_find_unfilled_vars(x):
-        if OmegaConf.is_dict(x):
-            return {k: _recursive_find_unfilled_vars(v) for k, v in x.items()}
-        elif isinstance(x, str):
-            unfilled_vars.extend(re.findall(r"\{(.*?)\}", x))
-        return x
-
-    _recursive_find_unfilled_vars(task_specs)
-
-    # deduplicate unfilled vars
-    unfilled_vars = list(set(unfilled_vars))
-    if len(unfilled_vars) == 0:
-        # no unfilled vars, just make the task
-        ALL_TASKS_SPECS[task_id] = task_specs
-    else:
-        unfilled_vars_values = {var: _ALL_VARS[var] for var in unfilled_vars}
-        for var_dict in product_dict(**unfilled_vars_values):
-            filled_task_id = task_id.format(**var_dict)
-
-            def _recursive_replace_var(x):
-                if OmegaConf.is_dict(x):
-                    return {k: _recursive_replace_var(v) for k, v in x.items()}
-                elif isinstance(x, str):
-                    return x.format(**var_dict)
-                return x
-
-            task_specs_filled = _recursive_replace_var(task_specs)
-
-            for k, v in task_specs_filled.items():
-                if k == "target_quantities":
-                    task_specs_filled[k] = int(v)
-            task_specs_filled["prompt"] = task_specs_filled["prompt"].replace("_", " ")
-            task_specs_filled["prompt"] = task_specs_filled["prompt"].replace(" 1", "")
-
-            ALL_TASKS_SPECS[filled_task_id] = task_specs_filled
+_TASK_REGISTRY = TaskRegistry(
+    file_paths={
+        fname: _resource_file_path(fname)
+        for fname in [
+            "tasks_specs.yaml",
+            "programmatic_tasks.yaml",
+            "creative_tasks.yaml",
+            "playthrough_task.yaml",
+        ]
+    },
+    all_vars=_ALL_VARS,
+)
 
-# check no duplicates
-assert len(set(ALL_TASKS_SPECS.keys())) == len(ALL_TASKS_SPECS)
 
-# load prompts and guidance for programmatic tasks
-P_TASKS_PROMPTS_GUIDANCE = OmegaConf.load(
-    _resource_file_path("programmatic_tasks.yaml")
-)
-# check no duplicates
-assert len(set(P_TASKS_PROMPTS_GUIDANCE.keys())) == len(P_TASKS_PROMPTS_GUIDANCE)
+def _instructions(prompts_guidance: dict[str, dict]) -> dict[str, tuple[str, str]]:
+    return {
+        task_id: (info["prompt"], info["guidance"])
+        for task_id, info in prompts_guidance.items()
+    }
 
-# load prompts and guidance for creative tasks
-C_TASKS_PROMPTS_GUIDANCE = OmegaConf.load(_resource_file_path("creative_tasks.yaml"))
-# check no duplicates
-assert len(set(C_TASKS_PROMPTS_GUIDANCE.keys())) == len(C_TASKS_PROMPTS_GUIDANCE)
 
-# load prompt and guidance for Playthrough task
-PLAYTHROUGH_PROMPT_GUIDANCE = OmegaConf.load(
-    _resource_file_path("playthrough_task.yaml")
-)
-# check only one playthrough task
-assert len(PLAYTHROUGH_PROMPT_GUIDANCE.keys()) == 1
-
-ALL_PROGRAMMATIC_TASK_IDS = list(P_TASKS_PROMPTS_GUIDANCE.keys())
-ALL_PROGRAMMATIC_TASK_INSTRUCTIONS = {
-    task_id: (
-        P_TASKS_PROMPTS_GUIDANCE[task_id]["prompt"],
-        P_TASKS_PROMPTS_GUIDANCE[task_id]["guidance"],
+def _all_task_ids() -> list[str]:
+    n_programmatic = len(_TASK_REGISTRY.programmatic_tasks)
+    n_creative = len(_TASK_REGISTRY.creative_tasks)
+    _logger.info(
+        f"Loaded {n_programmatic} Programmatic tasks, "
+        f"{n_creative} Creative tasks, "
+        """and 1 special task: "Playthrough". """
+        f"Totally {n_programmatic + n_creative + 1} tasks loaded."
     )
-    for task_id in ALL_PROGRAMMATIC_TASK_IDS
-}
-ALL_CREATIVE_TASK_IDS = list(C_TASKS_PROMPTS_GUIDANCE.keys())
-ALL_CREATIVE_TASK_INSTRUCTIONS = {
-    task_id: (
-        C_TASKS_PROMPTS_GUIDANCE[task_id]["prompt"],
-        C_TASKS_PROMPTS_GUIDANCE[task_id]["guidance"],
+    return (
+        list(_TASK_REGISTRY.programmatic_tasks.keys())
+        + list(_TASK_REGISTRY.creative_tasks.keys())
+        + [_TASK_REGISTRY.playthrough_task_id]
     )
-    for task_id in ALL_CREATIVE_TASK_IDS
-}
-PLAYTHROUGH_TASK_ID = list(PLAYTHROUGH_PROMPT_GUIDANCE.keys())[0]
-PLAYTHROUGH_TASK_INSTRUCTION = (
-    PLAYTHROUGH_PROMPT_GUIDANCE[PLAYTHROUGH_TASK_ID]["prompt"],
-    PLAYTHROUGH_PROMPT_GUIDANCE[PLAYTHROUGH_TASK_ID]["guidance"],
-)
-ALL_TASK_IDS = ALL_PROGRAMMATIC_TASK_IDS + ALL_CREATIVE_TASK_IDS + [PLAYTHROUGH_TASK_ID]
-ALL_TASK_INSTRUCTIONS = {
-    **ALL_PROGRAMMATIC_TASK_INSTRUCTIONS,
-    **ALL_CREATIVE_TASK_INSTRUCTIONS,
-    PLAYTHROUGH_TASK_ID: PLAYTHROUGH_TASK_INSTRUCTION,
+
+
+# task lists and instructions are only loaded on first access, see `__getattr__`
+_LAZY_ATTRS = {
+    "ALL_TASKS_SPECS": lambda: _TASK_REGISTRY.all_specs(),
+    "P_TASKS_PROMPTS_GUIDANCE": lambda: _TASK_REGISTRY.programmatic_tasks,
+    "C_TASKS_PROMPTS_GUIDANCE": lambda: _TASK_REGISTRY.creative_tasks,
+    "PLAYTHROUGH_PROMPT_GUIDANCE": lambda: _TASK_REGISTRY.playthrough_task,
+    "ALL_PROGRAMMATIC_TASK_IDS": lambda: list(_TASK_REGISTRY.programmatic_tasks.keys()),
+    "ALL_PROGRAMMATIC_TASK_INSTRUCTIONS": lambda: _instructions(
+        _TASK_REGISTRY.programmatic_tasks
+    ),
+    "ALL_CREATIVE_TASK_IDS": lambda: list(_TASK_REGISTRY.creative_tasks.keys()),
+    "ALL_CREATIVE_TASK_INSTRUCTIONS": lambda: _instructions(
+        _TASK_REGISTRY.creative_tasks
+    ),
+    "PLAYTHROUGH_TASK_ID": lambda: _TASK_REGISTRY.playthrough_task_id,
+    "PLAYTHROUGH_TASK_INSTRUCTION": lambda: _instructions(
+        _TASK_REGISTRY.playthrough_task
+    )[_TASK_REGISTRY.playthrough_task_id],
+    "ALL_TASK_IDS": _all_task_ids,
+    "ALL_TASK_INSTRUCTIONS": lambda: {
+        **_instructions(_TASK_REGISTRY.programmatic_tasks),
+        **_instructions(_TASK_REGISTRY.creative_tasks),
+        **_instructions(_TASK_REGISTRY.playthrough_task),
+    },
 }
 
-_logger.info(
-    f"Loaded {len(P_TASKS_PROMPTS_GUIDANCE)} Programmatic tasks, "
-    f"{len(C_TASKS_PROMPTS_GUIDANCE)} Creative tasks, "
-    """and 1 special task: "Playthrough". """
-    f"Totally {len(P_TASKS_PROMPTS_GUIDANCE) + len(C_TASKS_PROMPTS_GUIDANCE) + 1} tasks loaded."
-)
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = _LAZY_ATTRS[name]()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _parse_inventory_dict(inv_dict: dict[str, dict]) -> list[InventoryItem]:
@@ -476,8 +437,7 @@ def _parse_inventory_dict(inv_dict: dict[str, dict]) -> list[InventoryItem]:
 
 
 def _specific_task_make(task_id: str, *args, **kwargs):
-    assert task_id in ALL_TASKS_SPECS, f"Invalid task id provided {task_id}"
-    task_specs = ALL_TASKS_SPECS[task_id].copy()
+    task_specs = _TASK_REGISTRY.specs(task_id)
 
     # handle list of inventory items
     if "initial_inventory" in task_specs:
@@ -505,20 +465,20 @@ def make(task_id: str, *args, cam_interval: int | float = 15, **kwargs):
     """
     if task_id.startswith("creative:"):
         creative_idx = int(task_id.split(":")[1])
-        assert len(C_TASKS_PROMPTS_GUIDANCE) > creative_idx >= 0
-        info = C_TASKS_PROMPTS_GUIDANCE[task_id]
+        assert len(_TASK_REGISTRY.creative_tasks) > creative_idx >= 0
+        info = _TASK_REGISTRY.creative_tasks[task_id]
         env_obj = _meta_task_make("creative", *args, **kwargs)
         env_obj.specify_prompt(info["prompt"])
         env_obj.specify_guidance(info["guidance"])
         env_obj.collection = info["collection"]
         env_obj.source = info["source"]
-    elif task_id in P_TASKS_PROMPTS_GUIDANCE:
-        info = P_TASKS_PROMPTS_GUIDANCE[task_id]
+    elif task_id in _TASK_REGISTRY.programmatic_tasks:
+        info = _TASK_REGISTRY.programmatic_tasks[task_id]
         env_obj = _specific_task_make(task_id, *args, **kwargs)
         env_obj.specify_prompt(info["prompt"])
         env_obj.specify_guidance(info["guidance"])
-    elif task_id.lower() == PLAYTHROUGH_TASK_ID.lower():
-        info = PLAYTHROUGH_PROMPT_GUIDANCE[PLAYTHROUGH_TASK_ID]
+    elif task_id.lower() == _TASK_REGISTRY.playthrough_task_id.lower():
+        info = _TASK_REGISTRY.playthrough_task[_TASK_REGISTRY.playthrough_task_id]
         env_obj = _specific_task_make(task_id, *args, **kwargs)
         env_obj.specify_prompt(info["prompt"])
         env_obj.specify_guidance(info["guidance"])
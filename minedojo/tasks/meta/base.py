@@ -13,6 +13,11 @@ from .utils import (
     reward_fn_base,
     extra_spawn_condition_base,
     always_satisfy_condition,
+    InfoVectorizer,
+    VectorizedTerm,
+    VectorizedRewardFn,
+    VectorizedCheck,
+    fuse_terms,
 )
 
 
@@ -42,6 +47,10 @@ class MetaTaskBase(gym.Wrapper):
 
         reward_fns: The reward functions of the task.
         success_criteria: The success criteria of the task.
+            Vectorized reward functions and success criteria, e.g., those in ``minedojo.tasks.meta.utils``,
+            are evaluated on the info values they declare, which are gathered from each info dict once per step.
+            Other callables are called on info dicts. The info dict of the previous step is only cloned
+            if other reward functions or extra spawn conditions may read it, otherwise only the declared values are kept.
     """
 
     _prompt_template: str
@@ -73,6 +82,56 @@ class MetaTaskBase(gym.Wrapper):
 
         self._success_criteria = success_criteria
         self._reward_fns = reward_fns
+        self._compile_reward_fns_and_success_criteria()
+        self._ini_info_vector = None
+        self._pre_info_vector = None
+        self._cur_info_vector = None
+
+    def _compile_reward_fns_and_success_criteria(self):
+        reward_fns = self._reward_fns or []
+        success_criteria = self._success_criteria or []
+        vectorized_reward_fns = fuse_terms(
+            [fn for fn in reward_fns if isinstance(fn, VectorizedRewardFn)]
+        )
+        vectorized_success_criteria = fuse_terms(
+            [fn for fn in success_criteria if isinstance(fn, VectorizedCheck)]
+        )
+        pre_info_readers = self._pre_info_readers()
+        vectorized_pre_info_readers = [
+            fn for fn in pre_info_readers if isinstance(fn, VectorizedTerm)
+        ]
+        # all values are gathered into one vector per step
+        self._info_vectorizer = InfoVectorizer(
+            key
+            for term in vectorized_reward_fns
+            + vectorized_success_criteria
+            + vectorized_pre_info_readers
+            for key in term.keys
+        )
+        self._vectorized_reward_fns = [
+            (fn, self._info_vectorizer.index_of(fn.keys))
+            for fn in vectorized_reward_fns
+        ]
+        self._vectorized_success_criteria = [
+            (fn, self._info_vectorizer.index_of(fn.keys))
+            for fn in vectorized_success_criteria
+        ]
+        self._other_reward_fns = [
+            fn for fn in reward_fns if not isinstance(fn, VectorizedRewardFn)
+        ]
+        self._other_success_criteria = [
+            fn for fn in success_criteria if not isinstance(fn, VectorizedCheck)
+        ]
+        self._copy_pre_info = len(self._other_reward_fns) > 0 or len(
+            vectorized_pre_info_readers
+        ) < len(pre_info_readers)
+
+    def _pre_info_readers(self) -> list:
+        """
+        Callables other than reward functions that read the info dict of the previous step, e.g., extra spawn conditions.
+        Values declared by vectorized ones are gathered every step, otherwise the info dict is cloned.
+        """
+        return []
 
     @property
     def is_successful(self):
@@ -90,16 +149,19 @@ class MetaTaskBase(gym.Wrapper):
         self._ini_info_dict = (
             self.env.info_prev_reset or info if self._fast_reset else info
         )
-        self._pre_info_dict = deepcopy(info)
+        self._pre_info_dict = deepcopy(info) if self._copy_pre_info else info
+        self._ini_info_vector = self._info_vectorizer(self._ini_info_dict)
+        self._pre_info_vector = self._info_vectorizer(info)
         self._elapsed_timesteps = 0
         self._is_successful = False
         return obs
 
-    def step(self, action):
+    def step(self, action, repeat: Optional[int] = None):
         """Run one timestep of the environment’s dynamics. Accepts an action and returns next_obs, reward, done, info.
 
         Args:
             action: The action of the agent in current step.
+            repeat: Number of game ticks to execute ``action`` for. If ``None``, uses ``frame_skip``.
 
         Return:
             A tuple (obs, reward, done, info)
@@ -108,8 +170,9 @@ class MetaTaskBase(gym.Wrapper):
             - ``bool`` - Whether the episode has ended.
             - ``dict`` - Contains auxiliary diagnostic information (helpful for debugging, and sometimes learning).
         """
-        obs, _, _, info = self.env.step(action)
+        obs, _, _, info = self.env.step(action, repeat=repeat)
         self._elapsed_timesteps += 1
+        self._cur_info_vector = self._info_vectorizer(info)
         reward = self._compute_reward_hook(
             ini_info=self._ini_info_dict,
             pre_info=self._pre_info_dict,
@@ -122,7 +185,9 @@ class MetaTaskBase(gym.Wrapper):
             elapsed_timesteps=self._elapsed_timesteps,
         )
         done = self.env.is_terminated or self._is_successful
-        self._pre_info_dict = deepcopy(info)
+        # vectorized terms only need the values kept in the info vector
+        self._pre_info_dict = deepcopy(info) if self._copy_pre_info else info
+        self._pre_info_vector = self._cur_info_vector
         return obs, reward, done, info
 
     def get_prompt(self, **kwargs) -> str:
@@ -164,7 +229,18 @@ class MetaTaskBase(gym.Wrapper):
         cur_info: Dict[str, Any],
         elapsed_timesteps: int,
     ) -> Union[int, float]:
+        # vectorized reward functions read the info vectors of the same steps
+        ini, pre, cur = (
+            self._ini_info_vector,
+            self._pre_info_vector,
+            self._cur_info_vector,
+        )
         return sum(
+            [
+                reward_fn.evaluate(ini[idx], pre[idx], cur[idx], elapsed_timesteps)
+                for reward_fn, idx in self._vectorized_reward_fns
+            ]
+        ) + sum(
             [
                 reward_fn(
                     ini_info_dict=ini_info,
@@ -172,21 +248,27 @@ class MetaTaskBase(gym.Wrapper):
                     cur_info_dict=cur_info,
                     elapsed_timesteps=elapsed_timesteps,
                 )
-                for reward_fn in self._reward_fns
+                for reward_fn in self._other_reward_fns
             ]
         )
 
     def _determine_success_hook(
         self, ini_info: Dict[str, Any], cur_info: Dict[str, Any], elapsed_timesteps: int
     ) -> bool:
+        ini, cur = self._ini_info_vector, self._cur_info_vector
         return any(
+            [
+                check_success.evaluate(ini[idx], cur[idx], elapsed_timesteps)
+                for check_success, idx in self._vectorized_success_criteria
+            ]
+        ) or any(
             [
                 check_success(
                     ini_info_dict=ini_info,
                     cur_info_dict=cur_info,
                     elapsed_timesteps=elapsed_timesteps,
                 )
-                for check_success in self._success_criteria
+                for check_success in self._other_success_criteria
             ]
         )
 
@@ -248,6 +330,7 @@ class ExtraSpawnMetaTaskBase(MetaTaskBase):
         base task class for meta tasks that require extra spawn, e.g., harvest, combat, and techtree
         """
         self._extra_spawn_rate = None
+        self._extra_spawn_rates_and_conditions = {}
         if extra_spawn_rate is not None:
             assert all(
                 [1.0 >= rate >= 0.0 for rate in extra_spawn_rate.values()]
@@ -305,6 +388,13 @@ class ExtraSpawnMetaTaskBase(MetaTaskBase):
             reward_fns=reward_fns,
             **kwargs,
         )
+        # the spawn conditions' values are gathered with those of the reward functions and success criteria
+        self._extra_spawn_condition_indices = {
+            k: self._info_vectorizer.index_of(condition.keys)
+            if isinstance(condition, VectorizedTerm)
+            else None
+            for k, (_, condition) in self._extra_spawn_rates_and_conditions.items()
+        }
 
         initial_mobs = initial_mobs or []
         if isinstance(initial_mobs, str):
@@ -327,24 +417,44 @@ class ExtraSpawnMetaTaskBase(MetaTaskBase):
                 low=low, high=high, seed=kwargs["seed"]
             )
 
-    def step(self, action):
+    def step(self, action, repeat: Optional[int] = None):
         if self._extra_spawn_rate is None:
-            return super().step(action=action)
+            return super().step(action=action, repeat=repeat)
         else:
             rel_positions = self._extra_spawn_range_space.sample()
             for (name, (rate, condition)), pos in zip(
                 self._extra_spawn_rates_and_conditions.items(), rel_positions
             ):
-                if self._rng.random() <= rate and condition(
-                    ini_info_dict=self._ini_info_dict,
-                    pre_info_dict=self._pre_info_dict,
-                    elapsed_timesteps=self._elapsed_timesteps,
+                if self._rng.random() <= rate and self._check_extra_spawn_condition(
+                    name, condition
                 ):
                     if name in self.by_summon:
                         obs, _, _, info = self.env.spawn_mobs(name, pos)
                     elif name in self.by_setblock:
                         obs, _, _, info = self.env.set_block(name, pos)
-            return super().step(action=action)
+            return super().step(action=action, repeat=repeat)
+
+    def _pre_info_readers(self) -> list:
+        return [
+            condition
+            for _, condition in self._extra_spawn_rates_and_conditions.values()
+        ]
+
+    def _check_extra_spawn_condition(
+        self, name: str, condition: extra_spawn_condition_base
+    ) -> bool:
+        idx = self._extra_spawn_condition_indices[name]
+        if idx is None:
+            return condition(
+                ini_info_dict=self._ini_info_dict,
+                pre_info_dict=self._pre_info_dict,
+                elapsed_timesteps=self._elapsed_timesteps,
+            )
+        return condition.evaluate(
+            self._ini_info_vector[idx],
+            self._pre_info_vector[idx],
+            self._elapsed_timesteps,
+        )
 
     def _after_sim_reset_hook(
         self, reset_obs: Dict[str, Any], reset_info: Dict[str, Any]
@@ -1,4 +1,4 @@
-from typing import List, Optional, Union, Tuple, Dict
+from typing import List, Optional, Union, Tuple, Dict, Any
 
 from .base import ExtraSpawnMetaTaskBase
 from ...sim.inventory import InventoryItem
@@ -23,6 +23,9 @@ class CombatMeta(ExtraSpawnMetaTaskBase):
         break_speed_multiplier: Controls the speed of breaking blocks. A value larger than 1.0 accelerates the breaking.
                 Default: ``1.0``.
 
+        compact_obs: If ``True``, observations use the narrowest dtypes their ranges allow. See ``MineDojoSim`` for details.
+                Default: ``False``.
+
         drawing_str: Draws shapes (e.g. spheres, cuboids) in the minecraft world.
                 Default: ``None``.
 
@@ -46,6 +49,12 @@ class CombatMeta(ExtraSpawnMetaTaskBase):
                 3. Statistics/achievements will not be reset. This wrapper will maintain a property ``info_prev_reset``.
                 If your tasks use stat/achievements to evaluation, please retrieve this property and compute differences.
 
+        frame_skip: Number of game ticks each call of ``step`` advances. See ``MineDojoSim`` for details.
+                Default: ``1``.
+
+        image_preprocessing: If not ``None``, preprocesses ``rgb`` observations. See ``MineDojoSim`` for details.
+                Default: ``None``.
+
         image_size: The size of image observations.
 
         initial_inventory: If not ``None``, specifies initial items in the agent's inventory.
@@ -70,6 +79,12 @@ class CombatMeta(ExtraSpawnMetaTaskBase):
                 Pitch and yaw are in radians and relative to agent looking vector.
                 Default: ``None``.
 
+        ms_per_tick: Length of a game tick in milliseconds. See ``MineDojoSim`` for details.
+                Default: ``50``.
+
+        numeric_obs: If ``True``, text observations are replaced by ``int16`` ids. See ``MineDojoSim`` for details.
+                Default: ``False``.
+
         reward_weights: The reward weight for each target in the task.
                 Default: ``1.0``.
 
@@ -106,6 +121,9 @@ class CombatMeta(ExtraSpawnMetaTaskBase):
         use_lidar: If ``True``, includes lidar in observations.
                 Default: ``False``.
 
+        use_rgb: If ``False``, the mission does not render video. See ``MineDojoSim`` for details.
+                Default: ``True``.
+
         use_voxel: If ``True``, includes voxel in observations.
                 Default: ``False``.
 
@@ -159,12 +177,18 @@ class CombatMeta(ExtraSpawnMetaTaskBase):
         fast_reset_random_teleport_range: Optional[int] = None,
         # ------ obs ------
         image_size: Union[int, Tuple[int, int]],
+        image_preprocessing: Optional[Dict[str, Any]] = None,
+        use_rgb: bool = True,
         use_voxel: bool = False,
         voxel_size: Optional[Dict[str, int]] = None,
         use_lidar: bool = False,
         lidar_rays: Optional[List[Tuple[float, float, float]]] = None,
+        numeric_obs: bool = False,
+        compact_obs: bool = False,
         # ------ event-level action or keyboard-mouse level action ------
         event_level_control: bool = True,
+        frame_skip: int = 1,
+        ms_per_tick: int = 50,
         # ------ misc ------
         sim_name: str = "CombatMeta",
     ):
@@ -235,11 +259,17 @@ class CombatMeta(ExtraSpawnMetaTaskBase):
             seed=seed,
             sim_name=sim_name,
             image_size=image_size,
+            image_preprocessing=image_preprocessing,
+            use_rgb=use_rgb,
             use_voxel=use_voxel,
             voxel_size=voxel_size,
             use_lidar=use_lidar,
             lidar_rays=lidar_rays,
+            numeric_obs=numeric_obs,
+            compact_obs=compact_obs,
             event_level_control=event_level_control,
+            frame_skip=frame_skip,
+            ms_per_tick=ms_per_tick,
             initial_inventory=initial_inventory,
             break_speed_multiplier=break_speed_multiplier,
             world_seed=world_seed,
@@ -1,3 +1,4 @@
+from .info_vectors import *
 from .success_criteria import *
 from .reward_fns import *
 from .extra_spawn_conditions import *
@@ -1,10 +1,15 @@
-from functools import partial
 from mypy_extensions import Arg
 from typing import Union, Callable
 
+import numpy as np
+
+from .info_vectors import InfoKey, VectorizedTerm
+
 
 __all__ = [
     "extra_spawn_condition_base",
+    "VectorizedCondition",
+    "ThresholdCondition",
     "always_satisfy_condition",
     "check_below_height_condition",
     "check_above_height_condition",
@@ -25,85 +30,91 @@ extra_spawn_condition_base = Callable[
 ]
 
 
-def always_satisfy_condition(
-    ini_info_dict: dict, pre_info_dict: dict, elapsed_timesteps: int
-) -> bool:
-    return True
+class VectorizedCondition(VectorizedTerm):
+    """
+    An extra spawn condition evaluated on vectors of the info values of its ``keys``
+    at the initial (t = 0) and previous (t - 1) steps.
+    """
+
+    def evaluate(
+        self, ini: np.ndarray, pre: np.ndarray, elapsed_timesteps: int
+    ) -> bool:
+        raise NotImplementedError
 
+    def __call__(
+        self, ini_info_dict: dict, pre_info_dict: dict, elapsed_timesteps: int
+    ) -> bool:
+        return self.evaluate(
+            self._vectorize(ini_info_dict),
+            self._vectorize(pre_info_dict),
+            elapsed_timesteps,
+        )
 
-def _check_below_height_condition(
-    height_threshold: Union[float, int],
-    ini_info_dict: dict,
-    pre_info_dict: dict,
-    elapsed_timesteps: int,
-):
+
+class ThresholdCondition(VectorizedCondition):
     """
-    Satisfy condition iff info["ypos"] <= height_threshold.
-    Note that in MC, y-axis is the vertical axis.
-    This is useful for extra diamond ore spawn (below y = 14)
+    Satisfy condition iff an info value is below (``<=``) or above (``>=``) ``threshold``.
     """
-    return pre_info_dict["ypos"] <= height_threshold
+
+    def __init__(self, key: InfoKey, threshold: Union[float, int], below: bool):
+        super().__init__([key])
+        self.threshold = threshold
+        self.below = below
+
+    def evaluate(self, ini, pre, elapsed_timesteps):
+        if self.below:
+            return bool(pre[0] <= self.threshold)
+        return bool(pre[0] >= self.threshold)
+
+
+class _AlwaysSatisfyCondition(VectorizedCondition):
+    def __init__(self):
+        super().__init__([])
+
+    def evaluate(self, ini, pre, elapsed_timesteps):
+        return True
+
+
+always_satisfy_condition = _AlwaysSatisfyCondition()
 
 
 def check_below_height_condition(
     height_threshold: Union[float, int]
 ) -> extra_spawn_condition_base:
-    return partial(_check_below_height_condition, height_threshold=height_threshold)
-
-
-def _check_above_height_condition(
-    height_threshold: Union[float, int],
-    ini_info_dict: dict,
-    pre_info_dict: dict,
-    elapsed_timesteps: int,
-):
     """
-    Satisfy condition iff info["ypos"] >= height_threshold.
+    Satisfy condition iff info["ypos"] <= height_threshold.
     Note that in MC, y-axis is the vertical axis.
-    This is useful for extra plants spawn (above sea level y >= 62)
+    This is useful for extra diamond ore spawn (below y = 14)
     """
-    return pre_info_dict["ypos"] >= height_threshold
+    return ThresholdCondition(key=("ypos",), threshold=height_threshold, below=True)
 
 
 def check_above_height_condition(
     height_threshold: Union[float, int]
 ) -> extra_spawn_condition_base:
-    return partial(_check_above_height_condition, height_threshold=height_threshold)
+    """
+    Satisfy condition iff info["ypos"] >= height_threshold.
+    Note that in MC, y-axis is the vertical axis.
+    This is useful for extra plants spawn (above sea level y >= 62)
+    """
+    return ThresholdCondition(key=("ypos",), threshold=height_threshold, below=False)
 
 
-def _check_below_light_level_condition(
-    light_level_threshold: Union[float, int],
-    ini_info_dict: dict,
-    pre_info_dict: dict,
-    elapsed_timesteps: int,
-):
+def check_below_light_level_condition(light_level_threshold: Union[float, int]):
     """
     Satisfy condition iff info["light_level"] <= light_level_threshold
     Userful for extra monsters spawn (only spawn in dark/night)
     """
-    return pre_info_dict["light_level"] <= light_level_threshold
-
-
-def check_below_light_level_condition(light_level_threshold: Union[float, int]):
-    return partial(
-        _check_below_light_level_condition, light_level_threshold=light_level_threshold
+    return ThresholdCondition(
+        key=("light_level",), threshold=light_level_threshold, below=True
     )
 
 
-def _check_above_light_level_condition(
-    light_level_threshold: Union[float, int],
-    ini_info_dict: dict,
-    pre_info_dict: dict,
-    elapsed_timesteps: int,
-):
+def check_above_light_level_condition(light_level_threshold: Union[float, int]):
     """
     Satisfy condition iff info["light_level"] >= light_level_threshold
     Userful for extra passive mobs spawn
     """
-    return pre_info_dict["light_level"] >= light_level_threshold
-
-
-def check_above_light_level_condition(light_level_threshold: Union[float, int]):
-    return partial(
-        _check_above_light_level_condition, light_level_threshold=light_level_threshold
+    return ThresholdCondition(
+        key=("light_level",), threshold=light_level_threshold, below=False
     )
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from typing import List, Tuple, Dict, Type, Iterable
+
+import numpy as np
+
+
+__all__ = [
+    "InfoKey",
+    "InfoVectorizer",
+    "VectorizedTerm",
+    "fuse_terms",
+]
+
+
+# a value read from an info dict, either ``("inventory", name)`` for the total quantity of items named ``name``
+# in ``info["inventory"]``, or a path of keys into the info dict, e.g., ``("stat", "kill_entity", "zombie")``
+InfoKey = Tuple[str, ...]
+
+
+class InfoVectorizer:
+    """
+    Gathers the values of ``keys`` from an info dict into a ``float64`` vector.
+    Item quantities of all inventory keys are counted in a single pass over ``info["inventory"]``.
+
+    Args:
+        keys: Keys of the values to gather, duplicates are ignored.
+    """
+
+    def __init__(self, keys: Iterable[InfoKey]):
+        self.keys = list(dict.fromkeys(tuple(key) for key in keys))
+        self._index = {key: i for i, key in enumerate(self.keys)}
+        self._inventory_index = {
+            key[1]: i for i, key in enumerate(self.keys) if key[0] == "inventory"
+        }
+        self._paths = [
+            (i, key) for i, key in enumerate(self.keys) if key[0] != "inventory"
+        ]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def index_of(self, keys: List[InfoKey]) -> np.ndarray:
+        """Indices of ``keys`` in the gathered vectors."""
+        return np.array([self._index[tuple(key)] for key in keys], dtype=np.int64)
+
+    def __call__(self, info: dict) -> np.ndarray:
+        values = [0] * len(self.keys)
+        if len(self._inventory_index) > 0:
+            inventory_index = self._inventory_index
+            for inv_item in info["inventory"]:
+                i = inventory_index.get(inv_item["name"], None)
+                if i is not None:
+                    values[i] += inv_item["quantity"]
+        for i, path in self._paths:
+            value = info
+            for k in path:
+                value = value[k]
+            values[i] = value
+        return np.array(values, dtype=np.float64)
+
+
+class VectorizedTerm:
+    """
+    Base class of reward functions and success criteria that are declared by the ``keys`` of the info values they read.
+    Tasks gather the values of all terms from each info dict once, and evaluate terms on their slices.
+    Terms are also callable on info dicts like other reward functions and success criteria.
+    """
+
+    def __init__(self, keys: List[InfoKey]):
+        self.keys = [tuple(key) for key in keys]
+        self._vectorizer = None
+
+    def _vectorize(self, info: dict) -> np.ndarray:
+        if self._vectorizer is None:
+            self._vectorizer = InfoVectorizer(self.keys)
+            self._vectorizer_index = self._vectorizer.index_of(self.keys)
+        return self._vectorizer(info)[self._vectorizer_index]
+
+    @classmethod
+    def fuse(cls, terms: List[VectorizedTerm]) -> List[VectorizedTerm]:
+        """
+        Fuses terms of this class into fewer terms evaluated at once.
+        The sum of rewards or ``any`` of success criteria must stay the same.
+        """
+        return terms
+
+
+def fuse_terms(terms: List[VectorizedTerm]) -> List[VectorizedTerm]:
+    """Fuses terms of the same class, in the order of their first occurrences."""
+    by_class: Dict[Type[VectorizedTerm], List[VectorizedTerm]] = {}
+    for term in terms:
+        by_class.setdefault(type(term), []).append(term)
+    return [
+        fused
+        for cls, same_class_terms in by_class.items()
+        for fused in (
+            cls.fuse(same_class_terms)
+            if len(same_class_terms) > 1
+            else same_class_terms
+        )
+    ]
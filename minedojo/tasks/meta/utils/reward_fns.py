@@ -1,10 +1,18 @@
-from functools import partial
 from mypy_extensions import Arg
-from typing import Union, Callable, Dict
+from typing import Union, Callable, Dict, List
+
+import numpy as np
+
+from .info_vectors import InfoKey, VectorizedTerm
 
 
 __all__ = [
     "reward_fn_base",
+    "VectorizedRewardFn",
+    "DeltaReward",
+    "IncrementThresholdReward",
+    "PeriodDeltaReward",
+    "ThresholdReward",
     "simple_inventory_based_reward",
     "simple_stat_kill_entity_based_reward",
     "possess_item_reward",
@@ -27,174 +35,170 @@ reward_fn_base = Callable[
 ]
 
 
-def _simple_stat_kill_entity_based_reward(
-    name: str,
-    weight: Union[int, float],
-    ini_info_dict: dict,
-    pre_info_dict: dict,
-    cur_info_dict: dict,
-    elapsed_timesteps: int,
-):
+class VectorizedRewardFn(VectorizedTerm):
     """
-    A simple reward based on increment in `info["stat"]["kill_entity"][{name}]`.
+    A reward function evaluated on vectors of the info values of its ``keys``
+    at the initial (t = 0), previous (t - 1) and current (t) steps.
     """
-    return weight * (
-        cur_info_dict["stat"]["kill_entity"][name]
-        - pre_info_dict["stat"]["kill_entity"][name]
-    )
+
+    def evaluate(
+        self,
+        ini: np.ndarray,
+        pre: np.ndarray,
+        cur: np.ndarray,
+        elapsed_timesteps: int,
+    ) -> float:
+        raise NotImplementedError
+
+    def __call__(
+        self,
+        ini_info_dict: dict,
+        pre_info_dict: dict,
+        cur_info_dict: dict,
+        elapsed_timesteps: int,
+    ) -> float:
+        return self.evaluate(
+            self._vectorize(ini_info_dict),
+            self._vectorize(pre_info_dict),
+            self._vectorize(cur_info_dict),
+            elapsed_timesteps,
+        )
+
+
+class DeltaReward(VectorizedRewardFn):
+    """
+    Weighted sum of the increments of info values since the previous step.
+    """
+
+    def __init__(self, keys: List[InfoKey], weights: List[Union[int, float]]):
+        assert len(keys) == len(weights)
+        super().__init__(keys)
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+    def evaluate(self, ini, pre, cur, elapsed_timesteps):
+        return float((self.weights * (cur - pre)).sum())
+
+    @classmethod
+    def fuse(cls, terms):
+        return [
+            cls(
+                keys=[key for term in terms for key in term.keys],
+                weights=np.concatenate([term.weights for term in terms]),
+            )
+        ]
+
+
+class IncrementThresholdReward(VectorizedRewardFn):
+    """
+    Weighted sum of whether the increments of info values since the initial step reach ``quantities``.
+    """
+
+    def __init__(
+        self,
+        keys: List[InfoKey],
+        quantities: List[Union[int, float]],
+        weights: List[Union[int, float]],
+    ):
+        assert len(keys) == len(quantities) == len(weights)
+        super().__init__(keys)
+        self.quantities = np.asarray(quantities, dtype=np.float64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+    def evaluate(self, ini, pre, cur, elapsed_timesteps):
+        return float((self.weights * ((cur - ini) >= self.quantities)).sum())
+
+    @classmethod
+    def fuse(cls, terms):
+        return [
+            cls(
+                keys=[key for term in terms for key in term.keys],
+                quantities=np.concatenate([term.quantities for term in terms]),
+                weights=np.concatenate([term.weights for term in terms]),
+            )
+        ]
+
+
+class PeriodDeltaReward(VectorizedRewardFn):
+    """
+    Weighted number of multiples of ``period`` that an info value passed since the previous step.
+    """
+
+    def __init__(self, key: InfoKey, period: int, weight: Union[int, float]):
+        super().__init__([key])
+        self.period = period
+        self.weight = weight
+
+    def evaluate(self, ini, pre, cur, elapsed_timesteps):
+        return float((cur[0] // self.period - pre[0] // self.period) * self.weight)
+
+
+class ThresholdReward(VectorizedRewardFn):
+    """
+    ``weight`` if an info value reaches ``threshold``, otherwise 0.
+    """
+
+    def __init__(
+        self, key: InfoKey, threshold: Union[int, float], weight: Union[int, float]
+    ):
+        super().__init__([key])
+        self.threshold = threshold
+        self.weight = weight
+
+    def evaluate(self, ini, pre, cur, elapsed_timesteps):
+        return self.weight * float(cur[0] >= self.threshold)
 
 
 def simple_stat_kill_entity_based_reward(
     name: str, weight: Union[int, float], **kwargs
 ) -> reward_fn_base:
-    return partial(_simple_stat_kill_entity_based_reward, name=name, weight=weight)
-
-
-def _simple_inventory_based_reward(
-    name: str,
-    weight: Union[int, float],
-    ini_info_dict: dict,
-    pre_info_dict: dict,
-    cur_info_dict: dict,
-    elapsed_timesteps: int,
-):
     """
-    A simple reward based on increment in `info["inventory"]`
+    A simple reward based on increment in `info["stat"]["kill_entity"][{name}]`.
     """
-    return (
-        sum(
-            [
-                inv_item["quantity"]
-                for inv_item in cur_info_dict["inventory"]
-                if inv_item["name"] == name
-            ]
-        )
-        - sum(
-            [
-                inv_item["quantity"]
-                for inv_item in pre_info_dict["inventory"]
-                if inv_item["name"] == name
-            ]
-        )
-    ) * weight
+    return DeltaReward(keys=[("stat", "kill_entity", name)], weights=[weight])
 
 
 def simple_inventory_based_reward(
     name: str, weight: Union[int, float], **kwargs
 ) -> reward_fn_base:
-    return partial(_simple_inventory_based_reward, name=name, weight=weight)
-
-
-def _possess_item_reward(
-    name: str,
-    weight: Union[int, float],
-    quantity: int,
-    ini_info_dict: dict,
-    pre_info_dict: dict,
-    cur_info_dict: dict,
-    elapsed_timesteps: int,
-):
-    return (
-        float(
-            (
-                sum(
-                    [
-                        inv_item["quantity"]
-                        for inv_item in cur_info_dict["inventory"]
-                        if inv_item["name"] == name
-                    ]
-                )
-                - sum(
-                    [
-                        inv_item["quantity"]
-                        for inv_item in ini_info_dict["inventory"]
-                        if inv_item["name"] == name
-                    ]
-                )
-            )
-            >= quantity
-        )
-        * weight
-    )
+    """
+    A simple reward based on increment in `info["inventory"]`
+    """
+    return DeltaReward(keys=[("inventory", name)], weights=[weight])
 
 
 def possess_item_reward(
     name: str, quantity: int, weight: Union[int, float]
 ) -> reward_fn_base:
-    return partial(_possess_item_reward, name=name, quantity=quantity, weight=weight)
-
-
-def _survive_per_day_reward(
-    mc_ticks_per_day: int,
-    weight: Union[int, float],
-    ini_info_dict: dict,
-    pre_info_dict: dict,
-    cur_info_dict: dict,
-    elapsed_timesteps: int,
-):
-    time_since_death_pre = pre_info_dict["stat"]["time_since_death"]
-    time_since_death_cur = cur_info_dict["stat"]["time_since_death"]
-    survived_days_pre = time_since_death_pre // mc_ticks_per_day
-    survived_days_cur = time_since_death_cur // mc_ticks_per_day
-    return (survived_days_cur - survived_days_pre) * weight
+    return IncrementThresholdReward(
+        keys=[("inventory", name)], quantities=[quantity], weights=[weight]
+    )
 
 
 def survive_per_day_reward(
     mc_ticks_per_day: int, weight: Union[int, float]
 ) -> reward_fn_base:
-    return partial(
-        _survive_per_day_reward, mc_ticks_per_day=mc_ticks_per_day, weight=weight
-    )
-
-
-def _survive_n_days_reward(
-    mc_ticks_per_day: int,
-    target_days: int,
-    weight: Union[int, float],
-    ini_info_dict: dict,
-    pre_info_dict: dict,
-    cur_info_dict: dict,
-    elapsed_timesteps: int,
-):
-    return weight * float(
-        cur_info_dict["stat"]["time_since_death"] >= mc_ticks_per_day * target_days
+    return PeriodDeltaReward(
+        key=("stat", "time_since_death"), period=mc_ticks_per_day, weight=weight
     )
 
 
 def survive_n_days_reward(
     mc_ticks_per_day: int, target_days: int, weight: Union[int, float]
 ) -> reward_fn_base:
-    return partial(
-        _survive_n_days_reward,
-        mc_ticks_per_day=mc_ticks_per_day,
-        target_days=target_days,
+    return ThresholdReward(
+        key=("stat", "time_since_death"),
+        threshold=mc_ticks_per_day * target_days,
         weight=weight,
     )
 
 
-def _use_any_item_reward(
-    items_and_weights: Dict[str, Union[int, float]],
-    ini_info_dict: dict,
-    pre_info_dict: dict,
-    cur_info_dict: dict,
-    elapsed_timesteps: int,
-):
+def use_any_item_reward(
+    items_and_weights: Dict[str, Union[int, float]]
+) -> reward_fn_base:
     """
     reward any usage of item in items_and_weights.keys()
     """
-    return sum(
-        [
-            (
-                cur_info_dict["stat"]["use_item"]["minecraft"][item]
-                - pre_info_dict["stat"]["use_item"]["minecraft"][item]
-            )
-            * weight
-            for item, weight in items_and_weights.items()
-        ]
+    return DeltaReward(
+        keys=[("stat", "use_item", "minecraft", item) for item in items_and_weights],
+        weights=list(items_and_weights.values()),
     )
-
-
-def use_any_item_reward(
-    items_and_weights: Dict[str, Union[int, float]]
-) -> reward_fn_base:
-    return partial(_use_any_item_reward, items_and_weights=items_and_weights)
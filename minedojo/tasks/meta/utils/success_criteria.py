@@ -1,10 +1,16 @@
-from functools import partial
 from mypy_extensions import Arg
-from typing import Callable, List, Dict, Union
+from typing import Callable, List, Dict, Union, Literal
+
+import numpy as np
+
+from .info_vectors import InfoKey, VectorizedTerm
 
 
 __all__ = [
     "check_success_base",
+    "VectorizedCheck",
+    "IncrementCheck",
+    "ThresholdCheck",
     "simple_inventory_based_check",
     "simple_stat_kill_entity_based_check",
     "time_since_death_check",
@@ -24,122 +30,120 @@ check_success_base = Callable[
 ]
 
 
-def _simple_stat_kill_entity_based_check(
-    name: str,
-    quantity: int,
-    ini_info_dict: dict,
-    cur_info_dict: dict,
-    elapsed_timesteps: int,
-):
+class VectorizedCheck(VectorizedTerm):
     """
-    A simple success check based on `info["stat"]["kill_entity"][{name}]`.
+    A success check evaluated on vectors of the info values of its ``keys`` at the initial (t = 0) and current (t) steps.
     """
-    return (
-        cur_info_dict["stat"]["kill_entity"][name]
-        - ini_info_dict["stat"]["kill_entity"][name]
-    ) >= quantity
 
-
-def simple_stat_kill_entity_based_check(
-    name: str, quantity: int, **kwargs
-) -> check_success_base:
-    return partial(_simple_stat_kill_entity_based_check, name=name, quantity=quantity)
+    def evaluate(
+        self, ini: np.ndarray, cur: np.ndarray, elapsed_timesteps: int
+    ) -> bool:
+        raise NotImplementedError
+
+    def __call__(
+        self, ini_info_dict: dict, cur_info_dict: dict, elapsed_timesteps: int
+    ) -> bool:
+        return self.evaluate(
+            self._vectorize(ini_info_dict),
+            self._vectorize(cur_info_dict),
+            elapsed_timesteps,
+        )
 
 
-def _simple_inventory_based_check(
-    name: str,
-    quantity: int,
-    ini_info_dict: dict,
-    cur_info_dict: dict,
-    elapsed_timesteps: int,
-):
+class IncrementCheck(VectorizedCheck):
     """
-    A simple success check based on `info["inventory"]`
+    Whether the increments of info values since the initial step reach ``quantities``,
+    for all of them if ``mode`` is ``"all"``, or for any of them if ``mode`` is ``"any"``.
     """
-    return (
-        sum(
-            [
-                inv_item["quantity"]
-                for inv_item in cur_info_dict["inventory"]
-                if inv_item["name"] == name
-            ]
-        )
-        - sum(
-            [
-                inv_item["quantity"]
-                for inv_item in ini_info_dict["inventory"]
-                if inv_item["name"] == name
-            ]
+
+    def __init__(
+        self,
+        keys: List[InfoKey],
+        quantities: List[Union[int, float]],
+        mode: Literal["all", "any"] = "all",
+    ):
+        assert len(keys) == len(quantities)
+        assert mode in ["all", "any"], f"Unknown mode {mode}"
+        super().__init__(keys)
+        self.quantities = np.asarray(quantities, dtype=np.float64)
+        self.mode = mode
+
+    def evaluate(self, ini, cur, elapsed_timesteps):
+        reached = (cur - ini) >= self.quantities
+        return bool(reached.all() if self.mode == "all" else reached.any())
+
+    @classmethod
+    def fuse(cls, terms):
+        # success criteria are combined by "any", so checks of single values and "any" checks can be merged
+        mergeable = [t for t in terms if t.mode == "any" or len(t.keys) == 1]
+        others = [t for t in terms if not (t.mode == "any" or len(t.keys) == 1)]
+        if len(mergeable) <= 1:
+            return terms
+        merged = cls(
+            keys=[key for term in mergeable for key in term.keys],
+            quantities=np.concatenate([term.quantities for term in mergeable]),
+            mode="any",
         )
-    ) >= quantity
+        return [merged] + others
 
 
-def simple_inventory_based_check(
+class ThresholdCheck(VectorizedCheck):
+    """
+    Whether an info value reaches ``threshold``.
+    """
+
+    def __init__(self, key: InfoKey, threshold: Union[int, float]):
+        super().__init__([key])
+        self.threshold = threshold
+
+    def evaluate(self, ini, cur, elapsed_timesteps):
+        return bool(cur[0] >= self.threshold)
+
+
+def simple_stat_kill_entity_based_check(
     name: str, quantity: int, **kwargs
 ) -> check_success_base:
-    return partial(_simple_inventory_based_check, name=name, quantity=quantity)
+    """
+    A simple success check based on `info["stat"]["kill_entity"][{name}]`.
+    """
+    return IncrementCheck(keys=[("stat", "kill_entity", name)], quantities=[quantity])
 
 
-def _time_since_death_check(
-    threshold, ini_info_dict: dict, cur_info_dict: dict, elapsed_timesteps: int
-):
+def simple_inventory_based_check(
+    name: str, quantity: int, **kwargs
+) -> check_success_base:
     """
-    Success check based on info["time_since_death"]
+    A simple success check based on `info["inventory"]`
     """
-    return cur_info_dict["stat"]["time_since_death"] >= threshold
+    return IncrementCheck(keys=[("inventory", name)], quantities=[quantity])
 
 
 def time_since_death_check(threshold, **kwargs) -> check_success_base:
-    return partial(_time_since_death_check, threshold=threshold)
+    """
+    Success check based on info["time_since_death"]
+    """
+    return ThresholdCheck(key=("stat", "time_since_death"), threshold=threshold)
 
 
-def _use_any_item_check(
-    targets: Dict[str, int],
-    ini_info_dict: dict,
-    cur_info_dict: dict,
-    elapsed_timesteps: int,
-):
+def use_any_item_check(targets: Dict[str, int]) -> check_success_base:
     """
     success check based on increment in info["stat"]["use_item"]["minecraft"][item]
     satisfaction of any item will result in "True" -- the logic "any"
     """
-    return any(
-        [
-            (
-                cur_info_dict["stat"]["use_item"]["minecraft"][item]
-                - ini_info_dict["stat"]["use_item"]["minecraft"][item]
-            )
-            >= target
-            for item, target in targets.items()
-        ]
+    return IncrementCheck(
+        keys=[("stat", "use_item", "minecraft", item) for item in targets],
+        quantities=list(targets.values()),
+        mode="any",
     )
 
 
-def use_any_item_check(targets: Dict[str, int]) -> check_success_base:
-    return partial(_use_any_item_check, targets=targets)
-
-
-def _use_all_item_check(
-    targets: Dict[str, int],
-    ini_info_dict: dict,
-    cur_info_dict: dict,
-    elapsed_timesteps: int,
-):
+def use_all_item_check(targets: Dict[str, int]) -> check_success_base:
     """
     success check based on increment in info["stat"]["use_item"]["minecraft"][item]
     satisfaction of all item will result in "True" -- the logic "all"
     """
-    return all(
-        [
-            (
-                cur_info_dict["stat"]["use_item"]["minecraft"][item]
-                - ini_info_dict["stat"]["use_item"]["minecraft"][item]
-            )
-            >= target
-            for item, target in targets.items()
-        ]
+    return IncrementCheck(
+        keys=[("stat", "use_item", "minecraft", item) for item in targets],
+        quantities=list(targets.values()),
+        mode="all",
     )
-
-
-def use_all_item_check(targets: Dict[str, int]) -> check_success_base:
-    return partial(_use_all_item_check, targets=targets)
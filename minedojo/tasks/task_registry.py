@@ -0,0 +1,189 @@
+"""
+Lazily loaded task specs, prompts and guidance.
+
+Task specs in ``tasks_specs.yaml`` are templates whose ids and values contain variables, e.g., ``{ore_type}``.
+Instead of expanding all templates when ``minedojo.tasks`` is imported, ``TaskRegistry`` indexes which template
+and variable values each task id comes from, and only fills the template of a task when its specs are requested.
+
+YAML files are parsed at most once per content. Parsed files and the index are cached on disk,
+keyed by hashes of the files' contents, so that later processes only unpickle them.
+The cache directory defaults to ``~/.minedojo/cache`` and can be changed with ``MINEDOJO_CACHE_DIR``.
+"""
+from __future__ import annotations
+
+import os
+import re
+from copy import deepcopy
+from itertools import product
+from typing import Any, Callable
+
+from ..sim.disk_cache import (
+    default_cache_dir,
+    content_digest,
+    load_pickle,
+    save_pickle,
+)
+
+
+# bump to invalidate caches written by previous versions
+_CACHE_VERSION = 1
+
+
+def product_dict(**kwargs):
+    keys = kwargs.keys()
+    vals = kwargs.values()
+    for instance in product(*vals):
+        yield dict(zip(keys, instance))
+
+
+def _find_unfilled_vars(task_id: str, task_specs: dict) -> list[str]:
+    unfilled_vars = re.findall(r"\{(.*?)\}", task_id)
+
+    def _recursive_find_unfilled_vars(x):
+        if isinstance(x, dict):
+            for v in x.values():
+                _recursive_find_unfilled_vars(v)
+        elif isinstance(x, str):
+            unfilled_vars.extend(re.findall(r"\{(.*?)\}", x))
+
+    _recursive_find_unfilled_vars(task_specs)
+    # deduplicate unfilled vars
+    return list(dict.fromkeys(unfilled_vars))
+
+
+def _fill_task_specs(task_specs: dict, var_dict: dict[str, Any]) -> dict:
+    def _recursive_replace_var(x):
+        if isinstance(x, dict):
+            return {k: _recursive_replace_var(v) for k, v in x.items()}
+        elif isinstance(x, str):
+            return x.format(**var_dict)
+        return deepcopy(x)
+
+    task_specs_filled = _recursive_replace_var(task_specs)
+    for k, v in task_specs_filled.items():
+        if k == "target_quantities":
+            task_specs_filled[k] = int(v)
+    task_specs_filled["prompt"] = task_specs_filled["prompt"].replace("_", " ")
+    task_specs_filled["prompt"] = task_specs_filled["prompt"].replace(" 1", "")
+    return task_specs_filled
+
+
+class TaskRegistry:
+    """
+    Args:
+        file_paths: Paths of the description files by their names, i.e.,
+                ``"tasks_specs.yaml"``, ``"programmatic_tasks.yaml"``, ``"creative_tasks.yaml"``,
+                and ``"playthrough_task.yaml"``.
+        all_vars: All possible values of the variables used in templates of task specs.
+        cache_dir: Directory of the cache. If ``None``, uses ``MINEDOJO_CACHE_DIR`` or ``~/.minedojo/cache``.
+    """
+
+    def __init__(
+        self,
+        file_paths: dict[str, str],
+        all_vars: dict[str, list],
+        cache_dir: str | None = None,
+    ):
+        self._file_paths = file_paths
+        self._all_vars = all_vars
+        self._cache_dir = cache_dir or default_cache_dir()
+        self._loaded = {}
+
+    def _load(self, fname: str, build_fn: Callable[[dict], Any], salt: str = ""):
+        """
+        Loads a description file parsed into plain containers and processed by ``build_fn``,
+        from the cache if the file has not changed since it was cached.
+        """
+        if fname in self._loaded:
+            return self._loaded[fname]
+        with open(self._file_paths[fname], "rb") as f:
+            content = f.read()
+        digest = content_digest(content, salt=f"{_CACHE_VERSION}{salt}")
+        cache_path = os.path.join(
+            self._cache_dir, f"{os.path.splitext(fname)[0]}-{digest[:32]}.pkl"
+        )
+        result = load_pickle(cache_path)
+        if result is None:
+            # imported here since YAML files are only parsed on cache misses
+            from omegaconf import OmegaConf
+
+            parsed = OmegaConf.to_container(OmegaConf.create(content.decode()))
+            result = build_fn(parsed)
+            save_pickle(cache_path, result)
+        self._loaded[fname] = result
+        return result
+
+    def _build_specs_index(self, templates: dict) -> dict:
+        # check no duplicates
+        assert len(set(templates.keys())) == len(templates)
+        # task id -> (template id, values of variables)
+        index = {}
+        for template_id, task_specs in templates.items():
+            unfilled_vars = _find_unfilled_vars(template_id, task_specs)
+            if len(unfilled_vars) == 0:
+                index[template_id] = (template_id, None)
+                continue
+            unfilled_vars_values = {var: self._all_vars[var] for var in unfilled_vars}
+            for var_dict in product_dict(**unfilled_vars_values):
+                filled_task_id = template_id.format(**var_dict)
+                # a task id filled from several templates takes the last one
+                index[filled_task_id] = (template_id, var_dict)
+        return {"templates": templates, "index": index}
+
+    @property
+    def _specs(self) -> dict:
+        return self._load(
+            "tasks_specs.yaml", self._build_specs_index, salt=repr(self._all_vars)
+        )
+
+    @property
+    def task_ids(self) -> list[str]:
+        """Ids of all tasks with specs."""
+        return list(self._specs["index"].keys())
+
+    def has_specs(self, task_id: str) -> bool:
+        return task_id in self._specs["index"]
+
+    def specs(self, task_id: str) -> dict:
+        """Specs of a task, with its template filled. The returned dict can be modified."""
+        assert self.has_specs(task_id), f"Invalid task id provided {task_id}"
+        template_id, var_dict = self._specs["index"][task_id]
+        task_specs = self._specs["templates"][template_id]
+        if var_dict is None:
+            # no unfilled vars, just make the task
+            return deepcopy(task_specs)
+        return _fill_task_specs(task_specs, var_dict)
+
+    def all_specs(self) -> dict[str, dict]:
+        """Specs of all tasks. Fills every template, so prefer ``specs`` to look up a few tasks."""
+        return {task_id: self.specs(task_id) for task_id in self.task_ids}
+
+    def _prompts_guidance(self, fname: str) -> dict[str, dict]:
+        def _check(parsed):
+            # check no duplicates
+            assert len(set(parsed.keys())) == len(parsed)
+            return parsed
+
+        return self._load(fname, _check)
+
+    @property
+    def programmatic_tasks(self) -> dict[str, dict]:
+        """Prompts and guidance of Programmatic tasks by their ids."""
+        return self._prompts_guidance("programmatic_tasks.yaml")
+
+    @property
+    def creative_tasks(self) -> dict[str, dict]:
+        """Prompts, guidance, collections and sources of Creative tasks by their ids."""
+        return self._prompts_guidance("creative_tasks.yaml")
+
+    @property
+    def playthrough_task(self) -> dict[str, dict]:
+        """Prompt and guidance of the Playthrough task by its id."""
+        playthrough = self._prompts_guidance("playthrough_task.yaml")
+        # check only one playthrough task
+        assert len(playthrough.keys()) == 1
+        return playthrough
+
+    @property
+    def playthrough_task_id(self) -> str:
+        return list(self.playthrough_task.keys())[0]
@@ -0,0 +1,150 @@
+"""
+Benchmark the time to import MineDojo in a fresh interpreter, as paid by every spawned env worker.
+
+Each run imports the module in a new process with ``python -X importtime`` and reports the median cumulative
+import time and the modules with the largest self time. The script exits with a non-zero status if the
+median exceeds ``--max-ms`` or if any of the ``--forbid`` modules, which are only needed to render, record,
+launch Minecraft or parse YAML on cache misses, is imported by the benchmarked package itself, so that it can
+guard against regressions. Forbidden modules imported by third-party dependencies are only reported, e.g.,
+``gym.wrappers`` imports ``cv2`` in gym 0.21.
+"""
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+from collections import defaultdict
+
+
+DEFAULT_FORBIDDEN = ["cv2", "lxml", "jinja2", "Pyro4", "psutil", "omegaconf"]
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Parses the output of ``-X importtime`` into self and cumulative microseconds by module."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def parse_importers(stderr: str) -> dict[str, str | None]:
+    """
+    Parses the output of ``-X importtime`` into the module that first imported each module,
+    ``None`` for modules imported by the code run.
+    """
+    importers = {}
+    # modules are listed after the ones they import, with deeper indentation, so walk them in reverse
+    stack = []
+    for line in reversed(stderr.splitlines()):
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        name = line.split("|")[2]
+        depth = len(name) - len(name.lstrip())
+        name = name.strip()
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        importers[name] = stack[-1][1] if stack else None
+        stack.append((depth, name))
+    return importers
+
+
+def run_once(
+    code: str, env: dict
+) -> tuple[dict[str, tuple[int, int]], dict[str, str | None]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to run {code!r}:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr), parse_importers(result.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", type=str, default="minedojo")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="use an empty cache directory for every run, as on the first import after installation",
+    )
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=None,
+        help="fail if the median import time exceeds this budget",
+    )
+    parser.add_argument("--forbid", type=str, nargs="*", default=DEFAULT_FORBIDDEN)
+    args = parser.parse_args()
+
+    # modules imported by the interpreter at startup are not attributed to the benchmarked module
+    startup = set(run_once("pass", dict(os.environ))[0].keys())
+    package = args.module.split(".")[0]
+    totals, self_times = [], defaultdict(list)
+    # imported modules and the ones imported by modules of the benchmarked package
+    imported, imported_by_package = set(), set()
+    for _ in range(args.repeats):
+        env = dict(os.environ)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            if args.cold:
+                env["MINEDOJO_CACHE_DIR"] = cache_dir
+            times, importers = run_once(f"import {args.module}", env)
+        totals.append(times[args.module][1])
+        times = {k: v for k, v in times.items() if k not in startup}
+        for name, (self_us, _) in times.items():
+            self_times[name].append(self_us)
+        imported.update(times.keys())
+        imported_by_package.update(
+            name
+            for name in times
+            if importers[name] is not None
+            and (
+                importers[name] == package or importers[name].startswith(package + ".")
+            )
+        )
+
+    total_ms = median(totals) / 1000
+    print(
+        f"[INFO] import {args.module}: median {total_ms:.1f} ms over {args.repeats} runs"
+        f" (min {min(totals) / 1000:.1f} ms, max {max(totals) / 1000:.1f} ms)"
+    )
+    print(f"[INFO] top {args.top} modules by self time:")
+    top = sorted(self_times.items(), key=lambda kv: -median(kv[1]))[: args.top]
+    for name, us in top:
+        print(f"    {median(us) / 1000:8.1f} ms  {name}")
+
+    def forbidden_in(names):
+        return sorted(
+            {
+                m
+                for m in args.forbid
+                for name in names
+                if name == m or name.startswith(m + ".")
+            }
+        )
+
+    failed = False
+    forbidden = forbidden_in(imported_by_package)
+    by_dependencies = [m for m in forbidden_in(imported) if m not in forbidden]
+    if by_dependencies:
+        print(
+            f"[INFO] modules that should be imported lazily were imported by dependencies: {by_dependencies}"
+        )
+    if forbidden:
+        print(
+            f"[ERROR] modules that should be imported lazily were imported: {forbidden}"
+        )
+        failed = True
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"[ERROR] import time {total_ms:.1f} ms exceeds {args.max_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,51 @@
+"""
+Extract the names of blocks in voxel and lidar observations into ``minedojo/sim/mc_meta/block_names.json``,
+which ``BLOCK_VOCAB`` is built from.
+
+Malmo names blocks by ``block.getLocalizedName().toLowerCase()``, i.e., the lower-cased English names of the
+``tile.*.name`` keys of the Minecraft language file, e.g., "grass block" or "wooden planks".
+Pass the ``en_US.lang`` file of the Minecraft version Malmo runs (1.11.2), found under
+``assets/minecraft/lang`` in the client jar, or a json dict of the same keys and names.
+"""
+import os
+import json
+import argparse
+
+
+DEFAULT_OUTPUT = os.path.join(
+    os.path.dirname(__file__), "..", "minedojo", "sim", "mc_meta", "block_names.json"
+)
+
+
+def read_lang(path: str) -> dict:
+    if path.endswith(".json"):
+        with open(path, "r") as f:
+            return json.load(f)
+    translations = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, name = line.split("=", 1)
+                translations[key] = name
+    return translations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("lang_file", type=str)
+    parser.add_argument("--output", type=str, default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    translations = read_lang(args.lang_file)
+    names = sorted(
+        {
+            name.lower()
+            for key, name in translations.items()
+            if key.startswith("tile.") and key.endswith(".name")
+        }
+    )
+    with open(args.output, "w") as f:
+        json.dump(names, f, indent=1)
+        f.write("\n")
+    print(f"[INFO] {len(names)} block names written to {os.path.normpath(args.output)}")
@@ -0,0 +1,23 @@
+"""
+Prebuild the tables derived from ``mc_constants.json``, e.g., sorted item lists and recipes by output,
+into ``minedojo/sim/mc_meta/mc_tables.pkl``, which is shipped with the package so that importing MineDojo
+does not parse and process the constants.
+
+Rerun this script whenever ``mc_constants.json`` or ``MC_TABLES_VERSION`` changes.
+Stale prebuilt tables are detected at import and ignored, falling back to the user cache.
+"""
+import argparse
+
+from minedojo.sim.mc_meta import mc
+from minedojo.sim.disk_cache import load_pickle
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", type=str, default=mc.mc_tables_file)
+    args = parser.parse_args()
+
+    mc.prebuild_tables(args.output)
+    assert load_pickle(args.output)["tables"] == mc.load_tables(use_cache=False)
+
+    print(f"[INFO] Prebuilt Minecraft tables written to {args.output}")
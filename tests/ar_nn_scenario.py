@@ -0,0 +1,102 @@
+"""
+A fixed scenario of the AR NN wrappers on ``MineDojoSim`` with a stub bridge, whose outputs are recorded as fixtures.
+
+The baseline fixture ``data/ar_nn_baseline.npz`` was recorded with the original wrapper stack
+``DeltaInventoryWrapper(ARMasksWrapper(NNActionSpaceWrapper(sim)))`` of revision 4761726, by copying this
+``tests`` directory into a checkout of that revision and running from its root::
+
+    python -m tests.ar_nn_scenario tests/data/ar_nn_baseline.npz
+"""
+import sys
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from .stub_bridge import StubBridge, make_stub_sim
+
+
+N_EPISODES = 2
+N_STEPS = 150
+SEED = 0
+
+
+def sample_action(action_space, masks, rng):
+    """Samples a random action, with the functional action and its argument drawn from the valid ones."""
+    action = np.array([rng.integers(n) for n in action_space.nvec])
+    action[5] = rng.choice(np.flatnonzero(masks["action_type"]))
+    arg_masks = {
+        4: masks["craft_smelt"],
+        5: masks["equip"],
+        6: masks["place"],
+        7: masks["destroy"],
+    }
+    if action[5] in arg_masks:
+        arg_idx = 6 if action[5] == 4 else 7
+        action[arg_idx] = rng.choice(np.flatnonzero(arg_masks[action[5]]))
+    return action
+
+
+def _flatten(obs: dict, prefix: str = ""):
+    for k, v in obs.items():
+        if isinstance(v, dict):
+            yield from _flatten(v, f"{prefix}{k}/")
+        else:
+            yield f"{prefix}{k}", np.array(v)
+
+
+def run_scenario(
+    make_env: Callable, actions: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Runs ``N_EPISODES`` episodes of ``N_STEPS`` steps of ``make_env(sim)``.
+    If ``actions`` is ``None``, actions are sampled from the masks of the observations.
+
+    Return:
+        A dict of arrays stacked over the outputs of all resets and steps:
+        ``action`` (``-1`` for resets), ``reward``, ``done``, each observation value under ``obs/<path>``,
+        and the action XMLs sent to the bridge, ``sent_xml``, with their numbers per output in ``n_sent_xml``.
+    """
+    bridge = StubBridge(seed=SEED)
+    env = make_env(make_stub_sim(bridge))
+    rng = np.random.default_rng(SEED)
+    outputs = []
+    for _ in range(N_EPISODES):
+        obs, reward, done = env.reset(), 0.0, False
+        # observation values are copied since some arrays are overwritten by subsequent steps
+        outputs.append((np.full(8, -1), dict(_flatten(obs)), reward, done, []))
+        for _ in range(N_STEPS):
+            if actions is None:
+                action = sample_action(env.action_space, obs["masks"], rng)
+            else:
+                action = actions[len(outputs)]
+            n_sent = len(bridge.sent_xmls)
+            obs, reward, done, _ = env.step(action)
+            outputs.append(
+                (action, dict(_flatten(obs)), reward, done, bridge.sent_xmls[n_sent:])
+            )
+    recorded = {
+        "action": np.stack([o[0] for o in outputs]),
+        "reward": np.array([o[2] for o in outputs], dtype=np.float64),
+        "done": np.array([o[3] for o in outputs], dtype=bool),
+        "sent_xml": np.array([xml for o in outputs for xml in o[4]]),
+        "n_sent_xml": np.array([len(o[4]) for o in outputs]),
+    }
+    for key in outputs[0][1]:
+        recorded[f"obs/{key}"] = np.stack([o[1][key] for o in outputs])
+    return recorded
+
+
+def make_stack(sim):
+    from minedojo.sim.wrappers.ar_nn.ar_masks_wrapper import ARMasksWrapper
+    from minedojo.sim.wrappers.ar_nn.delta_inventory_wrapper import (
+        DeltaInventoryWrapper,
+    )
+    from minedojo.sim.wrappers.ar_nn.nn_action_space_wrapper import (
+        NNActionSpaceWrapper,
+    )
+
+    return DeltaInventoryWrapper(ARMasksWrapper(NNActionSpaceWrapper(sim)))
+
+
+if __name__ == "__main__":
+    np.savez_compressed(sys.argv[1], **run_scenario(make_stack))
@@ -0,0 +1,177 @@
+"""
+A stand-in for ``BridgeEnv`` that lets ``MineDojoSim`` and its wrappers run without Minecraft.
+"""
+from typing import List, Optional
+
+import numpy as np
+
+from minedojo.sim import MineDojoSim
+from minedojo.sim.bridge.bridge_env.bridge_env import StepTuple
+from minedojo.sim.inventory import map_slot_number_to_cmd_slot
+
+
+N_ALL_SLOTS = 41
+# items the scripted inventory changes draw from, "air" empties a slot
+ITEM_POOL = [
+    "air",
+    "air",
+    "air",
+    "log",
+    "planks",
+    "stick",
+    "cobblestone",
+    "coal",
+    "iron_ore",
+    "iron_ingot",
+    "crafting_table",
+    "furnace",
+    "wooden_pickaxe",
+    "stone_pickaxe",
+    "torch",
+    "dirt",
+]
+
+
+class StubBridge:
+    """
+    Replays a scripted inventory in Malmo's json format and records the action XMLs sent by the simulator.
+
+    At every step, ``/replaceitem`` chat commands are applied to the inventory first,
+    then with probability ``change_prob`` one to three random slots are changed by the seeded generator.
+    The observations thus only depend on ``seed``, the number of steps and the sent commands.
+    Changes added by ``schedule`` are applied after the commands, to emulate Malmo's lags.
+    The ``fail_at_step``-th step of an episode fails, and the episode terminates after ``terminate_at_step`` steps.
+    Like ``BridgeEnv``, ``pov`` is only attached to observations if ``want_pov`` is ``True``.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        change_prob: float = 0.5,
+        image_size=(16, 16),
+        fail_at_step: Optional[int] = None,
+        terminate_at_step: Optional[int] = None,
+        want_pov: bool = True,
+    ):
+        self.image_size = image_size
+        self.want_pov = want_pov
+        self._seed = seed
+        self._change_prob = change_prob
+        self._fail_at_step = fail_at_step
+        self._terminate_at_step = terminate_at_step
+        self._slot_by_cmd = {
+            map_slot_number_to_cmd_slot(i): i for i in range(N_ALL_SLOTS)
+        }
+        self.sent_xmls: List[str] = []
+        self.n_steps = 0
+        self._scheduled = []
+        self._rng = None
+        self._names = None
+        self._quantities = None
+
+    @property
+    def is_terminated(self):
+        return (
+            self._terminate_at_step is not None
+            and self.n_steps >= self._terminate_at_step
+        )
+
+    @property
+    def sent_lines(self) -> List[str]:
+        """All lines of the sent action XMLs, in order."""
+        return [line for xml in self.sent_xmls for line in xml.split("\n")]
+
+    @property
+    def sent_chats(self) -> List[str]:
+        """The chat commands sent so far, in order."""
+        return [line[5:] for line in self.sent_lines if line.startswith("chat ")]
+
+    def reset(self, episode_uid: str, agent_xmls: list):
+        self._rng = np.random.default_rng(self._seed)
+        self._names = np.array(["air"] * N_ALL_SLOTS, dtype=object)
+        self._quantities = np.zeros(N_ALL_SLOTS, dtype=np.int64)
+        self._change_slots(np.arange(36))
+        self.sent_xmls.clear()
+        self.n_steps = 0
+        self._scheduled.clear()
+        return {0: self._raw_obs()}
+
+    def step(self, action_xmls: List[str]):
+        assert len(action_xmls) == 1
+        self.sent_xmls.append(action_xmls[0])
+        self.n_steps += 1
+        if self.n_steps == self._fail_at_step:
+            return StepTuple(step_success=False, raw_obs=None)
+        for line in action_xmls[0].split("\n"):
+            if line.startswith("chat /replaceitem"):
+                self._replace_item(line)
+        for change in [c for c in self._scheduled if c[0] == self.n_steps]:
+            self._scheduled.remove(change)
+            _, slot, name, quantity = change
+            self._names[slot] = name
+            self._quantities[slot] = 0 if name == "air" else quantity
+        if self._rng.random() < self._change_prob:
+            self._change_slots(self._rng.integers(0, 36, size=self._rng.integers(1, 4)))
+        return StepTuple(step_success=True, raw_obs={0: self._raw_obs()})
+
+    def schedule(self, delay: int, slot: int, name: str, quantity: int = 1):
+        """
+        Sets ``slot`` (0 to 35 for the inventory, 36 to 40 for armor and offhand) to ``quantity`` of ``name``
+        at the ``delay``-th next step.
+        """
+        assert delay >= 1
+        self._scheduled.append((self.n_steps + delay, slot, name, quantity))
+
+    def close(self):
+        pass
+
+    def _replace_item(self, line: str):
+        # chat /replaceitem entity @p <slot> minecraft:<name> <quantity> <metadata>
+        _, _, _, _, cmd_slot, name, quantity, _ = line.split()
+        slot = self._slot_by_cmd[cmd_slot]
+        name = name[len("minecraft:") :]
+        self._names[slot] = name
+        self._quantities[slot] = 0 if name == "air" else int(quantity)
+
+    def _change_slots(self, slots: np.ndarray):
+        names = self._rng.choice(ITEM_POOL, size=len(slots))
+        quantities = self._rng.integers(1, 9, size=len(slots))
+        self._names[slots] = names
+        self._quantities[slots] = np.where(names == "air", 0, quantities)
+
+    def _raw_obs(self) -> dict:
+        raw_obs = {
+            "inventory": [
+                {
+                    "inventory": "inventory",
+                    "index": i,
+                    "name": name,
+                    "variant": 0,
+                    "quantity": int(quantity),
+                    "max_durability": -1,
+                    "cur_durability": -1,
+                }
+                for i, (name, quantity) in enumerate(zip(self._names, self._quantities))
+            ],
+            "nearby_crafting_table": bool(self._rng.random() < 0.5),
+            "nearby_furnace": bool(self._rng.random() < 0.5),
+            "xpos": 0.0,
+            "ypos": 64.0,
+            "zpos": 0.0,
+            "pitch": 0.0,
+            "yaw": 0.0,
+            # not read by any handler, identifies the step in `info`
+            "stub_step": self.n_steps,
+        }
+        if self.want_pov:
+            raw_obs["pov"] = bytes(self.image_size[0] * self.image_size[1] * 3)
+        return raw_obs
+
+
+def make_stub_sim(bridge: Optional[StubBridge] = None, **kwargs) -> MineDojoSim:
+    """Creates a ``MineDojoSim`` talking to ``bridge`` instead of Minecraft."""
+    bridge = bridge or StubBridge(want_pov=kwargs.get("use_rgb", True))
+    kwargs = {"image_size": bridge.image_size, "event_level_control": True, **kwargs}
+    sim = MineDojoSim(**kwargs)
+    sim._bridge_env = bridge
+    return sim
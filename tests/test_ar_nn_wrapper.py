@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+import minedojo.sim.mc_meta.mc as MC
+from minedojo.sim.wrappers.ar_nn import ARNNWrapper
+
+from .stub_bridge import StubBridge, make_stub_sim
+from .ar_nn_scenario import run_scenario, make_stack
+
+
+BASELINE = os.path.join(os.path.dirname(__file__), "data", "ar_nn_baseline.npz")
+
+
+@pytest.mark.parametrize("make_env", [ARNNWrapper, make_stack], ids=["fused", "stack"])
+def test_matches_baseline(make_env):
+    with np.load(BASELINE) as f:
+        expected = dict(f)
+    actual = run_scenario(make_env, actions=expected["action"])
+
+    assert set(actual.keys()) == set(expected.keys())
+    np.testing.assert_array_equal(actual["n_sent_xml"], expected["n_sent_xml"])
+    np.testing.assert_array_equal(actual["sent_xml"], expected["sent_xml"])
+    for key in expected:
+        assert actual[key].shape == expected[key].shape, key
+        assert actual[key].dtype.kind == expected[key].dtype.kind, key
+        np.testing.assert_array_equal(actual[key], expected[key], err_msg=key)
+
+
+def test_observation_space_matches_stack():
+    fused = ARNNWrapper(make_stub_sim())
+    stack = make_stack(make_stub_sim())
+    assert set(fused.observation_space.spaces.keys()) == set(
+        stack.observation_space.spaces.keys()
+    )
+    for key in ["masks", "delta_inv"]:
+        assert (
+            fused.observation_space[key].spaces.keys()
+            == stack.observation_space[key].spaces.keys()
+        )
+
+
+@pytest.mark.parametrize("lag_completion", ["fixed", "until_effect", "deferred"])
+def test_crafted_items_are_attributed_to_crafting(lag_completion):
+    bridge = StubBridge(change_prob=0)
+    env = ARNNWrapper(make_stub_sim(bridge), lag_completion=lag_completion)
+    env.reset()
+    # start from an inventory holding only logs
+    for slot in range(36):
+        bridge.schedule(1, slot, "log" if slot == 0 else "air", 4)
+    obs, _, _, _ = env.step(env.action_space.no_op())
+    craft_idx = MC.ALL_CRAFT_SMELT_ITEMS.index("planks")
+    assert obs["masks"]["craft_smelt"][craft_idx]
+
+    # planks show up one tick after the crafting action
+    bridge.schedule(2, 0, "log", 3)
+    bridge.schedule(2, 1, "planks", 4)
+    action = env.action_space.no_op()
+    action[5] = 4
+    action[6] = craft_idx
+    # delta arrays are overwritten by later steps
+    deltas = []
+    for a in [action, env.action_space.no_op()]:
+        delta = env.step(a)[0]["delta_inv"]
+        deltas.append({k: v.copy() for k, v in delta.items()})
+    # the crafted planks are reported once, at the step they show up
+    assert [d["inc_name_by_craft"][0] for d in deltas].count("planks") == 1
+    assert [d["inc_quantity_by_craft"][0] for d in deltas] in ([4, 0], [0, 4])
+    assert "log" in [name for d in deltas for name in d["dec_name_by_craft"]]
+    assert all(d["inc_name_by_other"][0] == "air" for d in deltas)
+    assert all(d["dec_name_by_other"][0] == "air" for d in deltas)
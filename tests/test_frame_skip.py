@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from minedojo.sim import MineDojoSim
+from minedojo.sim.wrappers import FastResetWrapper
+from minedojo.sim.wrappers.ar_nn.nn_action_space_wrapper import NNActionSpaceWrapper
+
+from .stub_bridge import StubBridge, make_stub_sim
+
+
+def _action(sim, **kwargs):
+    action = sim.action_space.no_op()
+    action.update(kwargs)
+    return action
+
+
+def test_repeat_sends_one_xml_per_tick():
+    bridge = StubBridge()
+    sim = make_stub_sim(bridge)
+    sim.reset()
+    action = _action(
+        sim, forward=1, attack=1, camera=np.array([15.0, -30.0]), craft="stick"
+    )
+    action["chat"] = "/time set 0"
+    sim.step(action, repeat=3)
+
+    assert len(bridge.sent_xmls) == 3
+    assert bridge.sent_xmls[0] == sim._action_obj_to_xml(action)
+    # movement and attack keys are held, one-shot actions are only sent on the first tick
+    held_xml = sim._action_obj_to_xml(_action(sim, forward=1, attack=1))
+    assert bridge.sent_xmls[1:] == [held_xml, held_xml]
+    assert bridge.sent_chats == ["/time set 0"]
+    for xml in bridge.sent_xmls[1:]:
+        assert xml != bridge.sent_xmls[0]
+        assert "stick" not in xml
+
+
+def test_one_shot_actions_are_stripped():
+    sim = make_stub_sim()
+    action = sim.action_space.no_op()
+    held = sim._strip_one_shot_actions(
+        {**action, "chat": "/kill", "craft": "stick", "forward": 1}
+    )
+    assert "chat" not in held
+    assert held["craft"] == action["craft"]
+    assert held["forward"] == 1
+    for k in MineDojoSim.ONE_SHOT_ACTIONS:
+        if k in action:
+            np.testing.assert_array_equal(held[k], action[k])
+
+
+@pytest.mark.parametrize("frame_skip", [1, 4])
+def test_frame_skip(frame_skip):
+    bridge = StubBridge()
+    sim = make_stub_sim(bridge, frame_skip=frame_skip)
+    sim.reset()
+    sim.step(sim.action_space.no_op())
+    assert len(bridge.sent_xmls) == frame_skip
+    sim.step(sim.action_space.no_op(), repeat=1)
+    assert len(bridge.sent_xmls) == frame_skip + 1
+    # commands always run for a single tick
+    sim.execute_cmd("/time set 0")
+    assert len(bridge.sent_xmls) == frame_skip + 2
+
+
+def test_repeat_stops_on_failure():
+    bridge = StubBridge(fail_at_step=2)
+    sim = make_stub_sim(bridge)
+    reset_obs = sim.reset()
+    obs, reward, done, info = sim.step(_action(sim, forward=1), repeat=4)
+    assert len(bridge.sent_xmls) == 2
+    assert done
+    # the observation of the last successful step is returned
+    np.testing.assert_array_equal(
+        obs["inventory"]["name"], reset_obs["inventory"]["name"]
+    )
+
+
+def test_repeat_stops_on_termination():
+    bridge = StubBridge(terminate_at_step=2)
+    sim = make_stub_sim(bridge)
+    sim.reset()
+    obs, reward, done, info = sim.step(_action(sim, forward=1), repeat=4)
+    assert len(bridge.sent_xmls) == 2
+    assert done
+
+
+def test_repeat_decodes_once(monkeypatch):
+    bridge = StubBridge()
+    sim = make_stub_sim(bridge, frame_skip=4)
+    sim.reset()
+    n_decoded = []
+    process_raw_obs = sim._process_raw_obs
+
+    def counting_process_raw_obs(raw_obs):
+        n_decoded.append(1)
+        return process_raw_obs(raw_obs)
+
+    monkeypatch.setattr(sim, "_process_raw_obs", counting_process_raw_obs)
+    sim.step(sim.action_space.no_op())
+    assert len(bridge.sent_xmls) == 4
+    assert len(n_decoded) == 1
+
+
+def test_lag_no_ops_run_a_single_tick():
+    bridge = StubBridge()
+    env = NNActionSpaceWrapper(FastResetWrapper(make_stub_sim(bridge, frame_skip=4)))
+    env.reset()
+    action = env.action_space.no_op()
+    action[5] = 4
+    env.step(action)
+    # the craft action runs for `frame_skip` ticks, each of the two lag no-ops for one
+    assert len(bridge.sent_xmls) == 4 + 2
@@ -0,0 +1,102 @@
+import gym
+import numpy as np
+import pytest
+
+from minedojo.sim import spaces
+from minedojo.sim.wrappers import FrameStackWrapper
+from minedojo.sim.wrappers.frame_stack import _stack_space
+
+from .stub_bridge import make_stub_sim
+
+
+class _CountingEnv(gym.Env):
+    """Observes frames filled with the number of steps since reset, and block names growing with it."""
+
+    observation_space = spaces.Dict(
+        {
+            "rgb": spaces.Box(low=0, high=255, shape=(3, 2, 2), dtype=np.uint8),
+            "voxels": spaces.Dict(
+                {
+                    "block_name": spaces.Text(shape=(2,)),
+                    "is_solid": spaces.Box(low=0, high=1, shape=(2,), dtype=bool),
+                }
+            ),
+            "inventory": spaces.Box(low=0, high=64, shape=(4,), dtype=np.float32),
+        }
+    )
+    action_space = spaces.Discrete(1)
+
+    def __init__(self):
+        self._t = 0
+
+    def _obs(self):
+        return {
+            "rgb": np.full((3, 2, 2), self._t % 256, dtype=np.uint8),
+            "voxels": {
+                "block_name": np.array(["a" * (self._t + 1)] * 2),
+                "is_solid": np.full((2,), self._t % 2 == 0),
+            },
+            "inventory": np.full((4,), self._t, dtype=np.float32),
+        }
+
+    def reset(self):
+        self._t = 0
+        return self._obs()
+
+    def step(self, action):
+        self._t += 1
+        return self._obs(), 0.0, False, {}
+
+
+@pytest.mark.parametrize("k", [1, 3, 4])
+def test_order_after_wraparound(k):
+    env = FrameStackWrapper(_CountingEnv(), k=k, stack_voxels=True)
+    obs = env.reset()
+    # all slots are filled with the first frame
+    assert obs["rgb"].shape == (k, 3, 2, 2)
+    np.testing.assert_array_equal(obs["rgb"], 0)
+    assert env.observation_space["rgb"].contains(obs["rgb"])
+
+    n_steps = 2 * k + 3
+    for t in range(1, n_steps + 1):
+        obs, _, _, _ = env.step(0)
+        # from the oldest to the newest frame, frames before the reset repeat the first one
+        expected = np.maximum(np.arange(t - k + 1, t + 1), 0)
+        np.testing.assert_array_equal(obs["rgb"][:, 0, 0, 0], expected)
+        np.testing.assert_array_equal(
+            obs["voxels"]["block_name"][:, 0], ["a" * (i + 1) for i in expected]
+        )
+        np.testing.assert_array_equal(
+            obs["voxels"]["is_solid"][:, 0], expected % 2 == 0
+        )
+        # other keys are not stacked
+        np.testing.assert_array_equal(obs["inventory"], t)
+        assert env.observation_space["rgb"].contains(obs["rgb"])
+
+    # a new episode refills all slots with its first frame
+    obs = env.reset()
+    np.testing.assert_array_equal(obs["rgb"], 0)
+    np.testing.assert_array_equal(obs["voxels"]["block_name"], "a")
+
+
+def test_stack_space():
+    space = _CountingEnv.observation_space
+    stacked = _stack_space(space, 3)
+    assert isinstance(stacked, spaces.Dict)
+    assert stacked["rgb"].shape == (3, 3, 2, 2)
+    assert stacked["rgb"].dtype == np.uint8
+    np.testing.assert_array_equal(stacked["rgb"].high, 255)
+    assert isinstance(stacked["voxels"]["block_name"], spaces.Text)
+    assert stacked["voxels"]["block_name"].shape == (3, 2)
+    assert stacked["voxels"]["is_solid"].shape == (3, 2)
+    assert stacked["voxels"]["is_solid"].dtype == bool
+    with pytest.raises(ValueError):
+        _stack_space(spaces.Discrete(2), 3)
+
+
+def test_stub_sim():
+    env = FrameStackWrapper(make_stub_sim(), k=2)
+    obs = env.reset()
+    assert obs["rgb"].shape == (2,) + env.env.observation_space["rgb"].shape
+    obs, _, _, _ = env.step(env.action_space.no_op())
+    assert env.observation_space["rgb"].contains(obs["rgb"])
@@ -0,0 +1,40 @@
+import pytest
+
+from minedojo.sim.spaces import compile_contains
+from minedojo.sim.handlers.agent.observations.mc_base_stats import (
+    ObserveFromFullStats,
+)
+
+
+RAW = {
+    "achievement": {"acquire_iron": 1},
+    "stat": {
+        "walk_one_cm": 1234,
+        "mine_block": {"minecraft": {"stone": 5}},
+    },
+}
+
+
+@pytest.mark.parametrize("stat_key", [None, "mine_block"])
+def test_observation_in_space(stat_key):
+    handler = ObserveFromFullStats(stat_key)
+    obs = handler.from_hero(RAW)
+    assert handler.space.contains(obs)
+    assert compile_contains(handler.space)(obs)
+    assert handler.space.contains(dict(obs))
+
+
+def test_observation_values():
+    obs = ObserveFromFullStats().from_hero(RAW)
+    assert obs["acquire_iron"] == 1
+    assert obs["walk_one_cm"] == 1234
+    assert obs["bake_cake"] == 0
+    assert ObserveFromFullStats("mine_block").from_hero(RAW)["stone"] == 5
+
+
+def test_observations_do_not_share_vectors():
+    handler = ObserveFromFullStats()
+    first = handler.from_hero(RAW)
+    second = handler.from_hero({"stat": {"walk_one_cm": 1}})
+    assert first["walk_one_cm"] == 1234 and second["walk_one_cm"] == 1
+    assert first.vector is not second.vector
@@ -0,0 +1,24 @@
+import numpy as np
+
+from minedojo.sim import handlers
+
+
+def test_ray_grid_depth_image():
+    rays = handlers.make_lidar_ray_grid(2, 3, distance=8.0)
+    assert len(rays) == 6
+    assert all(distance == 8.0 for _, _, distance in rays)
+    # row-major, yaw varies fastest
+    assert rays[0][0] == rays[2][0] < rays[3][0]
+    assert rays[0][1] < rays[1][1] < rays[2][1]
+
+    obs = {
+        "block_distance": np.arange(6, dtype=np.float64),
+        "entity_distance": np.full(6, 2.5),
+    }
+    depth = handlers.lidar_depth_image(obs, (2, 3))
+    assert depth.dtype == np.float32 and depth.shape == (2, 3)
+    np.testing.assert_array_equal(depth, [[0, 1, 2], [2.5, 2.5, 2.5]])
+    np.testing.assert_array_equal(
+        handlers.lidar_depth_image(obs, (2, 3), include_entities=False),
+        np.arange(6).reshape(2, 3),
+    )
@@ -0,0 +1,226 @@
+import numpy as np
+import pytest
+
+import minedojo.sim.mc_meta.mc as MC
+from minedojo.sim.cmd_executor import CMDExecutor
+from minedojo.sim.mc_meta.vocab import ITEM_VOCAB
+from minedojo.sim.wrappers.ar_nn.nn_action_space_wrapper import NNActionSpaceWrapper
+
+from .stub_bridge import StubBridge, make_stub_sim
+
+
+def _destroy_action(env, slot):
+    action = env.action_space.no_op()
+    action[5] = 7
+    action[7] = slot
+    return action
+
+
+def test_destroy_sends_replaceitem_once():
+    bridge = StubBridge(change_prob=0)
+    env = NNActionSpaceWrapper(make_stub_sim(bridge))
+    obs = env.reset()
+    slot = int(np.flatnonzero(obs["inventory"]["name"] != "air")[0])
+
+    env.step(_destroy_action(env, slot))
+    assert len(bridge.sent_chats) == 1
+    assert bridge.sent_chats[0].startswith("/replaceitem entity @p ")
+    assert bridge.sent_chats[0].endswith(" minecraft:air 1 0")
+
+    n_sent = len(bridge.sent_xmls)
+    for _ in range(5):
+        env.step(env.action_space.no_op())
+    assert len(bridge.sent_xmls) == n_sent + 5
+    # neither the later steps nor the lag no-ops of the destroy step send the command again
+    assert len(bridge.sent_chats) == 1
+
+
+def test_execute_cmd_does_not_modify_action():
+    sim = make_stub_sim()
+    sim.reset()
+    action = sim.action_space.no_op()
+    CMDExecutor(sim).execute_cmd("/time set 0", action)
+    assert "chat" not in action
+    assert sim.prev_action["chat"] == "/time set 0"
+
+
+def test_action_returns_independent_copies():
+    env = NNActionSpaceWrapper(make_stub_sim())
+    env.reset()
+    forward = env.action_space.no_op()
+    forward[0] = 1
+    forward[3] = 0
+    first, _ = env.action(forward)
+    second, _ = env.action(env.action_space.no_op())
+    assert first is not second
+    assert first["forward"] == 1 and second["forward"] == 0
+    assert first["camera"][0] != second["camera"][0]
+    # modifying a returned action does not leak into later ones
+    first["chat"] = "/kill"
+    first["camera"][1] = 45.0
+    third, _ = env.action(env.action_space.no_op())
+    assert "chat" not in third
+    np.testing.assert_array_equal(third["camera"], second["camera"])
+
+    noops = np.stack([env.action_space.no_op()] * 2)
+    batch = env.action_batch(np.stack([forward, noops[0]]))
+    assert batch[0][0]["forward"] == 1 and batch[1][0]["forward"] == 0
+    env.action_batch(noops)
+    assert batch[0][0]["forward"] == 1
+
+
+_BINARY_KEYS = [
+    "forward",
+    "back",
+    "left",
+    "right",
+    "jump",
+    "sneak",
+    "sprint",
+    "attack",
+    "use",
+    "drop",
+]
+_ITEM_KEYS = {
+    "craft": MC.ALL_PERSONAL_CRAFTING_ITEMS,
+    "craft_with_table": MC.ALL_CRAFTING_TABLE_ITEMS,
+    "smelt": MC.ALL_SMELTING_ITEMS,
+    "equip": MC.ALL_ITEMS,
+    "place": MC.ALL_ITEMS,
+}
+
+
+def _random_trajectory(rng, n_steps, int_items, strict_check):
+    """Random Malmo actions of ``n_steps`` steps and the inventory names before each step."""
+    pool = rng.choice(MC.ALL_ITEMS, size=20, replace=False)
+    inventory = np.array(
+        [
+            [name.replace("_", " ") for name in rng.choice(pool, 36)]
+            for _ in range(n_steps)
+        ]
+    )
+    actions = {
+        key: (rng.random(n_steps) < 0.15).astype(np.int64) for key in _BINARY_KEYS
+    }
+    actions["camera"] = rng.uniform(-400, 400, size=(n_steps, 2))
+    for key, items in _ITEM_KEYS.items():
+        if key in {"equip", "place"}:
+            # only items in the inventory can be equipped or placed with strict check
+            candidates = [
+                rng.choice(inventory[t]).replace(" ", "_")
+                if strict_check or rng.random() < 0.5
+                else rng.choice(pool)
+                for t in range(n_steps)
+            ]
+        else:
+            candidates = rng.choice(items, size=n_steps)
+        selected = rng.random(n_steps) < 0.2
+        if int_items:
+            ids = np.array([items.index(item) + 1 for item in candidates])
+            actions[key] = np.where(selected, ids, 0)
+        else:
+            actions[key] = np.where(selected, candidates, "none")
+    return actions, inventory
+
+
+@pytest.mark.parametrize("strict_check", [True, False])
+@pytest.mark.parametrize("numeric_obs", [False, True])
+@pytest.mark.parametrize("int_items", [False, True])
+def test_reverse_actions_matches_reverse_action(int_items, numeric_obs, strict_check):
+    rng = np.random.default_rng(int_items * 4 + numeric_obs * 2 + strict_check)
+    # ints are not members of the Enum spaces of Malmo actions
+    env = NNActionSpaceWrapper(
+        make_stub_sim(numeric_obs=numeric_obs),
+        strict_check=strict_check,
+        validation="off" if int_items else "full",
+    )
+    n_steps = 200
+    actions, inventory = _random_trajectory(rng, n_steps, int_items, strict_check)
+    if numeric_obs:
+        inventory = ITEM_VOCAB.encode(inventory)
+
+    expected = []
+    for t in range(n_steps):
+        env._inventory_names = inventory[t]
+        action = {
+            key: value[t].copy() if key == "camera" else value[t].item()
+            for key, value in actions.items()
+        }
+        expected.append(env.reverse_action(action))
+    np.testing.assert_array_equal(env.reverse_actions(actions, inventory), expected)
+    # every functional action is covered
+    assert set(np.asarray(expected)[:, 5]) >= {0, 1, 2, 3, 4, 5, 6}
+
+
+def _lag_env(lag_completion, max_lag_steps):
+    bridge = StubBridge(change_prob=0)
+    env = NNActionSpaceWrapper(
+        make_stub_sim(bridge),
+        lag_completion=lag_completion,
+        max_lag_steps=max_lag_steps,
+    )
+    obs = env.reset()
+    return env, bridge, obs
+
+
+def _fn_action(env, fn_action, arg=0):
+    action = env.action_space.no_op()
+    action[5] = fn_action
+    action[6 if fn_action == 4 else 7] = arg
+    return action
+
+
+DROP, CRAFT, EQUIP = 2, 4, 5
+
+
+@pytest.mark.parametrize("slot", [3, 37], ids=["inventory", "equipment"])
+@pytest.mark.parametrize("delay", [1, 2, 3])
+def test_until_effect_stops_at_first_change(slot, delay):
+    env, bridge, _ = _lag_env("until_effect", max_lag_steps=5)
+    bridge.schedule(delay, slot, "diamond", 7)
+    obs, _, _, _ = env.step(_fn_action(env, DROP))
+    # the action, then no-ops until the change shows up
+    assert len(bridge.sent_xmls) == delay
+    key, idx = ("inventory", slot) if slot < 36 else ("equipment", slot - 35)
+    assert obs[key]["name"][idx] == "diamond"
+
+
+@pytest.mark.parametrize("lag_completion", ["fixed", "until_effect"])
+def test_lag_steps_are_capped(lag_completion):
+    env, bridge, _ = _lag_env(lag_completion, max_lag_steps=3)
+    env.step(_fn_action(env, DROP))
+    assert len(bridge.sent_xmls) == 4
+    # the fixed mode waits even if the change shows up right away
+    bridge.schedule(1, 3, "diamond", 7)
+    env.step(_fn_action(env, DROP))
+    assert len(bridge.sent_xmls) == 8 if lag_completion == "fixed" else 5
+
+
+def test_deferred_settles_before_slot_action():
+    env, bridge, obs = _lag_env("deferred", max_lag_steps=5)
+    slot = int(np.flatnonzero(obs["inventory"]["name"] != "air")[0])
+    bridge.schedule(3, 10, "diamond", 1)
+    env.step(_fn_action(env, CRAFT, MC.ALL_CRAFT_SMELT_ITEMS.index("planks")))
+    assert len(bridge.sent_xmls) == 1
+    obs, _, _, _ = env.step(_fn_action(env, EQUIP, slot))
+    # no-op steps until the change shows up, then the equip
+    assert len(bridge.sent_xmls) == 4
+    assert ["equip none" not in xml for xml in bridge.sent_xmls] == [
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert obs["inventory"]["name"][10] == "diamond"
+
+
+def test_deferred_wait_served_by_later_steps():
+    env, bridge, obs = _lag_env("deferred", max_lag_steps=5)
+    slot = int(np.flatnonzero(obs["inventory"]["name"] != "air")[0])
+    bridge.schedule(2, 10, "diamond", 1)
+    env.step(_fn_action(env, CRAFT, MC.ALL_CRAFT_SMELT_ITEMS.index("planks")))
+    obs, _, _, _ = env.step(env.action_space.no_op())
+    assert obs["inventory"]["name"][10] == "diamond"
+    # the change was observed, so the slot action is sent right away
+    env.step(_fn_action(env, EQUIP, slot))
+    assert len(bridge.sent_xmls) == 3
@@ -0,0 +1,97 @@
+import cv2
+import numpy as np
+import pytest
+
+from minedojo.sim.handlers import POVObservation
+
+from .stub_bridge import StubBridge, make_stub_sim
+
+
+H, W = 8, 12
+
+
+@pytest.fixture
+def frame():
+    """A known ``(H, W, 3)`` frame as rendered by Minecraft, i.e., bottom-up, constant on 2x2 blocks."""
+    rng = np.random.default_rng(0)
+    blocks = rng.integers(0, 256, size=(H // 2, W // 2, 3), dtype=np.uint8)
+    return blocks.repeat(2, axis=0).repeat(2, axis=1)
+
+
+def _decode(handler, frame):
+    return handler.from_hero({"pov": frame.tobytes()})
+
+
+def test_default(frame):
+    handler = POVObservation((H, W))
+    pov = _decode(handler, frame)
+    assert pov.flags["C_CONTIGUOUS"]
+    assert pov.shape == handler.space.shape == (3, H, W)
+    np.testing.assert_array_equal(pov, frame[::-1].transpose((2, 0, 1)))
+    assert handler.full_frame is None
+    # frames are not overwritten by later decodes
+    _decode(handler, np.zeros_like(frame))
+    np.testing.assert_array_equal(pov, frame[::-1].transpose((2, 0, 1)))
+
+
+@pytest.mark.parametrize("channels_last", [False, True])
+def test_crop(frame, channels_last):
+    handler = POVObservation((H, W), crop=(2, 4, 4, 6), channels_last=channels_last)
+    pov = _decode(handler, frame)
+    expected = frame[::-1][2:6, 4:10]
+    if not channels_last:
+        expected = expected.transpose((2, 0, 1))
+    assert pov.flags["C_CONTIGUOUS"]
+    assert pov.shape == handler.space.shape
+    np.testing.assert_array_equal(pov, expected)
+
+
+def test_area_resize(frame):
+    handler = POVObservation((H, W), output_resolution=(H // 2, W // 2))
+    pov = _decode(handler, frame)
+    # the frame is constant on 2x2 blocks, so area resizing picks one pixel per block
+    expected = frame[::-1][::2, ::2].transpose((2, 0, 1))
+    assert pov.shape == handler.space.shape == (3, H // 2, W // 2)
+    np.testing.assert_array_equal(pov, expected)
+
+
+def test_grayscale(frame):
+    handler = POVObservation((H, W), grayscale=True, channels_last=True)
+    pov = _decode(handler, frame)
+    expected = cv2.cvtColor(np.ascontiguousarray(frame[::-1]), cv2.COLOR_RGB2GRAY)
+    assert pov.shape == handler.space.shape == (H, W, 1)
+    np.testing.assert_array_equal(pov[..., 0], expected)
+
+
+def test_channels_last(frame):
+    handler = POVObservation((H, W), channels_last=True)
+    pov = _decode(handler, frame)
+    assert pov.shape == handler.space.shape == (H, W, 3)
+    assert pov.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(pov, frame[::-1])
+
+
+def test_full_frame(frame):
+    handler = POVObservation(
+        (H, W), crop=(0, 0, 4, 4), output_resolution=(2, 2), grayscale=True
+    )
+    pov = _decode(handler, frame)
+    np.testing.assert_array_equal(handler.full_frame, frame[::-1])
+    # buffers are reused across decodes
+    new_frame = 255 - frame
+    assert _decode(handler, new_frame) is pov
+    np.testing.assert_array_equal(handler.full_frame, new_frame[::-1])
+
+
+def test_failed_step_keeps_last_frame():
+    bridge = StubBridge(fail_at_step=1)
+    sim = make_stub_sim(bridge, image_preprocessing={"channels_last": True})
+    obs = sim.reset()
+    assert obs["rgb"].shape == sim.observation_space["rgb"].shape
+    # the preprocessed frame is kept by reference, not copied
+    assert sim.prev_obs["rgb"] is obs["rgb"]
+    np.testing.assert_array_equal(sim.full_frame, np.zeros((16, 16, 3)))
+    obs, _, done, _ = sim.step(sim.action_space.no_op())
+    assert done
+    assert obs is sim.prev_obs
+    np.testing.assert_array_equal(obs["rgb"], np.zeros((16, 16, 3)))
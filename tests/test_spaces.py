@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from minedojo.sim import spaces
+from minedojo.sim.spaces import compile_contains
+
+
+@pytest.mark.parametrize(
+    "x",
+    [
+        np.array([0, 1, 2]),
+        np.array([0, 1, 2], dtype=np.uint8),
+        np.array([0.0, 1.0, 2.0]),
+        np.array([0.5, 1.5, 2.5]),
+        [0, 1, 2],
+        [0.0, 1.0, 2.0],
+        np.array([0, 1, 3]),
+        np.array([0.0, 1.0, 3.0]),
+        np.array([-1, 1, 2]),
+        np.array([0, 1]),
+        np.array([[0, 1, 2]]),
+    ],
+)
+def test_multi_discrete_contains(x):
+    space = spaces.MultiDiscrete([2, 3, 4])
+    assert compile_contains(space)(x) == space.contains(x)
@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+
+from .stub_bridge import StubBridge, make_stub_sim
+
+
+TIMEOUT = 10
+
+
+@pytest.fixture
+def gated_sim(monkeypatch):
+    """A sim whose decodes wait until ``gate`` is set, with ``decoded`` recording the decoded steps in order."""
+    bridge = StubBridge()
+    sim = make_stub_sim(bridge, async_decode=True, max_pending_decodes=2)
+    sim.reset()
+    gate = threading.Event()
+    decoded = []
+    process_raw_obs = sim._process_raw_obs
+
+    def gated_process_raw_obs(raw_obs):
+        assert gate.wait(TIMEOUT)
+        decoded.append(raw_obs["stub_step"])
+        return process_raw_obs(raw_obs)
+
+    monkeypatch.setattr(sim, "_process_raw_obs", gated_process_raw_obs)
+    yield sim, bridge, gate, decoded
+    gate.set()
+    sim.close()
+
+
+def _start(fn, *args):
+    thread = threading.Thread(target=fn, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_futures_resolve_in_order():
+    sim = make_stub_sim(async_decode=True, max_pending_decodes=3)
+    sim.reset()
+    futures = [sim.step_async(sim.action_space.no_op()) for _ in range(3)]
+    for i, future in enumerate(futures):
+        obs, reward, done, info = future.result(TIMEOUT)
+        assert info["stub_step"] == i + 1
+        assert reward == 0 and not done
+    assert sim.prev_info["stub_step"] == 3
+    sim.close()
+
+
+def test_step_async_requires_async_decode():
+    sim = make_stub_sim()
+    sim.reset()
+    with pytest.raises(AssertionError):
+        sim.step_async(sim.action_space.no_op())
+
+
+def test_back_pressure(gated_sim):
+    sim, bridge, gate, decoded = gated_sim
+    futures = [sim.step_async(sim.action_space.no_op()) for _ in range(2)]
+    # the third step waits for the oldest of the two pending decodes
+    thread = _start(lambda: futures.append(sim.step_async(sim.action_space.no_op())))
+    thread.join(0.2)
+    assert thread.is_alive()
+    assert bridge.n_steps == 2
+    gate.set()
+    thread.join(TIMEOUT)
+    assert not thread.is_alive()
+    assert bridge.n_steps == 3
+    assert [f.result(TIMEOUT)[3]["stub_step"] for f in futures] == [1, 2, 3]
+    assert decoded == [1, 2, 3]
+
+
+@pytest.mark.parametrize("method", ["step", "reset"])
+def test_step_and_reset_wait_for_pending_decodes(gated_sim, method):
+    sim, bridge, gate, decoded = gated_sim
+    future = sim.step_async(sim.action_space.no_op())
+    if method == "step":
+        thread = _start(sim.step, sim.action_space.no_op())
+    else:
+        thread = _start(sim.reset)
+    thread.join(0.2)
+    assert thread.is_alive()
+    # nothing is sent to the bridge before the pending decode finishes
+    assert bridge.n_steps == 1
+    gate.set()
+    thread.join(TIMEOUT)
+    assert not thread.is_alive()
+    assert future.done()
+    assert decoded[0] == 1
+    if method == "step":
+        assert decoded == [1, 2]
+        assert sim.prev_info["stub_step"] == 2
+    else:
+        assert decoded == [1, 0]
+        assert sim.prev_info["stub_step"] == 0
+
+
+def test_failed_step_resolves_with_prev_obs():
+    bridge = StubBridge(fail_at_step=2)
+    sim = make_stub_sim(bridge, async_decode=True)
+    sim.reset()
+    first = sim.step_async(sim.action_space.no_op())
+    failed = sim.step_async(sim.action_space.no_op())
+    assert first.done()
+    obs, reward, done, info = failed.result(TIMEOUT)
+    assert done
+    assert info["stub_step"] == 1
+    sim.close()
@@ -0,0 +1,530 @@
+from copy import deepcopy
+
+import gym
+import numpy as np
+import pytest
+
+from minedojo.tasks.meta import base
+from minedojo.tasks.meta.base import ExtraSpawnMetaTaskBase, MetaTaskBase
+from minedojo.tasks.meta.utils import (
+    DeltaReward,
+    IncrementCheck,
+    IncrementThresholdReward,
+    InfoVectorizer,
+    PeriodDeltaReward,
+    ThresholdCheck,
+    ThresholdCondition,
+    ThresholdReward,
+    always_satisfy_condition,
+    check_above_height_condition,
+    check_above_light_level_condition,
+    check_below_height_condition,
+    check_below_light_level_condition,
+    fuse_terms,
+    possess_item_reward,
+    simple_inventory_based_check,
+    simple_inventory_based_reward,
+    simple_stat_kill_entity_based_check,
+    simple_stat_kill_entity_based_reward,
+    survive_n_days_reward,
+    survive_per_day_reward,
+    time_since_death_check,
+    use_all_item_check,
+    use_any_item_check,
+    use_any_item_reward,
+)
+
+
+ITEMS = ["log", "planks", "stick", "cobblestone"]
+ENTITIES = ["zombie", "cow"]
+N_STEPS = 40
+
+
+def _record_infos(seed=0, n_steps=N_STEPS):
+    """
+    Info dicts of an episode in Malmo's format, with items spread over several slots and counters that only grow.
+    """
+    rng = np.random.default_rng(seed)
+    kill_entity = {name: 0 for name in ENTITIES}
+    use_item = {name: 0 for name in ITEMS}
+    time_since_death = 0
+    infos = []
+    for _ in range(n_steps + 1):
+        for name in ENTITIES:
+            kill_entity[name] += int(rng.random() < 0.2)
+        for name in ITEMS:
+            use_item[name] += int(rng.random() < 0.3)
+        time_since_death += int(rng.integers(0, 400))
+        infos.append(
+            {
+                "inventory": [
+                    {
+                        "name": str(rng.choice(ITEMS + ["air"])),
+                        "quantity": int(rng.integers(0, 4)),
+                    }
+                    for _ in range(6)
+                ],
+                "stat": {
+                    "kill_entity": dict(kill_entity),
+                    "use_item": {"minecraft": dict(use_item)},
+                    "time_since_death": time_since_death,
+                },
+                "ypos": float(rng.uniform(0, 80)),
+                "light_level": int(rng.integers(0, 16)),
+            }
+        )
+    return infos
+
+
+# the reward functions and success criteria before they were vectorized
+
+
+def _count(info, name):
+    return sum(
+        inv_item["quantity"]
+        for inv_item in info["inventory"]
+        if inv_item["name"] == name
+    )
+
+
+def _ref_kill_reward(name, weight):
+    return lambda ini, pre, cur, t: weight * (
+        cur["stat"]["kill_entity"][name] - pre["stat"]["kill_entity"][name]
+    )
+
+
+def _ref_inventory_reward(name, weight):
+    return lambda ini, pre, cur, t: (_count(cur, name) - _count(pre, name)) * weight
+
+
+def _ref_possess_item_reward(name, quantity, weight):
+    return lambda ini, pre, cur, t: (
+        float(_count(cur, name) - _count(ini, name) >= quantity) * weight
+    )
+
+
+def _ref_survive_per_day_reward(mc_ticks_per_day, weight):
+    return (
+        lambda ini, pre, cur, t: (
+            cur["stat"]["time_since_death"] // mc_ticks_per_day
+            - pre["stat"]["time_since_death"] // mc_ticks_per_day
+        )
+        * weight
+    )
+
+
+def _ref_survive_n_days_reward(mc_ticks_per_day, target_days, weight):
+    return lambda ini, pre, cur, t: weight * float(
+        cur["stat"]["time_since_death"] >= mc_ticks_per_day * target_days
+    )
+
+
+def _ref_use_any_item_reward(items_and_weights):
+    return lambda ini, pre, cur, t: sum(
+        (
+            cur["stat"]["use_item"]["minecraft"][item]
+            - pre["stat"]["use_item"]["minecraft"][item]
+        )
+        * weight
+        for item, weight in items_and_weights.items()
+    )
+
+
+def _ref_kill_check(name, quantity):
+    return (
+        lambda ini, cur, t: (
+            cur["stat"]["kill_entity"][name] - ini["stat"]["kill_entity"][name]
+        )
+        >= quantity
+    )
+
+
+def _ref_inventory_check(name, quantity):
+    return lambda ini, cur, t: _count(cur, name) - _count(ini, name) >= quantity
+
+
+def _ref_time_since_death_check(threshold):
+    return lambda ini, cur, t: cur["stat"]["time_since_death"] >= threshold
+
+
+def _ref_use_item_check(targets, reduce):
+    return lambda ini, cur, t: reduce(
+        (
+            cur["stat"]["use_item"]["minecraft"][item]
+            - ini["stat"]["use_item"]["minecraft"][item]
+        )
+        >= target
+        for item, target in targets.items()
+    )
+
+
+def _ref_condition(key, threshold, below):
+    if below:
+        return lambda ini, pre, t: pre[key] <= threshold
+    return lambda ini, pre, t: pre[key] >= threshold
+
+
+REWARD_FNS = [
+    (
+        simple_stat_kill_entity_based_reward("zombie", weight=2),
+        _ref_kill_reward("zombie", weight=2),
+    ),
+    (
+        simple_inventory_based_reward("log", weight=0.5),
+        _ref_inventory_reward("log", weight=0.5),
+    ),
+    (
+        possess_item_reward("planks", quantity=2, weight=3),
+        _ref_possess_item_reward("planks", quantity=2, weight=3),
+    ),
+    (
+        survive_per_day_reward(mc_ticks_per_day=1000, weight=1.5),
+        _ref_survive_per_day_reward(mc_ticks_per_day=1000, weight=1.5),
+    ),
+    (
+        survive_n_days_reward(mc_ticks_per_day=1000, target_days=3, weight=4),
+        _ref_survive_n_days_reward(mc_ticks_per_day=1000, target_days=3, weight=4),
+    ),
+    (
+        use_any_item_reward({"stick": 1, "cobblestone": -0.5}),
+        _ref_use_any_item_reward({"stick": 1, "cobblestone": -0.5}),
+    ),
+]
+
+SUCCESS_CRITERIA = [
+    (
+        simple_stat_kill_entity_based_check("cow", quantity=2),
+        _ref_kill_check("cow", quantity=2),
+    ),
+    (
+        simple_inventory_based_check("stick", quantity=3),
+        _ref_inventory_check("stick", quantity=3),
+    ),
+    (time_since_death_check(5000), _ref_time_since_death_check(5000)),
+    (
+        use_any_item_check({"log": 8, "planks": 7}),
+        _ref_use_item_check({"log": 8, "planks": 7}, any),
+    ),
+    (
+        use_all_item_check({"log": 5, "stick": 5}),
+        _ref_use_item_check({"log": 5, "stick": 5}, all),
+    ),
+]
+
+EXTRA_SPAWN_CONDITIONS = [
+    (check_below_height_condition(40), _ref_condition("ypos", 40, below=True)),
+    (check_above_height_condition(62), _ref_condition("ypos", 62, below=False)),
+    (
+        check_below_light_level_condition(7),
+        _ref_condition("light_level", 7, below=True),
+    ),
+    (
+        check_above_light_level_condition(9),
+        _ref_condition("light_level", 9, below=False),
+    ),
+    (always_satisfy_condition, lambda ini, pre, t: True),
+]
+
+
+def _triples(infos):
+    return [(infos[0], infos[t - 1], infos[t], t) for t in range(1, len(infos))]
+
+
+@pytest.mark.parametrize(
+    "reward_fn, reference", REWARD_FNS, ids=lambda x: type(x).__name__
+)
+def test_reward_fns_match_previous(reward_fn, reference):
+    infos = _record_infos()
+    vectorizer = InfoVectorizer(reward_fn.keys)
+    idx = vectorizer.index_of(reward_fn.keys)
+    for ini, pre, cur, t in _triples(infos):
+        expected = reference(ini, pre, cur, t)
+        assert reward_fn(
+            ini_info_dict=ini, pre_info_dict=pre, cur_info_dict=cur, elapsed_timesteps=t
+        ) == pytest.approx(expected)
+        assert reward_fn.evaluate(
+            vectorizer(ini)[idx], vectorizer(pre)[idx], vectorizer(cur)[idx], t
+        ) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "check, reference", SUCCESS_CRITERIA, ids=lambda x: type(x).__name__
+)
+def test_success_criteria_match_previous(check, reference):
+    infos = _record_infos()
+    vectorizer = InfoVectorizer(check.keys)
+    idx = vectorizer.index_of(check.keys)
+    results = []
+    for ini, _, cur, t in _triples(infos):
+        expected = reference(ini, cur, t)
+        assert check(ini_info_dict=ini, cur_info_dict=cur, elapsed_timesteps=t) == (
+            expected
+        )
+        assert check.evaluate(vectorizer(ini)[idx], vectorizer(cur)[idx], t) == (
+            expected
+        )
+        results.append(expected)
+    # the episode is long enough to cover both outcomes
+    assert any(results) and not all(results)
+
+
+@pytest.mark.parametrize(
+    "condition, reference", EXTRA_SPAWN_CONDITIONS, ids=lambda x: type(x).__name__
+)
+def test_extra_spawn_conditions_match_previous(condition, reference):
+    infos = _record_infos()
+    vectorizer = InfoVectorizer(condition.keys)
+    idx = vectorizer.index_of(condition.keys)
+    for ini, pre, _, t in _triples(infos):
+        expected = reference(ini, pre, t)
+        assert (
+            condition(ini_info_dict=ini, pre_info_dict=pre, elapsed_timesteps=t)
+            == expected
+        )
+        assert condition.evaluate(vectorizer(ini)[idx], vectorizer(pre)[idx], t) == (
+            expected
+        )
+
+
+def test_term_types():
+    assert [type(fn) for fn, _ in REWARD_FNS] == [
+        DeltaReward,
+        DeltaReward,
+        IncrementThresholdReward,
+        PeriodDeltaReward,
+        ThresholdReward,
+        DeltaReward,
+    ]
+    assert [type(fn) for fn, _ in SUCCESS_CRITERIA] == [
+        IncrementCheck,
+        IncrementCheck,
+        ThresholdCheck,
+        IncrementCheck,
+        IncrementCheck,
+    ]
+    assert all(
+        isinstance(condition, ThresholdCondition)
+        for condition, _ in EXTRA_SPAWN_CONDITIONS[:-1]
+    )
+
+
+def test_vectorizer_counts_items_across_slots():
+    info = {
+        "inventory": [
+            {"name": "log", "quantity": 3},
+            {"name": "air", "quantity": 0},
+            {"name": "log", "quantity": 5},
+        ],
+        "stat": {"kill_entity": {"zombie": 2}},
+    }
+    vectorizer = InfoVectorizer(
+        [
+            ("inventory", "log"),
+            ("inventory", "stick"),
+            ("stat", "kill_entity", "zombie"),
+        ]
+        + [("inventory", "log")]
+    )
+    assert len(vectorizer) == 3
+    np.testing.assert_array_equal(vectorizer(info), [8, 0, 2])
+
+
+def test_fused_terms_match_unfused():
+    infos = _record_infos(seed=1)
+    reward_fns = [fn for fn, _ in REWARD_FNS] + [
+        possess_item_reward("log", quantity=1, weight=1),
+        simple_inventory_based_reward("stick", weight=-1),
+    ]
+    checks = [fn for fn, _ in SUCCESS_CRITERIA] + [
+        simple_inventory_based_check("log", quantity=2),
+    ]
+    fused_reward_fns = fuse_terms(reward_fns)
+    fused_checks = fuse_terms(checks)
+    # one term per class, except for "all" checks of several values
+    assert [type(fn) for fn in fused_reward_fns] == [
+        DeltaReward,
+        IncrementThresholdReward,
+        PeriodDeltaReward,
+        ThresholdReward,
+    ]
+    assert [type(fn) for fn in fused_checks] == [
+        IncrementCheck,
+        IncrementCheck,
+        ThresholdCheck,
+    ]
+    assert fused_checks[1].mode == "all"
+
+    vectorizer = InfoVectorizer(
+        key for term in reward_fns + checks for key in term.keys
+    )
+
+    def evaluate_rewards(terms, ini, pre, cur, t):
+        return sum(
+            term.evaluate(ini[idx], pre[idx], cur[idx], t)
+            for term in terms
+            for idx in [vectorizer.index_of(term.keys)]
+        )
+
+    def evaluate_checks(terms, ini, cur, t):
+        return any(
+            term.evaluate(ini[idx], cur[idx], t)
+            for term in terms
+            for idx in [vectorizer.index_of(term.keys)]
+        )
+
+    for ini, pre, cur, t in _triples(infos):
+        ini, pre, cur = vectorizer(ini), vectorizer(pre), vectorizer(cur)
+        assert evaluate_rewards(fused_reward_fns, ini, pre, cur, t) == pytest.approx(
+            evaluate_rewards(reward_fns, ini, pre, cur, t)
+        )
+        assert evaluate_checks(fused_checks, ini, cur, t) == evaluate_checks(
+            checks, ini, cur, t
+        )
+
+
+class _ReplayEnv(gym.Env):
+    """Replays recorded info dicts in place of ``MineDojoSim``, handing out a fresh copy at every step."""
+
+    observation_space = gym.spaces.Discrete(1)
+    action_space = gym.spaces.Discrete(1)
+
+    def __init__(self, infos):
+        self._infos = infos
+        self._t = 0
+        self.prev_info = None
+        self.is_terminated = False
+        self.spawned = []
+
+    def reset(self):
+        self._t = 0
+        self.prev_info = deepcopy(self._infos[0])
+        return 0
+
+    def step(self, action, repeat=None):
+        self._t += 1
+        self.prev_info = deepcopy(self._infos[self._t])
+        return 0, 0.0, False, self.prev_info
+
+    def spawn_mobs(self, name, pos):
+        self.spawned.append((name, tuple(pos)))
+        return 0, 0.0, False, self.prev_info
+
+    set_block = spawn_mobs
+
+
+class _Task(MetaTaskBase):
+    _prompt_template = ""
+
+
+class _ExtraSpawnTask(ExtraSpawnMetaTaskBase):
+    _prompt_template = ""
+
+
+def _make_task(monkeypatch, infos, task_cls=_Task, **kwargs):
+    monkeypatch.setattr(base, "MineDojoSim", lambda **_: _ReplayEnv(infos))
+    return task_cls(fast_reset=False, **kwargs)
+
+
+def _as_callable(fn):
+    """
+    Hides a term or a previous function behind a plain callable, which is called on info dicts.
+    Tasks pass the arguments by keyword in the order of the signatures.
+    """
+    return lambda **kwargs: fn(*kwargs.values())
+
+
+def _rollout(task, n_steps=N_STEPS):
+    task.reset()
+    steps = []
+    for _ in range(n_steps):
+        _, reward, done, _ = task.step(0)
+        steps.append((reward, done))
+    return steps
+
+
+def test_task_matches_previous(monkeypatch):
+    infos = _record_infos(seed=2)
+    task = _make_task(
+        monkeypatch,
+        infos,
+        reward_fns=[fn for fn, _ in REWARD_FNS],
+        success_criteria=[fn for fn, _ in SUCCESS_CRITERIA],
+    )
+    # the previous functions are plain callables, which are called on info dicts
+    reference = _make_task(
+        monkeypatch,
+        infos,
+        reward_fns=[_as_callable(fn) for _, fn in REWARD_FNS],
+        success_criteria=[_as_callable(fn) for _, fn in SUCCESS_CRITERIA],
+    )
+    assert len(task._vectorized_reward_fns) == 4
+    assert len(reference._vectorized_reward_fns) == 0
+    steps = _rollout(task)
+    expected = _rollout(reference)
+    assert [done for _, done in steps] == [done for _, done in expected]
+    np.testing.assert_allclose(
+        [reward for reward, _ in steps], [reward for reward, _ in expected]
+    )
+
+
+@pytest.mark.parametrize("user_reward_fn", [False, True])
+def test_pre_info_copy(monkeypatch, user_reward_fn):
+    infos = _record_infos(seed=3)
+    reward_fns = [fn for fn, _ in REWARD_FNS]
+    if user_reward_fn:
+        reward_fns.append(_as_callable(_ref_inventory_reward("stick", weight=1)))
+    kwargs = dict(
+        reward_fns=reward_fns,
+        success_criteria=[fn for fn, _ in SUCCESS_CRITERIA],
+    )
+    task = _make_task(monkeypatch, infos, **kwargs)
+    # the info dict is only cloned if a plain callable may read it
+    assert task._copy_pre_info == user_reward_fn
+    copying = _make_task(monkeypatch, infos, **kwargs)
+    copying._copy_pre_info = True
+
+    steps = _rollout(task)
+    assert (task._pre_info_dict is task.env.prev_info) != user_reward_fn
+    assert steps == _rollout(copying)
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_extra_spawn_matches_previous(monkeypatch, vectorized):
+    infos = _record_infos(seed=4)
+    conditions = {
+        "zombie": EXTRA_SPAWN_CONDITIONS[2],
+        "pig": EXTRA_SPAWN_CONDITIONS[4],
+        "diamond_ore": EXTRA_SPAWN_CONDITIONS[0],
+    }
+
+    def make(extra_spawn_condition):
+        return _make_task(
+            monkeypatch,
+            infos,
+            task_cls=_ExtraSpawnTask,
+            seed=0,
+            extra_spawn_rate={"zombie": 0.8, "pig": 0.3, "diamond_ore": 0.6},
+            extra_spawn_condition=extra_spawn_condition,
+            extra_spawn_range_low=(-5, 0, -5),
+            extra_spawn_range_high=(5, 2, 5),
+            reward_fns=[fn for fn, _ in REWARD_FNS],
+            success_criteria=[fn for fn, _ in SUCCESS_CRITERIA[:2]],
+        )
+
+    task = make(
+        {
+            k: condition if vectorized else _as_callable(condition)
+            for k, (condition, _) in conditions.items()
+        }
+    )
+    assert task._copy_pre_info != vectorized
+    reference = make(
+        {k: _as_callable(reference) for k, (_, reference) in conditions.items()}
+    )
+    assert reference._copy_pre_info
+
+    steps = _rollout(task)
+    assert steps == _rollout(reference)
+    assert task.env.spawned == reference.env.spawned
+    # spawns depend on the conditions
+    assert 0 < len(task.env.spawned) < 3 * N_STEPS
@@ -0,0 +1,35 @@
+from minedojo.sim import handlers
+from minedojo.sim import sim as sim_module
+
+from .stub_bridge import make_stub_sim
+
+
+def test_no_rgb():
+    sim = make_stub_sim(use_rgb=False)
+    assert not any(
+        isinstance(h, handlers.POVObservation) for h in sim._sim_spec.observables
+    )
+    assert "rgb" not in sim.observation_space.spaces
+    obs = sim.reset()
+    assert "rgb" not in obs
+    assert "pov" not in sim.prev_info
+    obs, _, _, _ = sim.step(sim.action_space.no_op())
+    assert "rgb" not in obs
+    assert "inventory" in obs
+
+
+def test_rgb():
+    sim = make_stub_sim()
+    assert "rgb" in sim.observation_space.spaces
+    obs = sim.reset()
+    assert obs["rgb"].shape == sim.observation_space["rgb"].shape
+
+
+def test_render_warns(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(sim_module.logger, "warning", warnings.append)
+    sim = make_stub_sim(use_rgb=False)
+    sim.reset()
+    sim.render()
+    assert len(warnings) == 1
+    assert "use_rgb=False" in warnings[0]
@@ -0,0 +1,59 @@
+import os
+
+import cv2
+import pytest
+
+from minedojo.sim.wrappers import FrameStackWrapper, VideoRecorderWrapper
+
+from .stub_bridge import StubBridge, make_stub_sim
+
+
+N_STEPS = 5
+
+
+def _read_video(path):
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def _record_episode(env):
+    env.reset()
+    for _ in range(N_STEPS):
+        env.step(env.action_space.no_op())
+    env.close()
+
+
+@pytest.mark.parametrize(
+    "image_preprocessing", [None, {"channels_last": True}], ids=["chw", "hwc"]
+)
+@pytest.mark.parametrize("stack", [False, True])
+def test_record(tmp_path, image_preprocessing, stack):
+    # a width of 4 is also a valid number of channels
+    sim = make_stub_sim(
+        StubBridge(image_size=(8, 4)), image_preprocessing=image_preprocessing
+    )
+    env = FrameStackWrapper(sim, k=3) if stack else sim
+    env = VideoRecorderWrapper(
+        env, str(tmp_path), drop_frames=False, use_full_frame=False
+    )
+    _record_episode(env)
+
+    assert env.n_dropped_frames == 0
+    assert os.listdir(tmp_path) == ["episode_0.mp4"]
+    frames = _read_video(str(tmp_path / "episode_0.mp4"))
+    assert len(frames) == N_STEPS + 1
+    assert frames[0].shape == (8, 4, 3)
+
+
+def test_dropped_frames(tmp_path):
+    env = VideoRecorderWrapper(make_stub_sim(), str(tmp_path), queue_size=1)
+    _record_episode(env)
+    frames = _read_video(str(tmp_path / "episode_0.mp4"))
+    assert len(frames) + env.n_dropped_frames == N_STEPS + 1
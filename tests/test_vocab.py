@@ -0,0 +1,54 @@
+import numpy as np
+
+from minedojo.sim.mc_meta.vocab import BLOCK_VOCAB, ITEM_VOCAB
+from minedojo.sim.handlers.agent.observations.voxel_lidar import VoxelObservation
+
+
+# block names in voxels and lidar as sent by Malmo
+VOXEL_NAMES = [
+    "air",
+    "grass block",
+    "dirt",
+    "stone",
+    "cobblestone",
+    "wooden planks",
+    "wood",
+    "leaves",
+    "water",
+    "sand",
+    "crafting table",
+    "iron ore",
+]
+
+
+def test_block_vocab_encodes_voxel_names():
+    voxels = np.array(VOXEL_NAMES * 2).reshape(2, 3, 4)
+    ids = BLOCK_VOCAB.encode(voxels)
+    assert ids.shape == voxels.shape and ids.dtype == np.int16
+    assert np.all(ids != BLOCK_VOCAB.unknown_id)
+    assert np.array_equal(BLOCK_VOCAB.decode(ids), voxels)
+
+
+def test_unknown_names():
+    ids = BLOCK_VOCAB.encode(["grass block", "not a block", "not a block"])
+    assert ids[0] != BLOCK_VOCAB.unknown_id
+    assert ids[1] == ids[2] == BLOCK_VOCAB.unknown_id
+    assert BLOCK_VOCAB.decode(ids[1]) == "unknown"
+
+
+def test_item_vocab_round_trip():
+    names = np.array(["air", "crafting table", "iron pickaxe"])
+    assert np.array_equal(ITEM_VOCAB.decode(ITEM_VOCAB.encode(names)), names)
+
+
+def test_voxel_block_ids():
+    handler = VoxelObservation(limits=((0, 1), (0, 1), (0, 2)), block_ids=True)
+    raw_voxels = []
+    for name in VOXEL_NAMES:
+        raw_voxels.extend([name, 0, True, True, True, False, True, False, True, 1.0])
+    obs = handler.from_hero({"voxels": raw_voxels})
+    assert handler.space["block_name"].contains(obs["block_name"])
+    assert np.all(obs["block_name"] != BLOCK_VOCAB.unknown_id)
+    assert sorted(BLOCK_VOCAB.decode(obs["block_name"]).reshape(-1)) == sorted(
+        VOXEL_NAMES
+    )